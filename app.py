@@ -1,14 +1,40 @@
 import os
+from itertools import chain
 
 import plotly.io as pio  # type: ignore
 import sentry_sdk
 import streamlit as st
+from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
 from src.config import load_config
-from src.log_utils.load_eval_logs import get_log_paths, load_evaluation_logs
+from src.config_reloader import get_config_reloader
+from src.log_utils.load_eval_logs import (
+    PAGE_LOAD_DEADLINE,
+    get_log_paths,
+    is_loaded,
+    iter_evaluation_logs,
+)
+from src.log_utils.local_backend import get_local_watcher
+from src.log_utils.refresher import get_refresher
+from src.pages.evaluations.template import warn_missing_runs
+from src.plots.figure_cache import plotly_chart
 from src.plots.radar import create_radar_chart
+from src.warmup import WARMUP_IN_BACKGROUND, start_warm_up
 
 SENTRY_DSN = os.environ.get("SENTRY_DSN")
 
+CATEGORIES = [
+    "agents",
+    "assistants",
+    "coding",
+    "cybersecurity",
+    "knowledge",
+    "mathematics",
+    "multimodal",
+    "reasoning",
+    "safeguards",
+]
+
 st.set_page_config(
     page_title="Inspect Evals Dashboard", page_icon="🤖", layout="centered"
 )
@@ -52,18 +78,22 @@ st.markdown(
 # https://github.com/streamlit/streamlit/issues/3426
 #
 # This code might stop working in a future version
-@st.cache_data()
+@cached(max_entries=1, copy=False)
 def sentry_patch_streamlit():
     """Streamlit catches all exceptions, this monkey patch sends exceptions to Sentry."""
     import sys
 
     script_runner = sys.modules["streamlit.runtime.scriptrunner.exec_code"]
     original_func = script_runner.handle_uncaught_app_exception
+    # The cache entry can be evicted, the handler must still be patched only once
+    if getattr(original_func, "sentry_patched", False):
+        return
 
     def sentry_patched_func(ex):
         sentry_sdk.capture_exception(ex)
         original_func(ex)
 
+    sentry_patched_func.sentry_patched = True
     script_runner.handle_uncaught_app_exception = sentry_patched_func
 
 
@@ -77,6 +107,17 @@ if SENTRY_DSN:
     )
     sentry_patch_streamlit()
 
+# Start the background refresh of the evaluation logs (once per process)
+get_refresher()
+# Reload local logs as soon as their file changes (once per process)
+get_local_watcher()
+# Reload the config when config.yml changes (once per process)
+get_config_reloader()
+# Warm up the caches and flag the process as ready, unless `scripts.serve`
+# already did before starting the server (once per process)
+if WARMUP_IN_BACKGROUND and os.getenv("STREAMLIT_ENV", "dev") != "test":
+    start_warm_up()
+
 
 def home_content():
     st.title("Inspect Evals Dashboard")
@@ -111,46 +152,21 @@ def home_content():
             unsafe_allow_html=True,
         )
 
-    # Load and organize logs by category
-    category_logs = {}
-    for category in [
-        "agents",
-        "assistants",
-        "coding",
-        "cybersecurity",
-        "knowledge",
-        "mathematics",
-        "multimodal",
-        "reasoning",
-        "safeguards",
-    ]:
-        category_config = getattr(config, category)
-        if category_config:
-            category_logs[category] = load_evaluation_logs(
-                get_log_paths(category_config)
-            )
+    # The static content and the counts (from the config) are rendered right away,
+    # the radar chart is filled in category by category as the logs are loaded
+    groups = {
+        category: get_log_paths(getattr(config, category))
+        for category in CATEGORIES
+        if getattr(config, category)
+    }
 
-    if category_logs:
-        # Create and display the radar chart
+    if groups:
         st.markdown("### Model performance overview")
         st.markdown(
             "This radar chart shows how well the selected model performs across different evaluation categories."
         )
-
-        # Get unique model names across all categories
-        all_models = set()
-        for logs in category_logs.values():
-            all_models.update(log.model_metadata.name for log in logs)
-
-        # Add model selector
-        selected_model = st.selectbox(
-            "Select a model to view its performance",
-            sorted(all_models, key=str.lower),
-            help="Choose a model to see its performance across different evaluation categories",
-        )
-
-        fig_radar = create_radar_chart(category_logs, selected_model)
-        st.plotly_chart(fig_radar, use_container_width=True)
+        progress = st.empty()
+        radar = st.empty()
 
         with st.expander("How is the radar chart calculated?"):
             st.write(
@@ -213,6 +229,81 @@ def home_content():
     """
     )
 
+    if groups:
+        category_logs = load_category_logs(groups, progress, radar)
+        with radar.container():
+            # Get unique model names across all categories
+            all_models = get_model_names(category_logs)
+
+            # Add model selector
+            selected_model = st.selectbox(
+                "Select a model to view its performance",
+                all_models,
+                help="Choose a model to see its performance across different evaluation categories",
+                key="home_radar_model",
+            )
+
+            fig_radar = create_radar_chart(category_logs, selected_model)
+            plotly_chart(fig_radar, use_container_width=True, key="home_radar")
+
+
+def load_category_logs(
+    groups: dict[str, list[str]], progress, radar
+) -> dict[str, list[DashboardLog]]:
+    """Load the logs of every category, drawing the radar chart of the categories loaded so far.
+
+    Past `LOG_PAGE_DEADLINE`, the categories are returned with the logs loaded
+    so far and the missing runs are flagged.
+
+    Args:
+        groups: Mapping from each category to the paths of its logs
+        progress: Placeholder for the progress bar
+        radar: Placeholder for the radar chart
+
+    Returns:
+        The logs of each category, in the order of `groups`
+
+    """
+    paths = list(chain.from_iterable(groups.values()))
+    if is_loaded(paths):
+        return dict(iter_evaluation_logs(groups))
+
+    category_logs = {}
+    progress.progress(0.0, text="Loading evaluation logs...")
+    for category, logs in iter_evaluation_logs(groups, timeout=PAGE_LOAD_DEADLINE):
+        category_logs[category] = logs
+        progress.progress(
+            len(category_logs) / len(groups),
+            text=f"Loaded {category} ({len(category_logs)}/{len(groups)} categories)",
+        )
+
+        # Keep the order of the categories in the chart stable while loading
+        loaded_logs = {c: category_logs[c] for c in groups if c in category_logs}
+        all_models = get_model_names(loaded_logs)
+        if all_models and len(loaded_logs) < len(groups):
+            selected_model = st.session_state.get("home_radar_model")
+            if selected_model not in all_models:
+                selected_model = all_models[0]
+            plotly_chart(
+                create_radar_chart(loaded_logs, selected_model),
+                radar,
+                use_container_width=True,
+                key=f"home_radar_partial_{len(loaded_logs)}",
+            )
+    progress.empty()
+    with progress.container():
+        warn_missing_runs(paths)
+
+    return {c: category_logs[c] for c in groups if c in category_logs}
+
+
+def get_model_names(category_logs: dict[str, list[DashboardLog]]) -> list[str]:
+    """Return the sorted unique model names across all categories."""
+    all_models: set[str] = set()
+    for logs in category_logs.values():
+        all_models.update(log.model_metadata.name for log in logs)
+    return sorted(all_models, key=str.lower)
+
 
 # Initially pio.templates.default is a name of one of the preset templates
 # We pull that template, update it and then set the object as default (rather than the name)
@@ -228,6 +319,7 @@ if isinstance(pio.templates.default, str):
 home = st.Page(home_content, title="Home", icon="🏠", default=True)
 docs = st.Page("src/pages/docs.py", title="Documentation", icon="📚")
 changelog = st.Page("src/pages/changelog.py", title="Changelog", icon="📝")
+status = st.Page("src/pages/status.py", title="Status", icon="📈")
 evals_agents = st.Page("src/pages/evaluations/agents.py", title="Agents", icon="🤖")
 evals_assistants = st.Page(
     "src/pages/evaluations/assistants.py", title="Assistants", icon="💬"
@@ -265,7 +357,7 @@ pg = st.navigation(
             evals_reasoning,
             evals_safeguards,
         ],
-        "Navigation": [home, docs, changelog],
+        "Navigation": [home, docs, changelog, status],
     }
 )
 pg.run()
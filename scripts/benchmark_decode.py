@@ -0,0 +1,56 @@
+import argparse
+import json
+import tempfile
+import timeit
+from pathlib import Path
+
+from inspect_evals_dashboard_schema import DashboardLog
+from src.log_utils.decode import parse_dashboard_log
+from src.log_utils.disk_cache import DiskCache
+
+
+def decode_baseline(raw: bytes, location: str) -> DashboardLog:
+    # The decode path used before parse_dashboard_log: JSON text -> dict -> kwargs
+    data = json.loads(raw)
+    data["location"] = location
+    return DashboardLog(**data)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the time it takes to decode dashboard logs",
+        epilog="Example: python3 -m scripts.benchmark_decode tests/data/test_task/*.json",
+    )
+    parser.add_argument("paths", nargs="+", help="Local dashboard log files")
+    parser.add_argument(
+        "--repeat", type=int, default=200, help="Number of decodes per log"
+    )
+    args = parser.parse_args()
+
+    logs = [(path, Path(path).read_bytes()) for path in args.paths]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskCache(cache_dir, max_bytes=1024**3)
+        # Warm the cache of validated logs for the trusted mode
+        for path, raw in logs:
+            parse_dashboard_log(raw, path, cache, trusted=True)
+
+        modes = {
+            "json.loads + DashboardLog(**data)": decode_baseline,
+            "model_validate_json": parse_dashboard_log,
+            "trusted (validated once)": lambda raw, path: parse_dashboard_log(
+                raw, path, cache, trusted=True
+            ),
+        }
+
+        total_bytes = sum(len(raw) for _, raw in logs)
+        print(f"{len(logs)} logs, {total_bytes / len(logs) / 1024:.1f} KiB on average")
+        for name, decode in modes.items():
+            seconds = timeit.timeit(
+                lambda: [decode(raw, path) for path, raw in logs], number=args.repeat
+            )
+            per_log_ms = seconds / args.repeat / len(logs) * 1000
+            print(f"{name:<40} {per_log_ms:8.3f} ms per log")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import pickle
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import CachePolicy, cached
+from src.log_utils.decode import parse_dashboard_log
+from src.log_utils.fingerprint import log_fingerprint
+from src.log_utils.log_store import LogStore
+from src.plots.bar import create_bar_chart
+
+
+def build_category(raw_logs: list[tuple[str, bytes]], runs: int) -> list[DashboardLog]:
+    """Decode `runs` logs by cycling through the given files, each as its own run."""
+    logs = []
+    for index in range(runs):
+        path, raw = raw_logs[index % len(raw_logs)]
+        log = parse_dashboard_log(raw, f"{path}#{index}")
+        log.eval.run_id = f"{log.eval.run_id}-{index}"
+        logs.append(log)
+    return logs
+
+
+def measure(rerun: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Return the CPU milliseconds and the KiB allocated (peak) per rerun."""
+    rerun()
+    start = time.process_time()
+    for _ in range(repeat):
+        rerun()
+    cpu_ms = (time.process_time() - start) / repeat * 1000
+
+    tracemalloc.start()
+    rerun()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of serving the logs and the figure of a category "
+        "page from the caches, with copies (pickled values) and from the shared store",
+        epilog="Example: python3 -m scripts.benchmark_rerun tests/data/test_task/*.json --runs 500",
+    )
+    parser.add_argument("paths", nargs="+", help="Local dashboard log files")
+    parser.add_argument(
+        "--runs", type=int, default=500, help="Number of runs in the category"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Number of reruns to average over"
+    )
+    args = parser.parse_args()
+
+    raw_logs = [(path, Path(path).read_bytes()) for path in args.paths]
+    logs = build_category(raw_logs, args.runs)
+    scorer = logs[0].results.scores[0].name
+    metric = next(iter(logs[0].results.scores[0].metrics))
+    paths = [log.location for log in logs]
+
+    # Before: `st.cache_data` pickles the logs and the figure, and every rerun
+    # unpickles new copies of both
+    pickled_logs = pickle.dumps(logs, protocol=pickle.HIGHEST_PROTOCOL)
+    copied_chart = cached(
+        create_bar_chart.__wrapped__,
+        # The copies are new objects on every rerun, key them by path
+        hash_funcs={DashboardLog: lambda log: log.location},
+        policy=CachePolicy(1024**3),
+    )
+
+    def rerun_with_copies() -> object:
+        category_logs = pickle.loads(pickled_logs)
+        return copied_chart(category_logs, scorer, metric)
+
+    # After: the logs are shared references from the log store, and the
+    # figure is shared
+    store = LogStore()
+    store.put_many({log.location: log for log in logs})
+    shared_chart = cached(
+        create_bar_chart.__wrapped__,
+        hash_funcs={DashboardLog: log_fingerprint},
+        policy=CachePolicy(1024**3),
+        copy=False,
+    )
+
+    def rerun_shared() -> object:
+        return shared_chart(store.get_many(paths), scorer, metric)
+
+    print(f"{args.runs} runs, {len(pickled_logs) / 1024:.0f} KiB pickled")
+    results = {
+        "copies (pickled values)": measure(rerun_with_copies, args.repeat),
+        "shared store": measure(rerun_shared, args.repeat),
+    }
+    for name, (cpu_ms, peak_kib) in results.items():
+        print(
+            f"{name:<30} {cpu_ms:8.2f} ms CPU {peak_kib:10.0f} KiB allocated per rerun"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the columnar data snapshot of the dashboard logs of an environment",
+        epilog="Example: python3 -m scripts.build_snapshot --env prod",
+    )
+    parser.add_argument(
+        "--env",
+        help="Environment from config.yml to build the snapshot for",
+        required=True,
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Directory to write the snapshot to, defaults to LOG_SNAPSHOT_DIR",
+    )
+    args = parser.parse_args()
+
+    # The config and the loaders read the environment when they're imported
+    os.environ["STREAMLIT_ENV"] = args.env
+    from src.config import load_config
+    from src.log_utils.load_eval_logs import fetch_evaluation_logs, get_log_paths
+    from src.log_utils.snapshot import SNAPSHOT_DIR, get_snapshot_path, write_snapshot
+
+    config = load_config()
+    paths = list(
+        dict.fromkeys(
+            path
+            for category in config.model_fields
+            for path in get_log_paths(getattr(config, category))
+        )
+    )
+
+    logs, failures = fetch_evaluation_logs(paths)
+    if failures:
+        for path, error in failures.items():
+            print(f"ERROR: failed to load {path}: {error!r}")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir) if args.output_dir else SNAPSHOT_DIR
+    snapshot_path = get_snapshot_path(args.env, output_dir)
+    write_snapshot(logs, snapshot_path)
+    print(f"Wrote {len(logs)} runs to {snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
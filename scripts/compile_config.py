@@ -0,0 +1,51 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile config.yml into one JSON file per environment, "
+        "which the dashboard loads instead of parsing the YAML",
+        epilog="Example: python3 -m scripts.compile_config --input config.yml",
+    )
+    parser.add_argument("--input", default="config.yml", help="The config to compile")
+    parser.add_argument(
+        "--output-dir",
+        help="Directory to write the compiled configs to, defaults to CONFIG_COMPILED_DIR",
+    )
+    args = parser.parse_args()
+
+    from src import config
+
+    config_path = Path(args.input)
+    output_dir = (
+        Path(args.output_dir) if args.output_dir else config.COMPILED_CONFIG_DIR
+    )
+    for path in config.compile_config(config_path, output_dir):
+        print(f"Wrote {path}")
+
+    # Compare the startup cost of both sources for every environment, the paths
+    # only need some bucket name to be validated
+    os.environ.setdefault("AWS_S3_BUCKET", "bucket")
+    config.CONFIG_PATH = config_path
+    for env in config.parse_config(config_path.read_bytes()):
+        os.environ["STREAMLIT_ENV"] = env
+        timings = {}
+        for source, directory in (
+            ("yaml", output_dir / "missing"),
+            ("compiled", output_dir),
+        ):
+            config.COMPILED_CONFIG_DIR = directory
+            start = time.perf_counter()
+            config.read_config()
+            timings[source] = (time.perf_counter() - start) * 1000
+        print(
+            f"{env}: {timings['yaml']:.1f} ms from YAML, "
+            f"{timings['compiled']:.1f} ms compiled"
+        )
+
+
+if __name__ == "__main__":
+    main()
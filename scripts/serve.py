@@ -0,0 +1,68 @@
+import argparse
+import logging
+from pathlib import Path
+
+import yaml
+
+APP_PATH = Path(__file__).parents[1] / "app.py"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Warm up the caches of the dashboard, then start the Streamlit server",
+        epilog="Example: python3 -m scripts.serve --categories agents,coding --server.port 8501",
+    )
+    parser.add_argument(
+        "--categories",
+        default="",
+        help="Comma-separated categories to warm up, defaults to WARMUP_CATEGORIES or all categories",
+    )
+    parser.add_argument(
+        "--ready-file",
+        help="File to create once the warm-up is done, defaults to WARMUP_READY_FILE",
+    )
+    args, streamlit_args = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    from src.warmup import WARMUP_READY_FILE, parse_categories, warm_up
+    from streamlit.web import bootstrap
+
+    # The server only binds its port (and answers health checks) once the caches
+    # of this process are warm
+    warm_up(
+        parse_categories(args.categories),
+        ready_file=args.ready_file
+        if args.ready_file is not None
+        else WARMUP_READY_FILE,
+    )
+
+    options = parse_streamlit_options(streamlit_args)
+    bootstrap.load_config_options(options)
+    # The options are applied again whenever a config file changes
+    bootstrap.run(str(APP_PATH), False, [], options)
+
+
+def parse_streamlit_options(args: list[str]) -> dict[str, object]:
+    """Turn `--server.port 8501` or `--server.port=8501` into Streamlit flag options.
+
+    Flags without a value, e.g. `--server.headless`, are set to true.
+    """
+    options: dict[str, object] = {}
+    index = 0
+    while index < len(args):
+        name, _, value = args[index].removeprefix("--").partition("=")
+        if not value:
+            if index + 1 < len(args) and not args[index + 1].startswith("--"):
+                index += 1
+                value = args[index]
+            else:
+                value = "true"
+        # Values are typed like in config.toml, e.g. 8501 or true
+        options[name.replace(".", "_")] = yaml.safe_load(value)
+        index += 1
+    return options
+
+
+if __name__ == "__main__":
+    main()
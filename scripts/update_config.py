@@ -2,11 +2,16 @@ import argparse
 import json
 import os
 import re
+import shutil
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
 import boto3
 import yaml
+from botocore.config import Config
+from src.log_utils.json_stream import SCORES_PATH, PathNotFound, read_json_path
 
 MAPPING = {
     "agents": [
@@ -52,21 +57,175 @@ ENV_ORDER = ["prod", "stage", "dev", "test"]
 
 BUCKET_NAME = os.environ.get("AWS_S3_BUCKET", "inspect-evals-dashboard")
 
+# Number of dashboard files downloaded at the same time
+DEFAULT_JOBS = 16
+
+# Dashboard files seen by the previous run, with the names of their scorers
+# and metrics, so that only new and modified files are downloaded
+MANIFEST_PATH = ".cache/update_config/manifest.json"
+MANIFEST_VERSION = 1
+
+# State of a local mirror, with the ETag of every file it mirrors
+SYNC_STATE_FILE = ".sync.json"
+
+
+class S3Source:
+    """Dashboard files under an s3://bucket/prefix."""
+
+    def __init__(self, bucket, prefix, s3_client):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.s3_client = s3_client
+        self.name = f"s3://{bucket}/{prefix}"
+
+    def list_objects(self):
+        """List the dashboard files with their ETag and modification time."""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        objects = {}
+
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            if "Contents" in page:
+                for obj in page["Contents"]:
+                    if obj["Key"].endswith(DASHBOARD_LOG_FILE_SUFFIX):
+                        objects[obj["Key"]] = {
+                            "etag": obj["ETag"],
+                            "last_modified": obj["LastModified"].isoformat(),
+                        }
+
+        return objects
+
+    def open(self, key):
+        return self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+
+class LocalSource:
+    """Dashboard files in a local directory with the layout of the bucket.
+
+    The files are under logs/<env>/<eval>/<provider+model>/<run>/ in the
+    directory, e.g. a mirror kept up to date with `--sync`.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self.name = self.directory
+
+    def list_objects(self):
+        """List the dashboard files with their modification time.
+
+        Their size and modification time stand in for the ETag, which is
+        enough to tell whether a file changed since the previous run.
+        """
+        objects = {}
+        for root, _, files in os.walk(os.path.join(self.directory, "logs")):
+            for file in files:
+                if file.endswith(DASHBOARD_LOG_FILE_SUFFIX):
+                    path = os.path.join(root, file)
+                    stat = os.stat(path)
+                    key = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                    objects[key] = {
+                        "etag": f"{stat.st_size}-{stat.st_mtime_ns}",
+                        "last_modified": datetime.fromtimestamp(
+                            stat.st_mtime, timezone.utc
+                        ).isoformat(),
+                    }
+        # In the order of an S3 listing, which decides the run the defaults
+        # come from when they aren't in the original config
+        return dict(sorted(objects.items()))
+
+    def open(self, key):
+        return open(os.path.join(self.directory, key), "rb")
+
+
+def get_source(source, jobs=DEFAULT_JOBS):
+    """Return the source of an s3://bucket/prefix URL or a local directory."""
+    if source.startswith("s3://"):
+        bucket, _, prefix = source.removeprefix("s3://").partition("/")
+        return S3Source(bucket, prefix, get_s3_client(max_pool_connections=jobs))
+    if not os.path.isdir(source):
+        raise Exception(f"Source directory {source} does not exist")
+    return LocalSource(source)
+
+
+def sync_mirror(s3_source, directory, jobs=DEFAULT_JOBS):
+    """Mirror the dashboard files of `s3_source` into `directory`.
+
+    Only files that are new, whose ETag changed or that are missing locally
+    are downloaded, `jobs` at a time. Files that were deleted from S3 are
+    deleted from the mirror. Mirrored files get the modification time of
+    their object.
+    """
+    state_path = os.path.join(directory, SYNC_STATE_FILE)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r") as f:
+            saved = json.load(f)
+        if saved.get("source") == s3_source.name:
+            state = saved["objects"]
+
+    objects = s3_source.list_objects()
+    missing = [
+        key
+        for key, obj in objects.items()
+        if state.get(key) != obj["etag"]
+        or not os.path.exists(os.path.join(directory, key))
+    ]
+
+    def download(key):
+        path = os.path.join(directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        try:
+            body = s3_source.open(key)
+            try:
+                with open(temp_path, "wb") as f:
+                    shutil.copyfileobj(body, f)
+            finally:
+                body.close()
+            os.replace(temp_path, path)
+        except BaseException:
+            # Don't leave a partial download behind
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        modified_at = datetime.fromisoformat(objects[key]["last_modified"]).timestamp()
+        os.utime(path, (modified_at, modified_at))
+
+    synced = {key: etag for key, etag in state.items() if key in objects}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(download, key): key for key in missing}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                future.result()
+                synced[key] = objects[key]["etag"]
+            except Exception as e:
+                synced.pop(key, None)
+                errors.append(f"{key}: {e!r}")
+
+    removed = [key for key in state if key not in objects]
+    for key in removed:
+        path = os.path.join(directory, key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Saved even if some downloads failed, so they are the only ones retried
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"source": s3_source.name, "objects": synced}, f)
+    os.replace(temp_path, state_path)
+
+    print(
+        f"Synced {s3_source.name} into {directory}: {len(objects)} dashboard files, "
+        f"downloaded {len(missing) - len(errors)}, deleted {len(removed)}"
+    )
+    if errors:
+        raise Exception("Failed to sync files:\n  - " + "\n  - ".join(errors))
 
-def parse_paths():
-    # Get paths directly from S3
-    s3 = boto3.client("s3")
-    paginator = s3.get_paginator("list_objects_v2")
-    result = []
-
-    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix="logs/"):
-        if "Contents" in page:
-            for obj in page["Contents"]:
-                if obj["Key"].endswith(DASHBOARD_LOG_FILE_SUFFIX):
-                    result.append(obj["Key"])
-
-    paths = result
 
+def parse_paths(paths):
+    """Select the most recent run of every evaluation and model among `paths`."""
     # Group paths by evaluation-model combination and get the most recent ones
     eval_model_paths = defaultdict(list)
     for path in paths:
@@ -150,24 +309,148 @@ def get_default_metrics_from_config(original_config, eval_name, env):
     return None, None
 
 
-def get_scores_from_file(path):
-    """Download and extract scores from the dashboard file."""
-    try:
-        s3 = boto3.client("s3")
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=path)
-        data = json.loads(response["Body"].read().decode("utf-8"))
+def get_s3_client(max_pool_connections=DEFAULT_JOBS):
+    """Create an S3 client that can be shared by all download threads."""
+    return boto3.client("s3", config=Config(max_pool_connections=max_pool_connections))
+
 
-        if "results" in data and "scores" in data["results"]:
-            return data["results"]["scores"]
+def get_scores_from_file(path, source):
+    """Download and extract scores from the dashboard file.
+
+    Only the beginning of the file up to the end of the scores is read,
+    without keeping the values before them in memory. If the scores aren't
+    where they're expected, the whole file is downloaded and parsed instead.
+    Files that aren't valid JSON raise.
+    """
+    try:
+        body = source.open(path)
+        try:
+            return get_score_names(read_json_path(body, SCORES_PATH))
+        except PathNotFound as e:
+            print(f"WARNING: reading the whole file {path}, {e} not found")
+        finally:
+            # Stop the download if the scores were found before the end
+            body.close()
+
+        with source.open(path) as body:
+            data = json.loads(body.read().decode("utf-8"))
+
+        if isinstance(data.get("results"), dict) and "scores" in data["results"]:
+            return get_score_names(data["results"]["scores"])
     except Exception:
-        print("ERROR: failed to get scores from the file")
+        print(f"ERROR: failed to get scores from the file {path}")
         raise
 
     return []
 
 
-def extract_default_metrics(path, env_name, original_config=None, eval_name=None):
-    """Extract default metrics from dashboard file and validate against original config."""
+def get_score_names(scores):
+    """Keep the names of the scorers and of their metrics, in file order."""
+    return [
+        {"name": score["name"], "metrics": list(score.get("metrics", {}))}
+        for score in scores
+    ]
+
+
+def get_scores(paths, source, jobs=DEFAULT_JOBS):
+    """Download the scores of every dashboard file once, `jobs` files at a time.
+
+    Paths that appear more than once (e.g. stage logs, which are used for both
+    the stage and dev environments) are only downloaded once.
+    """
+    unique_paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        scores = executor.map(
+            lambda path: get_scores_from_file(path, source), unique_paths
+        )
+        return dict(zip(unique_paths, scores))
+
+
+def load_manifest(path, source):
+    """Load the dashboard files seen by the previous run on `source`, if any."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("source") != source:
+        return {}
+    return manifest["objects"]
+
+
+def save_manifest(path, source, objects):
+    """Write the manifest atomically, so an interrupted run keeps the previous one."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "source": source, "objects": objects}, f
+        )
+    os.replace(temp_path, path)
+
+
+def update_manifest(objects, manifest, paths, source, jobs=DEFAULT_JOBS):
+    """Return the manifest of the listed `objects` with the scores of all `paths`.
+
+    The scores of a file are reused from the previous manifest while its ETag
+    and modification time are unchanged, only new and modified files are
+    downloaded. Files that were deleted are dropped from the manifest.
+    """
+    updated = {}
+    for key, obj in objects.items():
+        updated[key] = dict(obj)
+        previous = manifest.get(key)
+        if (
+            previous is not None
+            and "scores" in previous
+            and previous["etag"] == obj["etag"]
+            and previous["last_modified"] == obj["last_modified"]
+        ):
+            updated[key]["scores"] = previous["scores"]
+
+    missing = [path for path in paths if "scores" not in updated[path]]
+    for path, scores in get_scores(missing, source, jobs).items():
+        updated[path]["scores"] = scores
+    print(
+        f"{len(objects)} dashboard files, read the scores of {len(missing)} "
+        f"and reused {len(set(paths)) - len(set(missing))} from the manifest"
+    )
+    return updated
+
+
+def extract_default_metrics(
+    paths, scores_by_path, env_name, original_config=None, eval_name=None
+):
+    """Extract default metrics from dashboard files and validate them against every file.
+
+    The defaults come from the original config, or else from the first file.
+    They must then exist in the scores of every file of the evaluation.
+    """
+    default_scorer, default_metric = get_default_metrics(
+        paths[0], scores_by_path[paths[0]], env_name, original_config, eval_name
+    )
+
+    errors = []
+    for path in paths:
+        scorer_matches = [
+            s for s in scores_by_path[path] if s["name"] == default_scorer
+        ]
+        if not scorer_matches:
+            errors.append(f"Scorer '{default_scorer}' not found in file {path}")
+        elif default_metric not in scorer_matches[0].get("metrics", []):
+            errors.append(
+                f"Metric '{default_metric}' not found in file {path} for scorer '{default_scorer}'"
+            )
+    if errors:
+        raise Exception(
+            f"Invalid default scorer or metric for {env_name}/{eval_name}:\n  - "
+            + "\n  - ".join(errors)
+        )
+
+    return default_scorer, default_metric
+
+
+def get_default_metrics(path, scores, env_name, original_config=None, eval_name=None):
+    """Get the default metrics of the original config, or else the first ones of the file."""
     # Get values from the original config for the specific environment
     config_scorer = None
     config_metric = None
@@ -176,30 +459,11 @@ def extract_default_metrics(path, env_name, original_config=None, eval_name=None
             original_config, eval_name, env_name
         )
 
-    # Get scores from the dashboard file
-    scores = get_scores_from_file(path)
-
-    # If we have config values, check if they exist in the file
+    # If we have config values, they are checked against every file by the caller
     if config_scorer and config_metric:
-        # Find the scorer in the file
-        scorer_matches = [s for s in scores if s["name"] == config_scorer]
-        if scorer_matches:
-            # Check if the metric exists for this scorer
-            metrics = scorer_matches[0].get("metrics", {})
-            if config_metric in metrics:
-                # Both scorer and metric found in file - use them
-                return config_scorer, config_metric
-            else:
-                raise Exception(
-                    f"Metric '{config_metric}' from config not found in file for scorer '{config_scorer}'"
-                )
-
-        else:
-            raise Exception(
-                f"Scorer '{config_scorer}' from config not found in file {path}"
-            )
+        return config_scorer, config_metric
 
-    # If config values don't exist or weren't found in the file, use the first ones from the file
+    # If config values don't exist, use the first ones from the file
     if scores:
         if len(scores) > 1:
             scorer_names = [score["name"] for score in scores]
@@ -208,10 +472,10 @@ def extract_default_metrics(path, env_name, original_config=None, eval_name=None
             )
 
         first_scorer = scores[0]["name"]
-        metrics = scores[0].get("metrics", {})
+        metrics = scores[0].get("metrics", [])
 
         # Filter out stderr metrics
-        non_stderr_metrics = {k: v for k, v in metrics.items() if k != "stderr"}
+        non_stderr_metrics = [metric for metric in metrics if metric != "stderr"]
         if non_stderr_metrics:
             if len(non_stderr_metrics) > 1:
                 print(
@@ -221,13 +485,13 @@ def extract_default_metrics(path, env_name, original_config=None, eval_name=None
             return first_scorer, first_metric
         else:
             raise Exception(
-                f"Scorer '{config_scorer}' does not have any metrics in file {path}"
+                f"Scorer '{first_scorer}' does not have any metrics in file {path}"
             )
 
     return "choice", "accuracy"
 
 
-def create_config(paths_list, original_config=None):
+def create_config(paths_list, scores_by_path, original_config=None):
     # Group paths by environment and evaluation name
     env_eval_paths = defaultdict(lambda: defaultdict(list))
     for path in paths_list:
@@ -272,7 +536,11 @@ def create_config(paths_list, original_config=None):
 
                 # Get default scorer and metric from original config or fallback
                 default_scorer, default_metric = extract_default_metrics(
-                    env_eval_paths[env][eval_name][0], env, original_config, eval_name
+                    env_eval_paths[env][eval_name],
+                    scores_by_path,
+                    env,
+                    original_config,
+                    eval_name,
                 )
 
                 eval_config = {
@@ -389,6 +657,32 @@ def check_inconsistencies(config, env_eval_paths):
         raise Exception("Inconsistencies found, not writing the config")
 
 
+def generate_config(
+    source,
+    original_config=None,
+    manifest_path=MANIFEST_PATH,
+    full=False,
+    jobs=DEFAULT_JOBS,
+):
+    """Generate the config of the most recent runs of `source`.
+
+    The scores of the files that didn't change since the previous run are
+    read from the manifest at `manifest_path`, unless `full` is set, and the
+    manifest is then updated.
+    """
+    objects = source.list_objects()
+    paths_list = parse_paths(list(objects))
+
+    # Get the scores of every run, to validate the defaults against all of
+    # them, reading only the files that changed since the previous run
+    manifest = {} if full else load_manifest(manifest_path, source.name)
+    manifest = update_manifest(objects, manifest, paths_list, source, jobs)
+    save_manifest(manifest_path, source.name, manifest)
+    scores_by_path = {path: manifest[path]["scores"] for path in paths_list}
+
+    return create_config(paths_list, scores_by_path, original_config)
+
+
 def extract_comments(file_path):
     """Extract comments from the top of the original file."""
     comments = []
@@ -413,15 +707,45 @@ def extract_comments(file_path):
 def main():
     parser = argparse.ArgumentParser(
         description="Automatically generate and validate a YAML config from S3",
-        epilog="Example: python3 scripts/update_config.py --input config.yml --output config.yml",
+        epilog="Examples: python3 -m scripts.update_config --input config.yml --output config.yml\n"
+        "python3 -m scripts.update_config --source mirror --sync --input config.yml --output config.yml",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
     parser.add_argument(
         "--input",
         help="Original YAML config file to get default metrics from",
-        required=True,
     )
-    parser.add_argument("--output", help="Output file for YAML config", required=True)
+    parser.add_argument("--output", help="Output file for YAML config")
+    parser.add_argument(
+        "--source",
+        default=f"s3://{BUCKET_NAME}/logs/",
+        help="s3://bucket/prefix to read the dashboard files from, or a local directory "
+        "with the same logs/<env>/<eval>/<provider+model>/<run>/ layout "
+        "(default: s3://$AWS_S3_BUCKET/logs/)",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Mirror the new and changed dashboard files of s3://$AWS_S3_BUCKET/logs/ "
+        "into the --source directory first. Without --input and --output, only sync",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=MANIFEST_PATH,
+        help=f"Manifest of the dashboard files seen by the previous run (default: {MANIFEST_PATH})",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the manifest and download the scores of every run again",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of dashboard files to download at the same time (default: {DEFAULT_JOBS})",
+    )
 
     if len(sys.argv) == 1:
         parser.print_help()
@@ -429,6 +753,17 @@ def main():
 
     args = parser.parse_args()
 
+    if args.sync:
+        if args.source.startswith("s3://"):
+            parser.error("--sync needs a local --source directory")
+        sync_mirror(
+            get_source(f"s3://{BUCKET_NAME}/logs/", args.jobs), args.source, args.jobs
+        )
+        if not args.input and not args.output:
+            return
+    if not args.input or not args.output:
+        parser.error("--input and --output are required")
+
     # Load original config if provided
     original_config = None
     comments = []
@@ -440,11 +775,14 @@ def main():
         with open(args.input, "r") as f:
             original_config = yaml.safe_load(f)
 
-    # Parse paths from file or S3
-    paths_list = parse_paths()
-
-    # Generate config
-    config = create_config(paths_list, original_config)
+    # Generate config from S3 or a local mirror
+    config = generate_config(
+        get_source(args.source, args.jobs),
+        original_config,
+        args.manifest,
+        args.full,
+        args.jobs,
+    )
 
     # Convert to YAML
     yaml_config = yaml.dump(config, sort_keys=False, default_flow_style=False)
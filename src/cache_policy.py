@@ -0,0 +1,326 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from typing import Any, TypeVar
+
+from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.caching.hashing import update_hash
+
+# Memory budget shared by the cached functions of `src`, least recently used
+# entries of any function are evicted first once it's exceeded
+CACHE_MAX_MB = float(os.getenv("CACHE_MAX_MB", "512"))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Returned by `CachePolicy.get` on a miss, since None is a valid cached value
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    function: str
+    max_entries: int | None
+    ttl: float | None
+    entries: int = 0
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    # Entries dropped for the memory budget or the entry limit, and expired entries
+    evictions: int = 0
+    expirations: int = 0
+    # Misses that waited for a concurrent call with the same key instead of computing
+    coalesced: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    # The pickled value, or the value itself for functions that share their values
+    value: Any
+    size: int
+    expires_at: float | None
+
+
+class CachePolicy:
+    """Process-wide memory budget for the cached functions of `src`.
+
+    Like `st.cache_data`, values are stored pickled and every hit returns a new
+    copy, unless the function shares its values (see `cached`). Every entry
+    counts against one memory budget (the size of the pickled value, or an
+    estimate for shared values), on top of the entry limit and TTL of its
+    function. When the budget is exceeded, the least recently used entries are
+    evicted first, whatever the function they belong to.
+
+    Concurrent misses for the same key are coalesced: the first caller computes
+    the value, the others wait for it (see `claim` and `release`).
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        # (function, key) -> entry, least recently used first
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        # Function -> its keys, least recently used first
+        self._keys: dict[str, OrderedDict[str, None]] = {}
+        self._stats: dict[str, CacheStats] = {}
+        # (function, key) -> stored value (or exception) of the call computing it
+        self._flights: dict[tuple[str, str], Future[Any]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def register(
+        self, function: str, max_entries: int | None = None, ttl: float | None = None
+    ) -> None:
+        with self._lock:
+            self._keys.setdefault(function, OrderedDict())
+            stats = self._stats.get(function)
+            # Registering a function again (e.g. a module reloaded by Streamlit)
+            # keeps the counters, which must match the entries still stored
+            if stats is None:
+                self._stats[function] = CacheStats(function, max_entries, ttl)
+            else:
+                self._stats[function] = replace(stats, max_entries=max_entries, ttl=ttl)
+
+    def get(self, function: str, key: str, count_miss: bool = True) -> Any:
+        """Return the value stored for `key`, or `MISSING` on a miss."""
+        with self._lock:
+            entry = self._entries.get((function, key))
+            if entry is not None and entry.expires_at is not None:
+                if entry.expires_at <= time.monotonic():
+                    self._remove(function, key, "expirations")
+                    entry = None
+
+            if entry is None:
+                if count_miss:
+                    self._count(function, "misses")
+                return MISSING
+
+            self._entries.move_to_end((function, key))
+            self._keys[function].move_to_end(key)
+            self._count(function, "hits")
+            return entry.value
+
+    def put(self, function: str, key: str, value: Any, size: int | None = None) -> None:
+        """Store a value, `size` defaults to its length (e.g. of the pickled bytes)."""
+        if size is None:
+            size = len(value)
+        with self._lock:
+            if (function, key) in self._entries:
+                self._remove(function, key, None)
+            # A value larger than the whole budget would evict everything else
+            if size > self.max_bytes:
+                return
+
+            stats = self._stats[function]
+            expires_at = time.monotonic() + stats.ttl if stats.ttl else None
+            self._entries[(function, key)] = _Entry(value, size, expires_at)
+            self._keys[function][key] = None
+            self._size += size
+            self._stats[function] = replace(
+                stats, entries=stats.entries + 1, size=stats.size + size
+            )
+
+            keys = self._keys[function]
+            if stats.max_entries is not None:
+                while len(keys) > stats.max_entries:
+                    self._remove(function, next(iter(keys)), "evictions")
+            while self._size > self.max_bytes:
+                oldest_function, oldest_key = next(iter(self._entries))
+                self._remove(oldest_function, oldest_key, "evictions")
+
+    def claim(self, function: str, key: str) -> "Future[Any] | None":
+        """Claim the computation of a missing value.
+
+        Returns None if the caller should compute the value and then `release`
+        it, or the future of the concurrent call already computing it.
+        """
+        with self._lock:
+            flight = self._flights.get((function, key))
+            if flight is None:
+                self._flights[(function, key)] = Future()
+                return None
+            self._count(function, "coalesced")
+            return flight
+
+    def release(self, function: str, key: str, value: Any) -> None:
+        """Hand the computed value (or the exception raised) to the waiting callers."""
+        with self._lock:
+            flight = self._flights.pop((function, key))
+        if isinstance(value, BaseException):
+            flight.set_exception(value)
+        else:
+            flight.set_result(value)
+
+    def clear(self, function: str | None = None) -> None:
+        with self._lock:
+            functions = [function] if function is not None else list(self._keys)
+            for name in functions:
+                for key in list(self._keys.get(name, ())):
+                    self._remove(name, key, None)
+
+    def stats(self) -> list[CacheStats]:
+        return list(self._stats.values())
+
+    def _remove(self, function: str, key: str, reason: str | None) -> None:
+        entry = self._entries.pop((function, key))
+        del self._keys[function][key]
+        self._size -= entry.size
+        stats = self._stats[function]
+        stats = replace(stats, entries=stats.entries - 1, size=stats.size - entry.size)
+        if reason is not None:
+            stats = replace(stats, **{reason: getattr(stats, reason) + 1})
+        self._stats[function] = stats
+
+    def _count(self, function: str, counter: str) -> None:
+        stats = self._stats[function]
+        self._stats[function] = replace(stats, **{counter: getattr(stats, counter) + 1})
+
+
+CACHE_POLICY = CachePolicy(int(CACHE_MAX_MB * 1024 * 1024))
+
+
+def cached(
+    func: F | None = None,
+    *,
+    max_entries: int | None = None,
+    ttl: float | timedelta | None = None,
+    hash_funcs: dict[type | str, Callable[[Any], Any]] | None = None,
+    policy: CachePolicy | None = None,
+    copy: bool = True,
+) -> Any:
+    """Cache the return values of a function like `st.cache_data`, within the memory budget.
+
+    Arguments are hashed like `st.cache_data` does (including `hash_funcs`, and
+    skipping arguments whose name starts with an underscore), and the wrapper has
+    a `clear()` method to drop the entries of the function and a `set(value,
+    *args, **kwargs)` method to replace the value cached for some arguments, in
+    one step. Concurrent calls
+    with the same arguments run the function once.
+
+    With `copy=False`, the return value is kept as is and every hit returns the
+    same object, like `st.cache_resource`: hits cost nothing, but callers must
+    not modify the value (e.g. figures, frozensets or frozen logs). Shared
+    values count against the budget with an estimate of their size instead of
+    being pickled (see `estimate_size`).
+
+    Args:
+        func: The function to cache
+        max_entries: Maximum number of entries kept for the function
+        ttl: Seconds (or timedelta) after which an entry expires
+        hash_funcs: Mapping from types (or their fully qualified names) to the
+            function used to hash them
+        policy: The cache policy to store entries in, defaults to `CACHE_POLICY`
+        copy: Whether hits return a copy of the value, False to share it
+
+    """
+    if isinstance(ttl, timedelta):
+        ttl = ttl.total_seconds()
+
+    def decorator(func: F) -> F:
+        cache_policy = policy or CACHE_POLICY
+        name = f"{func.__module__}.{func.__qualname__}"
+        cache_policy.register(name, max_entries, ttl)
+        signature = inspect.signature(func)
+        load = pickle.loads if copy else _shared
+
+        def store(value: Any) -> tuple[Any, int]:
+            if copy:
+                pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                return pickled, len(pickled)
+            return value, estimate_size(value)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(func, signature, args, kwargs, hash_funcs)
+            value = cache_policy.get(name, key)
+            if value is not MISSING:
+                return load(value)
+
+            flight = cache_policy.claim(name, key)
+            if flight is not None:
+                return load(flight.result())
+
+            try:
+                # Another call may have stored the value since our lookup
+                value = cache_policy.get(name, key, count_miss=False)
+                if value is not MISSING:
+                    cache_policy.release(name, key, value)
+                    return load(value)
+
+                result = func(*args, **kwargs)
+                value, size = store(result)
+            except BaseException as e:
+                cache_policy.release(name, key, e)
+                raise
+            cache_policy.put(name, key, value, size)
+            cache_policy.release(name, key, value)
+            return result
+
+        def set_value(value: Any, *args, **kwargs) -> None:
+            key = _make_key(func, signature, args, kwargs, hash_funcs)
+            cache_policy.put(name, key, *store(value))
+
+        wrapper.clear = lambda: cache_policy.clear(name)  # type: ignore[attr-defined]
+        wrapper.set = set_value  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator if func is None else decorator(func)
+
+
+def _shared(value: Any) -> Any:
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory held by a shared cached value, without serializing it.
+
+    Values with an `nbytes` attribute (e.g. `FigureJSON`, numpy arrays) report
+    their own size, strings and bytes count their length, and the items of
+    tuples, lists, sets and dicts are counted one level deep. Anything else
+    counts as its `sys.getsizeof`, e.g. objects owned by a shared log.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_shallow_size(item) for item in value.items())
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(_shallow_size(item) for item in value)
+    return size
+
+
+def _shallow_size(value: Any) -> int:
+    if isinstance(value, tuple):
+        return sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _make_key(
+    func: Callable[..., Any],
+    signature: inspect.Signature,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    hash_funcs: dict[type | str, Callable[[Any], Any]] | None,
+) -> str:
+    hasher = hashlib.md5(usedforsecurity=False)
+    for name, value in signature.bind(*args, **kwargs).arguments.items():
+        if name.startswith("_"):
+            continue
+        update_hash(name, hasher, CacheType.DATA)
+        update_hash(value, hasher, CacheType.DATA, func, hash_funcs)
+    return hasher.hexdigest()
@@ -1,28 +1,74 @@
+import hashlib
+import logging
 import os
 import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple, cast
 
-import streamlit as st
+import orjson
 import yaml
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yml"
+
+# Directory of the per-environment configs compiled by `make config`
+COMPILED_CONFIG_DIR = Path(
+    os.getenv(
+        "CONFIG_COMPILED_DIR", str(Path(__file__).parent.parent / ".cache" / "config")
+    )
+)
+
+# The C YAML loader is much faster, but only available if PyYAML was built with libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def extract_model_name(path: str) -> str | None:
+    """Extract the model name from a path like s3://$AWS_S3_BUCKET/logs/prod/bbh/anthropic+claude-3-7-sonnet-20250219/..."""
+    match = re.search(r"/logs/\w+/\w+/([^/]+)/", path)
+    return match.group(1) if match else None
+
+
+def extract_timestamp(path: str) -> str:
+    """Extract the run timestamp from a log path, for sorting runs by recency."""
+    match = re.search(r"(\d{4}-\d{2}-\d{2}[T-]\d{2}-\d{2}-\d{2})", path)
+    return match.group(1) if match else ""
+
+
+class RunInfo(NamedTuple):
+    env: str
+    task: str
+    # None for paths outside of the logs/<env>/<task>/<model>/ layout
+    model: str | None
+    timestamp: str
 
 
 class EvaluationConfig(BaseModel):
+    # Shared by every session, see `load_config`
+    model_config = ConfigDict(frozen=True)
+
     name: str
     default_scorer: str
     default_metric: str
-    paths: list[str]
+    paths: tuple[str, ...]
+
+    _model_names: frozenset[str] = PrivateAttr(default=frozenset())
+
+    def model_post_init(self, context: Any) -> None:
+        self._model_names = frozenset(
+            model
+            for model in (extract_model_name(path) for path in self.paths)
+            if model is not None
+        )
 
     @property
-    def model_names(self) -> set[str]:
-        """Extract model names from paths."""
-        models = set()
-        for path in self.paths:
-            # Extract model name from path like: s3://$AWS_S3_BUCKET/logs/prod/bbh/anthropic+claude-3-7-sonnet-20250219/...
-            match = re.search(r"/logs/\w+/\w+/([^/]+)/", path)
-            if match:
-                models.add(match.group(1))
-        return models
+    def model_names(self) -> frozenset[str]:
+        """Model names of the paths, extracted once when the config is loaded."""
+        return self._model_names
 
     @property
     def prefixed_name(self) -> str:
@@ -30,7 +76,7 @@ class EvaluationConfig(BaseModel):
 
     @field_validator("paths")
     @classmethod
-    def substitute_env_vars(cls, paths: list[str]) -> list[str]:
+    def substitute_env_vars(cls, paths: tuple[str, ...]) -> tuple[str, ...]:
         def return_environment_variable_or_throw(m):
             var_name = m.group(1) or m.group(
                 2
@@ -52,62 +98,233 @@ class EvaluationConfig(BaseModel):
             )
             processed_paths.append(path)
 
-        return processed_paths
+        return tuple(processed_paths)
+
+
+@dataclass(frozen=True)
+class ConfigIndex:
+    """Lookups over the runs of an environment, built once when the config is loaded."""
+
+    # Model -> paths of its runs, in config order
+    model_runs: Mapping[str, tuple[str, ...]]
+    # Task name -> categories listing it
+    task_categories: Mapping[str, tuple[str, ...]]
+    # Category -> names of its tasks
+    category_tasks: Mapping[str, tuple[str, ...]]
+    # Path -> what the run is
+    runs: Mapping[str, RunInfo]
+
+    def __post_init__(self) -> None:
+        for name in ("model_runs", "task_categories", "category_tasks", "runs"):
+            object.__setattr__(self, name, MappingProxyType(dict(getattr(self, name))))
+
+    def __reduce__(self) -> tuple:
+        # Mapping proxies can't be pickled, the copy wraps plain dicts again
+        return type(self), (
+            dict(self.model_runs),
+            dict(self.task_categories),
+            dict(self.category_tasks),
+            dict(self.runs),
+        )
+
+    @classmethod
+    def build(cls, config: "EnvironmentConfig", env: str) -> "ConfigIndex":
+        model_runs: dict[str, list[str]] = {}
+        task_categories: dict[str, list[str]] = {}
+        category_tasks: dict[str, tuple[str, ...]] = {}
+        runs: dict[str, RunInfo] = {}
+        for category in type(config).model_fields:
+            tasks = getattr(config, category)
+            category_tasks[category] = tuple(task.name for task in tasks)
+            for task in tasks:
+                categories = task_categories.setdefault(task.name, [])
+                if category not in categories:
+                    categories.append(category)
+                for path in task.paths:
+                    if path in runs:
+                        continue
+                    model = extract_model_name(path)
+                    runs[path] = RunInfo(env, task.name, model, extract_timestamp(path))
+                    if model is not None:
+                        model_runs.setdefault(model, []).append(path)
+        return cls(
+            model_runs={model: tuple(paths) for model, paths in model_runs.items()},
+            task_categories={
+                task: tuple(categories) for task, categories in task_categories.items()
+            },
+            category_tasks=category_tasks,
+            runs=runs,
+        )
 
 
 class EnvironmentConfig(BaseModel):
-    agents: list[EvaluationConfig] = []
-    assistants: list[EvaluationConfig] = []
-    coding: list[EvaluationConfig] = []
-    cybersecurity: list[EvaluationConfig] = []
-    knowledge: list[EvaluationConfig] = []
-    mathematics: list[EvaluationConfig] = []
-    multimodal: list[EvaluationConfig] = []
-    reasoning: list[EvaluationConfig] = []
-    safeguards: list[EvaluationConfig] = []
+    model_config = ConfigDict(frozen=True)
+
+    agents: tuple[EvaluationConfig, ...] = ()
+    assistants: tuple[EvaluationConfig, ...] = ()
+    coding: tuple[EvaluationConfig, ...] = ()
+    cybersecurity: tuple[EvaluationConfig, ...] = ()
+    knowledge: tuple[EvaluationConfig, ...] = ()
+    mathematics: tuple[EvaluationConfig, ...] = ()
+    multimodal: tuple[EvaluationConfig, ...] = ()
+    reasoning: tuple[EvaluationConfig, ...] = ()
+    safeguards: tuple[EvaluationConfig, ...] = ()
+
+    _index: ConfigIndex = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        # The environment is passed as validation context by `load_config`
+        env = (context or {}).get("env", os.getenv("STREAMLIT_ENV", "dev"))
+        self._index = ConfigIndex.build(self, env)
+
+    @property
+    def index(self) -> ConfigIndex:
+        return self._index
 
     @property
     def total_tasks(self) -> int:
-        # Get unique task names across all categories
-        unique_tasks = {
-            task.name for field in self.model_fields for task in getattr(self, field)
-        }
-        return len(unique_tasks)
+        return len(self._index.task_categories)
 
     @property
     def total_runs(self) -> int:
-        unique_paths = set()
-        for field in self.model_fields:
-            for task in getattr(self, field):
-                for path in task.paths:
-                    unique_paths.add(path)
-
-        return len(unique_paths)
+        return len(self._index.runs)
 
     @property
     def total_models(self) -> int:
-        # Extract all unique model names from all paths
-        all_models = set()
-        for field in self.model_fields:
-            for task in getattr(self, field):
-                all_models.update(task.model_names)
+        return len(self._index.model_runs)
 
-        return len(all_models)
+
+@dataclass(frozen=True)
+class ConfigLoadTimings:
+    env: str
+    # "compiled" if the compiled config of the environment was used, else "yaml"
+    source: str
+    read: float
+    parse: float
+    validate: float
+
+    @property
+    def total(self) -> float:
+        return self.read + self.parse + self.validate
+
+
+_load_timings: ConfigLoadTimings | None = None
+
+
+def get_config_load_timings() -> ConfigLoadTimings | None:
+    """Return the timings of the last config load of this process."""
+    return _load_timings
+
+
+def config_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def get_compiled_config_path(
+    env: str, content_hash: str, directory: Path = COMPILED_CONFIG_DIR
+) -> Path:
+    return directory / f"{env}.{content_hash}.json"
+
+
+def parse_config(content: bytes) -> dict:
+    """Parse the YAML of config.yml, with the C loader if it's available."""
+    return yaml.load(content, Loader=_YAML_LOADER)
+
+
+def compile_config(
+    config_path: Path = CONFIG_PATH, directory: Path = COMPILED_CONFIG_DIR
+) -> list[Path]:
+    """Write the evaluations of each environment of the config to its own JSON file.
+
+    The files are keyed by the hash of the config, so they're ignored once the
+    config changes, and `load_config` then falls back to parsing the YAML.
+    Environment variables in the paths are substituted when the config is
+    loaded, not when it's compiled.
+    """
+    content = config_path.read_bytes()
+    content_hash = config_hash(content)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    compiled_paths = []
+    for env, env_config in parse_config(content).items():
+        path = get_compiled_config_path(env, content_hash, directory)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(orjson.dumps(env_config["evaluations"]))
+        os.replace(tmp_path, path)
+        compiled_paths.append(path)
+        # Drop the configs compiled from previous versions of the config
+        for outdated in directory.glob(f"{env}.*.json"):
+            if outdated != path:
+                outdated.unlink(missing_ok=True)
+    return compiled_paths
+
+
+# The config of the process, see `load_config`
+_config: EnvironmentConfig | None = None
+_config_lock = threading.Lock()
 
 
-@st.cache_data
 def load_config() -> EnvironmentConfig:
-    """Load evaluation logs configuration from config.yml."""
+    """Return the evaluation logs configuration of the process, loading it on first use.
+
+    The config is a resource of the process rather than a cached value: it's
+    loaded once with `read_config`, isn't evicted with the caches of `src`,
+    and is only replaced with `set_config` (see `src.config_reloader`). It's
+    shared by every caller, with its indexes (`EnvironmentConfig.index`) built
+    once, so it's read-only: its models are frozen and its lists are tuples.
+    """
+    config = _config
+    if config is None:
+        with _config_lock:
+            if _config is None:
+                set_config(read_config())
+            config = _config
+    return cast(EnvironmentConfig, config)
+
+
+def set_config(config: EnvironmentConfig | None) -> None:
+    """Replace the config of the process, None loads it again on next use."""
+    global _config
+    _config = config
+
+
+def read_config() -> EnvironmentConfig:
+    """Load evaluation logs configuration from config.yml.
+
+    Only the active environment is loaded, from the config compiled by `make
+    config` if it's up to date with config.yml, or from the YAML otherwise.
+    """
+    global _load_timings
     env = os.getenv("STREAMLIT_ENV", "dev")
 
-    config_path = Path(__file__).parent.parent / "config.yml"
+    start = time.perf_counter()
+    try:
+        content = CONFIG_PATH.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found at: {CONFIG_PATH}")
+    compiled_path = get_compiled_config_path(
+        env, config_hash(content), COMPILED_CONFIG_DIR
+    )
+    read = time.perf_counter()
+
     try:
-        with open(config_path, "r") as f:
-            raw_config = yaml.safe_load(f)
+        evaluations = orjson.loads(compiled_path.read_bytes())
+        source = "compiled"
     except FileNotFoundError:
-        raise FileNotFoundError(f"Config file not found at: {config_path}")
+        raw_config = parse_config(content)
+        if env not in raw_config:
+            raise ValueError(f"Environment '{env}' not found in config.yml")
+        evaluations = raw_config[env]["evaluations"]
+        source = "yaml"
+    parsed = time.perf_counter()
 
-    if env not in raw_config:
-        raise ValueError(f"Environment '{env}' not found in config.yml")
+    config = EnvironmentConfig.model_validate(evaluations, context={"env": env})
+    validated = time.perf_counter()
 
-    return EnvironmentConfig.model_validate(raw_config[env]["evaluations"])
+    _load_timings = ConfigLoadTimings(
+        env, source, read - start, parsed - read, validated - parsed
+    )
+    logging.info(
+        f"Loaded the {env} config from {source} in {_load_timings.total * 1000:.1f} ms"
+    )
+    return config
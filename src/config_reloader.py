@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from src import config as config_module
+from src.config import (
+    EnvironmentConfig,
+    config_hash,
+    load_config,
+    read_config,
+    set_config,
+)
+from src.log_utils.log_store import LogStore
+
+# Seconds between two checks of config.yml for changes, 0 disables hot reloading
+CONFIG_RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "5"))
+
+
+@dataclass(frozen=True)
+class ConfigDiff:
+    added: frozenset[str]
+    removed: frozenset[str]
+
+
+@dataclass(frozen=True)
+class ReloadStatus:
+    interval: float
+    content_hash: str | None = None
+    reloads: int = 0
+    last_reload_at: float | None = None
+    last_added: int = 0
+    last_removed: int = 0
+    last_error: str | None = None
+
+
+class ConfigReloader:
+    """Background thread that reloads the config when config.yml changes.
+
+    The file is only read and hashed when its modification time or size
+    changed, and the config is only reloaded when the hash of its content
+    changed. The new config replaces the config of the process in one step. Logs of runs
+    that were removed from the config are dropped from the log stores, logs of
+    runs that stayed are kept, and the charts of unchanged tasks still hit the
+    figure caches since those are keyed by log content.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        stores: Iterable[LogStore],
+        listeners: Iterable[Callable[[EnvironmentConfig], None]] = (),
+    ) -> None:
+        self.interval = interval
+        self.stores = list(stores)
+        self.listeners = list(listeners)
+        content = self.config_path.read_bytes()
+        self._signature = self._stat()
+        self._config = load_config()
+        self.status = ReloadStatus(interval=interval, content_hash=config_hash(content))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def config_path(self) -> Path:
+        return config_module.CONFIG_PATH
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="config-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                logging.exception("Failed to reload the config")
+                self.status = replace(self.status, last_error=repr(e))
+
+    def check(self) -> ConfigDiff | None:
+        """Reload the config if config.yml changed, returning the runs added and removed."""
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+        content_hash = config_hash(self.config_path.read_bytes())
+        if content_hash == self.status.content_hash:
+            return None
+
+        old_config = self._config
+        # Loaded and validated before it replaces the current config, a config
+        # that fails to load leaves the current one in place
+        new_config = read_config()
+        set_config(new_config)
+        self._config = new_config
+
+        old_runs = set(old_config.index.runs)
+        new_runs = set(new_config.index.runs)
+        diff = ConfigDiff(
+            added=frozenset(new_runs - old_runs),
+            removed=frozenset(old_runs - new_runs),
+        )
+        for store in self.stores:
+            store.discard(diff.removed)
+        for listener in self.listeners:
+            listener(new_config)
+
+        self.status = replace(
+            self.status,
+            content_hash=content_hash,
+            reloads=self.status.reloads + 1,
+            last_reload_at=time.time(),
+            last_added=len(diff.added),
+            last_removed=len(diff.removed),
+            last_error=None,
+        )
+        logging.info(
+            f"Reloaded the config: {len(diff.added)} runs added, {len(diff.removed)} removed"
+        )
+        return diff
+
+    def _stat(self) -> tuple[int, int]:
+        stat = self.config_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+
+# The reloader of the process, kept outside of `st.cache_resource` so that
+# clearing the resources doesn't start a second thread
+_reloader: ConfigReloader | None = None
+_reloader_lock = threading.Lock()
+
+
+def get_config_reloader() -> ConfigReloader | None:
+    """Start the config reloader of this process, or return None if it's disabled."""
+    global _reloader
+    from src.log_utils.decode import PROJECTIONS
+    from src.log_utils.local_backend import get_local_watcher
+    from src.log_utils.log_store import get_log_store
+    from src.log_utils.refresher import get_refresher
+
+    if CONFIG_RELOAD_INTERVAL <= 0 or os.getenv("STREAMLIT_ENV", "dev") == "test":
+        return None
+
+    def update_watched_paths(config: EnvironmentConfig) -> None:
+        paths = list(config.index.runs)
+        refresher = get_refresher()
+        if refresher is not None:
+            refresher.set_paths(paths)
+        watcher = get_local_watcher()
+        if watcher is not None:
+            watcher.set_paths(paths)
+
+    with _reloader_lock:
+        if _reloader is None:
+            _reloader = ConfigReloader(
+                CONFIG_RELOAD_INTERVAL,
+                [get_log_store(projection) for projection in PROJECTIONS],
+                [update_watched_paths],
+            )
+            _reloader.start()
+        return _reloader
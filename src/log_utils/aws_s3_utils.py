@@ -1,12 +1,96 @@
 import logging
+import time
 from urllib.parse import urlparse
 
 import boto3
 import streamlit as st
+from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from src.cache_policy import cached
+from src.log_utils.disk_cache import DiskCache
+from src.log_utils.request_policy import FETCH_TIMEOUT
 
 
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def get_s3_client(max_pool_connections: int = 10) -> BaseClient:
+    """Return an S3 client shared by all sessions of this process.
+
+    boto3 clients are thread-safe, so one client (and its connection pool) is
+    reused for all concurrent requests. Retries are left to the request policy
+    of the callers (see `src.log_utils.request_policy`), so that they aren't
+    multiplied by the retries of botocore.
+    """
+    return boto3.client(
+        "s3",
+        config=Config(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=FETCH_TIMEOUT,
+            read_timeout=FETCH_TIMEOUT,
+            retries={"mode": "standard", "total_max_attempts": 1},
+        ),
+    )
+
+
+def parse_s3_url(s3_url: str) -> tuple[str, str]:
+    """Split an S3 URL like s3://bucket/path/to/object into the bucket name and key."""
+    o = urlparse(s3_url, allow_fragments=False)
+    return o.netloc, o.path.lstrip("/")
+
+
+def read_s3_object(
+    s3_client: BaseClient,
+    bucket_name: str,
+    object_name: str,
+    cache: DiskCache | None = None,
+    max_age: float = 0,
+) -> bytes:
+    """Read the body of an S3 object, using and filling the local content cache.
+
+    A cached copy younger than `max_age` seconds is returned without contacting S3.
+    Older copies are revalidated with a conditional GET (If-None-Match), so an
+    unchanged object costs a 304 response instead of a full download.
+
+    Args:
+        s3_client: The S3 client to use
+        bucket_name (str): The name of the S3 bucket
+        object_name (str): The name of the S3 object
+        cache (DiskCache | None): The local content cache, or None to always download
+        max_age (float): Seconds after validation during which a cached copy is trusted
+
+    Returns:
+        bytes: The object body
+
+    """
+    # Keyed by bucket too, so that buckets with the same keys don't share entries
+    cache_key = f"{bucket_name}/{object_name}"
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is not None and time.time() - cached.validated_at < max_age:
+        return cached.body
+
+    request = {"Bucket": bucket_name, "Key": object_name}
+    if cached is not None:
+        request["IfNoneMatch"] = cached.etag
+
+    try:
+        response = s3_client.get_object(**request)
+    except ClientError as e:
+        if cache is not None and cached is not None and _is_not_modified(e):
+            cache.mark_validated(cache_key, cached.etag)
+            return cached.body
+        raise
+
+    body = response["Body"].read()
+    if cache is not None:
+        cache.put(cache_key, body, response["ETag"])
+    return body
+
+
+def _is_not_modified(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("304", "NotModified")
+
+
+@cached(ttl=3600, max_entries=1024, copy=False)
 def create_presigned_url(
     bucket_name: str, object_name: str, expiration: int = 3600
 ) -> str | None:
@@ -21,7 +105,7 @@ def create_presigned_url(
         str: The presigned URL as a string. If error, returns None.
 
     """
-    s3_client = boto3.client("s3")
+    s3_client = get_s3_client()
     try:
         response = s3_client.generate_presigned_url(
             "get_object",
@@ -36,7 +120,7 @@ def create_presigned_url(
     return response
 
 
-@st.cache_data
+@cached(max_entries=1024, copy=False)
 def parse_s3_url_for_presigned_url(s3_url: str) -> tuple[str, str]:
     """Parse an S3 URL and return the bucket name and object name.
 
@@ -49,9 +133,7 @@ def parse_s3_url_for_presigned_url(s3_url: str) -> tuple[str, str]:
         tuple[str, str]: The bucket name and object name
 
     """
-    o = urlparse(s3_url, allow_fragments=False)
-    bucket_name = o.netloc
-    dashboard_log_key = o.path.lstrip("/")
+    bucket_name, dashboard_log_key = parse_s3_url(s3_url)
 
     # Transform dashboard JSON path to eval zip path
     # From: logs/prod/.../filename.eval.dashboard.json
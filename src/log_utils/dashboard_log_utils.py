@@ -1,10 +1,18 @@
-import streamlit as st
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
 from inspect_ai.log import EvalScore
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
 from src.config import EvaluationConfig
+from src.log_utils.fingerprint import log_fingerprint
+from src.log_utils.model_registry import get_model_registry
+
+if TYPE_CHECKING:
+    from inspect_evals_dashboard_schema import ModelMetadata
 
 
-@st.cache_data(hash_funcs={DashboardLog: id, EvalScore: id})
+@cached(hash_funcs={DashboardLog: log_fingerprint}, max_entries=4096, copy=False)
 def get_scorer_by_name(log: DashboardLog, scorer_name: str) -> EvalScore:
     try:
         return next(score for score in log.results.scores if score.name == scorer_name)
@@ -13,9 +21,19 @@ def get_scorer_by_name(log: DashboardLog, scorer_name: str) -> EvalScore:
         return log.results.scores[0]
 
 
-@st.cache_data(hash_funcs={EvaluationConfig: id})
+# Keyed by the fields read, since the configs are replaced when config.yml changes
+@cached(
+    hash_funcs={
+        EvaluationConfig: lambda config: (
+            config.name,
+            config.default_scorer,
+            config.default_metric,
+        )
+    },
+    max_entries=64,
+)
 def read_default_values_from_configs(
-    eval_configs: list[EvaluationConfig],
+    eval_configs: Sequence[EvaluationConfig],
 ) -> dict[str, dict[str, str]]:
     default_values: dict[str, dict[str, str]] = {}
     for config in eval_configs:
@@ -26,12 +44,30 @@ def read_default_values_from_configs(
     return default_values
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(hash_funcs={DashboardLog: log_fingerprint}, max_entries=4096, copy=False)
 def get_all_metrics(
     log: DashboardLog, exclude: list[str] = ["stderr", "var"]
-) -> set[str]:
+) -> frozenset[str]:
     task_metrics: set[str] = set()
     for score in log.results.scores:
         metrics = {k: v for k, v in score.metrics.items() if k not in exclude}
         task_metrics.update(metrics.keys())
-    return task_metrics
+    return frozenset(task_metrics)
+
+
+def get_model_metadata(log: DashboardLog) -> "ModelMetadata":
+    """Return the metadata of the model of `log`.
+
+    The metadata is looked up by model id in the model registry, falling back to
+    the metadata of the log for models that weren't interned.
+    """
+    return get_model_registry().get(log.eval.model) or log.model_metadata
+
+
+def get_models_metadata(logs: Sequence[DashboardLog]) -> list["ModelMetadata"]:
+    """Return the metadata of the distinct models of `logs`, one entry per model."""
+    models: dict[str, ModelMetadata] = {}
+    for log in logs:
+        if log.eval.model not in models:
+            models[log.eval.model] = get_model_metadata(log)
+    return list(models.values())
@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections.abc import Mapping
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, TypeAlias
+
+import orjson
+from inspect_evals_dashboard_schema import DashboardLog
+from pydantic import ValidationError
+from src.log_utils.disk_cache import DiskCache
+from src.log_utils.fingerprint import assign_fingerprint, content_fingerprint
+from src.log_utils.frozen import FrozenDashboardLog
+
+# Opt-in: reuse logs that already passed validation from the local content
+# cache instead of validating their JSON again. The validated objects are stored
+# as pickles, so only enable this for a cache directory nobody else can write to.
+TRUSTED_DECODE = os.getenv("LOG_TRUSTED_DECODE", "false").lower() == "true"
+
+# A set of fields to keep from a log: each key maps either to True, to keep the
+# whole value, or to the nested set of fields to keep from it
+FieldSet: TypeAlias = Mapping[str, "FieldSet | bool"]
+
+# The fields read by the pages and the plots. Heavy fields like the sample ids
+# of the dataset, the plan, the stats, the packages and the revision are dropped.
+CHART_FIELDS: FieldSet = {
+    "eval": {
+        "run_id": True,
+        "task": True,
+        "model": True,
+        "created": True,
+        "dataset": {"name": True, "samples": True},
+        "config": {"epochs": True},
+    },
+    "results": {"total_samples": True, "completed_samples": True, "scores": True},
+    "location": True,
+    "model_metadata": True,
+    "task_metadata": True,
+    "eval_metadata": True,
+    "cost_estimates": True,
+}
+
+# Named field projections for the loaders, None keeps the full log
+PROJECTIONS: dict[str, FieldSet | None] = {"chart": CHART_FIELDS, "full": None}
+
+
+def parse_dashboard_log(
+    raw: bytes | memoryview,
+    location: str,
+    cache: DiskCache | None = None,
+    trusted: bool = False,
+    fields: FieldSet | None = None,
+) -> DashboardLog:
+    """Decode and validate a dashboard log from the raw JSON bytes.
+
+    The bytes are validated directly by pydantic, without building an intermediate
+    dict. If that fails, the JSON is parsed with orjson (or the standard library
+    for non-standard JSON like NaN) and validated from the Python objects instead.
+
+    If `fields` is given, the log is projected to these fields (see
+    `project_log_data`) before validation.
+
+    The log is read-only (see `src.log_utils.frozen`), so that it can be shared
+    by every session.
+
+    In trusted mode the validated log is kept in `cache`, keyed by the hash of
+    `raw`, the projection and the schema version, and later decodes of the same
+    bytes load it from there without validating again. Entries that fail to
+    load are validated again and replaced.
+
+    The log is fingerprinted from `raw`, the projection and the location (see
+    `src.log_utils.fingerprint`), so that caches keyed by logs are shared by
+    every load of the same content.
+
+    Args:
+        raw (bytes | memoryview): The dashboard log JSON, e.g. a memory-mapped file
+        location (str): The path the log was read from
+        cache (DiskCache | None): The content cache for trusted mode
+        trusted (bool): Whether to reuse previously validated logs
+        fields (FieldSet | None): The fields to keep, or None to keep the full log
+
+    Returns:
+        DashboardLog: The decoded read-only log with its location set to `location`
+
+    """
+    trusted_key = None
+    if trusted and cache is not None:
+        trusted_key = _trusted_key(raw, fields)
+        entry = cache.get(trusted_key)
+        validated = _unpickle_log(entry.body, location) if entry is not None else None
+        if validated is not None:
+            log = _with_location(validated, location)
+            assign_fingerprint(log, content_fingerprint(log, raw, _fields_key(fields)))
+            return log
+
+    log = _validate(raw) if fields is None else _validate_projected(raw, fields)
+    # Set location of DashboardLog from downloaded path
+    log = _with_location(log, location)
+    assign_fingerprint(log, content_fingerprint(log, raw, _fields_key(fields)))
+
+    if trusted_key is not None and cache is not None:
+        try:
+            pickled = pickle.dumps(log, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logging.warning(f"Failed to pickle the validated log {location}: {e!r}")
+        else:
+            cache.put(trusted_key, pickled, etag="")
+    return log
+
+
+def _unpickle_log(body: bytes, location: str) -> DashboardLog | None:
+    # Entries written by another version of the code may not load anymore
+    try:
+        log = pickle.loads(body)
+    except Exception as e:
+        logging.warning(f"Failed to load the validated log {location}: {e!r}")
+        return None
+    if not isinstance(log, FrozenDashboardLog):
+        logging.warning(f"Ignoring the validated log {location} of another type")
+        return None
+    return log
+
+
+def _validate(raw: bytes | memoryview) -> DashboardLog:
+    # pydantic only validates str, bytes and bytearray, and copying a
+    # memory-mapped file to bytes would defeat the mapping: orjson parses the
+    # mapped memory directly instead
+    if isinstance(raw, bytes):
+        try:
+            return FrozenDashboardLog.model_validate_json(raw)
+        except ValidationError:
+            pass
+
+    return FrozenDashboardLog.model_validate(_loads(raw))
+
+
+def _validate_projected(raw: bytes | memoryview, fields: FieldSet) -> DashboardLog:
+    # Not validated from bytes: the models of DashboardLog have "before"
+    # validators, for which pydantic builds Python objects from the JSON anyway.
+    # Serializing the projection back to JSON, or projecting in a "before"
+    # validator of the log, measured about 1.5x slower than this.
+    return FrozenDashboardLog.model_validate(project_log_data(_loads(raw), fields))
+
+
+def _with_location(log: DashboardLog, location: str) -> DashboardLog:
+    # The location isn't in the JSON, and read-only logs are updated by copy
+    return log.model_copy(update={"location": location})
+
+
+def _loads(raw: bytes | memoryview) -> Any:
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(bytes(raw))
+
+
+def project_log_data(data: dict[str, Any], fields: FieldSet) -> dict[str, Any]:
+    """Keep only the given fields of decoded dashboard log JSON.
+
+    Top-level fields that DashboardLog requires are always kept.
+    """
+    required = {
+        name for name, field in DashboardLog.model_fields.items() if field.is_required()
+    }
+    return {
+        key: _project(value, fields.get(key, True))
+        for key, value in data.items()
+        if key in fields or key in required
+    }
+
+
+def _project(value: Any, fields: "FieldSet | bool") -> Any:
+    if isinstance(fields, bool) or not isinstance(value, dict):
+        return value
+    return {key: _project(value[key], fields[key]) for key in fields if key in value}
+
+
+def _trusted_key(raw: bytes | memoryview, fields: FieldSet | None) -> str:
+    digest = hashlib.blake2b(raw, digest_size=20)
+    digest.update(_fields_key(fields))
+    return f"validated/{_schema_version()}/{digest.hexdigest()}"
+
+
+def _fields_key(fields: FieldSet | None) -> bytes:
+    return orjson.dumps(fields, option=orjson.OPT_SORT_KEYS)
+
+
+@functools.cache
+def _schema_version() -> str:
+    versions = []
+    for package in ("inspect_evals_dashboard_schema", "inspect_ai", "pydantic"):
+        try:
+            versions.append(version(package))
+        except PackageNotFoundError:
+            versions.append("unknown")
+    return "-".join(versions)
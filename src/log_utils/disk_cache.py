@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+# Directory of the local content cache for dashboard logs downloaded from S3,
+# set to an empty string to disable the cache
+LOG_CACHE_DIR = os.getenv(
+    "LOG_CACHE_DIR", str(Path(__file__).parents[2] / ".cache" / "logs")
+)
+LOG_CACHE_MAX_MB = int(os.getenv("LOG_CACHE_MAX_MB", "1024"))
+# Published runs are immutable, so by default a cached copy is trusted for a day
+# before it is revalidated against S3
+LOG_CACHE_MAX_AGE = float(os.getenv("LOG_CACHE_MAX_AGE", "86400"))
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    body: bytes
+    etag: str
+    validated_at: float
+
+
+class DiskCache:
+    """Local content cache for raw dashboard JSON bytes, keyed by S3 bucket and key.
+
+    Every entry is stored as two files named after the hash of its key: the
+    object body (`<hash>.json`) and a small metadata file (`<hash>.meta`) holding
+    the ETag and the time the entry was last validated against S3. The mtime of
+    the metadata file is the entry's last access time, the least recently used
+    entries are evicted once the total size of the bodies exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = sum(
+            body.stat().st_size for body in self.directory.glob("*.json")
+        )
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json", self.directory / f"{digest}.meta"
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the cached entry for `key` and mark it as recently used."""
+        body_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_bytes())
+            body = body_path.read_bytes()
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(
+            body=body, etag=meta["etag"], validated_at=meta["validated_at"]
+        )
+
+    def put(self, key: str, body: bytes, etag: str) -> None:
+        """Store `body` under `key`, evicting least recently used entries if needed."""
+        if len(body) > self.max_bytes:
+            return
+
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            old_size = body_path.stat().st_size if body_path.exists() else 0
+            _write_atomic(body_path, body)
+            self._write_meta(meta_path, etag)
+            self._total_bytes += len(body) - old_size
+            self._evict()
+
+    def mark_validated(self, key: str, etag: str) -> None:
+        """Record that the cached entry for `key` still matches the object in S3."""
+        _, meta_path = self._paths(key)
+        with self._lock:
+            self._write_meta(meta_path, etag)
+
+    def _write_meta(self, meta_path: Path, etag: str) -> None:
+        meta = {"etag": etag, "validated_at": time.time()}
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        for meta_path in self.directory.glob("*.meta"):
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path))
+            except OSError:
+                continue
+
+        for _, meta_path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            body_path = meta_path.with_suffix(".json")
+            try:
+                size = body_path.stat().st_size
+                body_path.unlink()
+                meta_path.unlink(missing_ok=True)
+            except OSError as e:
+                logging.warning(f"Failed to evict {body_path} from the log cache: {e}")
+                continue
+            self._total_bytes -= size
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Write to a temporary file first so that readers never see a partial file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+@st.cache_resource
+def get_disk_cache() -> DiskCache | None:
+    """Return the content cache shared by all sessions, or None if it's disabled."""
+    if not LOG_CACHE_DIR:
+        return None
+    return DiskCache(LOG_CACHE_DIR, max_bytes=LOG_CACHE_MAX_MB * 1024 * 1024)
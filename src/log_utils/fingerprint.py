@@ -0,0 +1,53 @@
+import hashlib
+import threading
+import weakref
+
+import orjson
+from inspect_evals_dashboard_schema import DashboardLog
+
+# id(log) -> fingerprint of the log. Entries are removed when their log is
+# garbage collected, so a recycled id never maps to the fingerprint of another log.
+_fingerprints: dict[int, str] = {}
+_lock = threading.Lock()
+
+
+def content_fingerprint(log: DashboardLog, *parts: bytes | memoryview) -> str:
+    """Return the fingerprint of a log decoded from the given content.
+
+    The fingerprint is the run id followed by a hash of the content the log was
+    built from (e.g. the raw JSON and the field projection) and of its location.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    digest.update((log.location or "").encode())
+    return f"{log.eval.run_id}:{digest.hexdigest()}"
+
+
+def assign_fingerprint(log: DashboardLog, fingerprint: str) -> None:
+    """Record the fingerprint of a log, called once when the log is loaded."""
+    key = id(log)
+    with _lock:
+        if key not in _fingerprints:
+            weakref.finalize(log, _forget, key)
+        _fingerprints[key] = fingerprint
+
+
+def log_fingerprint(log: DashboardLog) -> str:
+    """Return the fingerprint of a log, used to key the caches of logs.
+
+    Logs built outside of the loaders (e.g. in tests) are fingerprinted from
+    their serialized content on first use.
+    """
+    fingerprint = _fingerprints.get(id(log))
+    if fingerprint is None:
+        fingerprint = content_fingerprint(
+            log, orjson.dumps(log.model_dump(mode="json", exclude={"location"}))
+        )
+        assign_fingerprint(log, fingerprint)
+    return fingerprint
+
+
+def _forget(key: int) -> None:
+    with _lock:
+        _fingerprints.pop(key, None)
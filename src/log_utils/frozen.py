@@ -0,0 +1,202 @@
+import collections.abc
+import threading
+import types
+import typing
+from typing import Annotated, Any, TypeVar, Union, get_args, get_origin
+
+from inspect_ai.log._log import SCORER_PLACEHOLDER
+from inspect_evals_dashboard_schema import DashboardLog
+from pydantic import AfterValidator, BaseModel, ConfigDict, model_validator
+from pydantic.fields import FieldInfo
+
+M = TypeVar("M", bound=BaseModel)
+
+# Model class -> its read-only subclass
+_frozen_models: dict[type[BaseModel], type[BaseModel]] = {}
+# Classes whose read-only subclass is being built, for self-referencing models
+_building: set[type[BaseModel]] = set()
+_lock = threading.RLock()
+
+
+class FrozenDict(dict):
+    """A dict that can't be modified, for the dicts of read-only models."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> typing.NoReturn:
+        raise TypeError("The dict is read-only, modify a copy (e.g. `dict(d)`) instead")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple:
+        # Unpickled from a plain dict, since unpickling a dict sets its items
+        return FrozenDict, (dict(self),)
+
+
+def freeze_value(value: Any) -> Any:
+    """Return a read-only copy of free-form JSON values: tuples for lists, `FrozenDict` for dicts."""
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict({key: freeze_value(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def frozen_model(cls: type[M], **namespace: Any) -> type[M]:
+    """Return the read-only subclass of a pydantic model.
+
+    Objects validated with it are read-only all the way down: its models and
+    the models nested in them are frozen (setting an attribute raises a
+    `ValidationError`), lists are validated as tuples and dicts as
+    `FrozenDict`. The subclass has the qualified name of `cls`, so that
+    `hash_funcs` of `cls` apply to it, and it's pickled as itself. Copies made
+    with `model_copy` are read-only as well.
+
+    Args:
+        cls: The model class
+        **namespace: Attributes of the subclass, e.g. to replace a validator of
+            `cls` that modifies the validated object
+
+    """
+    with _lock:
+        frozen = _frozen_models.get(cls)
+        if frozen is None:
+            _building.add(cls)
+            try:
+                frozen = _build_frozen_model(cls, namespace)
+            finally:
+                _building.discard(cls)
+            _frozen_models[cls] = frozen
+            # Resolve the references to classes that were being built
+            for model in _frozen_models.values():
+                if not model.__pydantic_complete__:
+                    model.model_rebuild(_types_namespace=_forward_refs())
+        return typing.cast(type[M], frozen)
+
+
+def _build_frozen_model(cls: type[BaseModel], namespace: dict[str, Any]) -> type:
+    annotations = {}
+    fields = {}
+    for name, field in cls.model_fields.items():
+        annotation = _frozen_type(field.annotation, set())
+        if annotation is not field.annotation:
+            annotations[name] = annotation
+            fields[name] = _frozen_field(field)
+    return type(
+        cls.__name__,
+        (cls,),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__annotations__": annotations,
+            "__reduce__": _reduce,
+            "model_config": ConfigDict(frozen=True),
+            **fields,
+            **namespace,
+        },
+    )
+
+
+def _frozen_field(field: FieldInfo) -> FieldInfo:
+    # Defaults aren't validated by pydantic, so they would stay mutable
+    if field.is_required():
+        return field
+    default = field.get_default(call_default_factory=True)
+    if isinstance(default, BaseModel):
+        # Validated from the fields of the default model, into a read-only one
+        if field.default_factory is None:
+            return FieldInfo.merge_field_infos(
+                field, default=default.model_dump(), validate_default=True
+            )
+        return FieldInfo.merge_field_infos(
+            field,
+            default_factory=lambda: default.model_dump(),
+            validate_default=True,
+        )
+    return FieldInfo.merge_field_infos(field, validate_default=True)
+
+
+def _frozen_type(annotation: Any, visiting: set[int]) -> Any:
+    # Recursive type aliases (e.g. JSON values) are kept as they are
+    if id(annotation) in visiting:
+        return annotation
+    visiting = visiting | {id(annotation)}
+
+    if annotation is Any:
+        return Annotated[Any, AfterValidator(freeze_value)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if annotation in _building:
+            return _forward_ref_name(annotation)
+        return frozen_model(annotation)
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return Annotated[(_frozen_type(args[0], visiting), *annotation.__metadata__)]
+    if origin in (list, collections.abc.Sequence):
+        item = _frozen_type(args[0], visiting) if args else Any
+        return tuple[item, ...]  # type: ignore[valid-type]
+    if origin in (dict, collections.abc.Mapping):
+        key, value = (
+            (_frozen_type(arg, visiting) for arg in args) if args else (Any, Any)
+        )
+        return Annotated[dict[key, value], AfterValidator(FrozenDict)]  # type: ignore[valid-type]
+    if origin in (Union, types.UnionType):
+        return Union[tuple(_frozen_type(arg, visiting) for arg in args)]
+    if origin is tuple and args:
+        items = (
+            arg if arg is Ellipsis else _frozen_type(arg, visiting) for arg in args
+        )
+        return tuple.__class_getitem__(tuple(items))
+    return annotation
+
+
+def _forward_ref_name(cls: type[BaseModel]) -> str:
+    return f"_Frozen_{cls.__module__.replace('.', '_')}_{cls.__qualname__}"
+
+
+def _forward_refs() -> dict[str, type[BaseModel]]:
+    return {_forward_ref_name(cls): frozen for cls, frozen in _frozen_models.items()}
+
+
+def _reduce(self: BaseModel) -> tuple:
+    # Pickled as the model class it's derived from, which pickle can find by name
+    return _unpickle, (type(self).__mro__[1], self.__getstate__())
+
+
+def _unpickle(cls: type[BaseModel], state: dict[str, Any]) -> BaseModel:
+    frozen = frozen_model(cls)
+    model = frozen.__new__(frozen)
+    model.__setstate__(state)
+    return model
+
+
+def _populate_scorer_name_for_samples(data: Any) -> Any:
+    # EvalLog renames the placeholder scores of samples once they're validated,
+    # which read-only dicts don't allow, so they're renamed before validation
+    if isinstance(data, dict) and data.get("samples") and data.get("results"):
+        scores = data["results"].get("scores")
+        if scores:
+            for sample in data["samples"]:
+                sample_scores = sample.get("scores")
+                if sample_scores and SCORER_PLACEHOLDER in sample_scores:
+                    sample_scores[scores[0]["name"]] = sample_scores.pop(
+                        SCORER_PLACEHOLDER
+                    )
+    return data
+
+
+# Shared logs (the log store, the snapshot) are validated with this class
+FrozenDashboardLog = frozen_model(
+    DashboardLog,
+    populate_scorer_name_for_samples=model_validator(mode="before")(
+        _populate_scorer_name_for_samples
+    ),
+)
+
+
+def freeze_log(log: DashboardLog) -> DashboardLog:
+    """Return a read-only copy of a log, or the log itself if it's already read-only."""
+    if isinstance(log, FrozenDashboardLog):
+        return log
+    frozen = FrozenDashboardLog.model_validate_json(log.model_dump_json())
+    return frozen.model_copy(update={"location": log.location})
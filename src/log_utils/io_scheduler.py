@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, TypeVar
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Maximum number of storage requests (S3 or local reads and listings) running at
+# the same time in this process, across all sessions
+IO_MAX_CONCURRENCY = int(os.getenv("LOG_IO_MAX_CONCURRENCY", "16"))
+
+# Seconds between two checks for ended sessions while requests of sessions are
+# queued, their requests are then cancelled
+SESSION_CHECK_INTERVAL = float(os.getenv("LOG_IO_SESSION_CHECK_INTERVAL", "1"))
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Priority of a storage request, lower values run first."""
+
+    # Logs a page is waiting for
+    INTERACTIVE = 0
+    # Downloads requested by a user, e.g. the full logs of the JSON download
+    DOWNLOAD = 1
+    # Work nobody is waiting for, e.g. the background refresh
+    BACKGROUND = 2
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    max_concurrency: int
+    running: int
+    # Priority -> number of queued requests
+    queued: dict[Priority, int]
+    completed: int
+    # Queued requests dropped because their session ended, or cancelled by the caller
+    cancelled: int
+
+
+@dataclass(order=True)
+class _Task:
+    priority: int
+    sequence: int
+    func: Callable[[], Any] = field(compare=False)
+    future: Future = field(compare=False)
+    owner: str | None = field(compare=False)
+
+
+class IOScheduler:
+    """Process-wide queue of storage requests with a global concurrency cap.
+
+    Requests run in priority order (`Priority`), first in first out within a
+    priority. The requests queued on behalf of a session (their `owner`) are
+    cancelled once the session ends: a watcher thread checks the sessions every
+    `session_check_interval` seconds while such requests are queued, and a
+    request of an ended session is also dropped when it would run.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = IO_MAX_CONCURRENCY,
+        is_active: Callable[[str], bool] | None = None,
+        session_check_interval: float = SESSION_CHECK_INTERVAL,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.session_check_interval = session_check_interval
+        self._is_active = is_active or is_active_session
+        self._queue: list[_Task] = []
+        self._sequence = itertools.count()
+        self._workers: list[threading.Thread] = []
+        self._running = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        # Set while requests of sessions are queued, for the session watcher
+        self._owned_queued = threading.Event()
+        self._session_watcher: threading.Thread | None = None
+
+    def submit(
+        self,
+        func: Callable[[], T],
+        priority: Priority = Priority.INTERACTIVE,
+        owner: str | None = None,
+    ) -> "Future[T]":
+        """Queue a storage request, returning the future of its result."""
+        future: Future[T] = Future()
+        with self._condition:
+            heapq.heappush(
+                self._queue,
+                _Task(priority, next(self._sequence), func, future, owner),
+            )
+            # Workers are started on demand, up to the concurrency cap
+            if len(self._workers) < self.max_concurrency:
+                worker = threading.Thread(
+                    target=self._work,
+                    name=f"io-scheduler-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+            if owner is not None:
+                self._owned_queued.set()
+                if self._session_watcher is None:
+                    self._session_watcher = threading.Thread(
+                        target=self._watch_sessions,
+                        name="io-scheduler-sessions",
+                        daemon=True,
+                    )
+                    self._session_watcher.start()
+            self._condition.notify()
+        return future
+
+    def run(
+        self,
+        func: Callable[[], T],
+        priority: Priority = Priority.INTERACTIVE,
+        owner: str | None = None,
+    ) -> T:
+        """Queue a storage request and wait for its result."""
+        return self.submit(func, priority, owner).result()
+
+    def cancel(self, owner: str) -> int:
+        """Cancel the queued requests of a session, returning how many were cancelled."""
+        with self._condition:
+            cancelled = [task for task in self._queue if task.owner == owner]
+            self._queue = [task for task in self._queue if task.owner != owner]
+            heapq.heapify(self._queue)
+            self._cancelled += len(cancelled)
+        for task in cancelled:
+            _cancel(task.future)
+        return len(cancelled)
+
+    def stats(self) -> SchedulerStats:
+        with self._condition:
+            queued = {priority: 0 for priority in Priority}
+            for task in self._queue:
+                queued[Priority(task.priority)] += 1
+            return SchedulerStats(
+                max_concurrency=self.max_concurrency,
+                running=self._running,
+                queued=queued,
+                completed=self._completed,
+                cancelled=self._cancelled,
+            )
+
+    def _watch_sessions(self) -> None:
+        while True:
+            # Idle until a request of a session is queued
+            self._owned_queued.wait()
+            time.sleep(self.session_check_interval)
+            with self._condition:
+                owners = {task.owner for task in self._queue if task.owner is not None}
+                if not owners:
+                    self._owned_queued.clear()
+            for owner in owners:
+                if not self._is_active(owner):
+                    self.cancel(owner)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                task = heapq.heappop(self._queue)
+                if task.owner is not None and not self._is_active(task.owner):
+                    self._cancelled += 1
+                    _cancel(task.future)
+                    continue
+                if not task.future.set_running_or_notify_cancel():
+                    # Cancelled by the caller while queued
+                    self._cancelled += 1
+                    continue
+                self._running += 1
+
+            try:
+                task.future.set_result(task.func())
+            except BaseException as e:
+                task.future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._completed += 1
+
+
+def _cancel(future: Future) -> None:
+    if future.cancel():
+        # Wakes up callers waiting in `concurrent.futures.wait` or `as_completed`
+        future.set_running_or_notify_cancel()
+
+
+def current_session_id() -> str | None:
+    """Return the id of the session running the current script, if any."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def is_active_session(session_id: str) -> bool:
+    """Whether a Streamlit session is still connected, True outside of a server."""
+    if not Runtime.exists():
+        return True
+    return Runtime.instance().is_active_session(session_id)
+
+
+@st.cache_resource
+def get_io_scheduler() -> IOScheduler:
+    """Return the storage request scheduler shared by all sessions."""
+    return IOScheduler()
@@ -0,0 +1,203 @@
+import json
+import re
+from typing import Any, BinaryIO
+
+# Bytes read from the stream at a time
+CHUNK_SIZE = 64 * 1024
+
+# Where the scores of a dashboard log are
+SCORES_PATH = ("results", "scores")
+
+_WHITESPACE = b" \t\r\n"
+# Characters that can change the nesting depth, or start a string
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+# Characters that end a number, true, false or null
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+# A quote or a backslash inside a string
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class PathNotFound(Exception):
+    """The JSON document has no value at the requested path."""
+
+
+class _Scanner:
+    """Reads JSON values from a binary stream, keeping only the bytes it needs.
+
+    Bytes before the value being extracted are dropped as the stream is read,
+    so skipping a large value (e.g. the samples of a log) takes one chunk of
+    memory at a time.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.pos = 0
+        self.bytes_read = 0
+        # Position from which the buffer must be kept, None to keep nothing
+        self.mark: int | None = None
+
+    def _more(self) -> bool:
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+        keep_from = self.pos if self.mark is None else self.mark
+        self.buffer = self.buffer[keep_from:] + chunk
+        self.pos -= keep_from
+        if self.mark is not None:
+            self.mark = 0
+        self.bytes_read += len(chunk)
+        return True
+
+    def peek(self) -> bytes:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer):
+                char = self.buffer[self.pos : self.pos + 1]
+                if char not in _WHITESPACE:
+                    return char
+                self.pos += 1
+            if not self._more():
+                raise ValueError("Unexpected end of JSON document")
+
+    def consume(self, expected: bytes) -> None:
+        if self.peek() != expected:
+            raise ValueError(
+                f"Expected {expected!r} at byte {self.bytes_read - len(self.buffer) + self.pos}"
+            )
+        self.pos += 1
+
+    def read_key(self) -> str | None:
+        """Read the next key of the current object, or None at its end."""
+        char = self.peek()
+        if char == b",":
+            self.pos += 1
+            char = self.peek()
+        if char == b"}":
+            self.pos += 1
+            return None
+        key = self.read_value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected an object key, got {key!r}")
+        self.consume(b":")
+        return key
+
+    def read_value(self) -> Any:
+        """Parse the next value."""
+        self.peek()
+        self.mark = self.pos
+        try:
+            self.skip_value()
+            return json.loads(self.buffer[self.mark : self.pos])
+        finally:
+            self.mark = None
+
+    def skip_value(self) -> None:
+        """Move past the next value without parsing it."""
+        char = self.peek()
+        if char == b'"':
+            self.pos += 1
+            self._skip_string()
+        elif char in (b"{", b"["):
+            self._skip_container()
+        else:
+            self._skip_scalar()
+
+    def _skip_string(self) -> None:
+        # Starts after the opening quote, ends after the closing one
+        while True:
+            match = _STRING_SPECIAL.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+            elif match.group() == b'"':
+                self.pos = match.end()
+                return
+            elif match.end() < len(self.buffer):
+                # Skip the escaped character
+                self.pos = match.end() + 1
+                continue
+            else:
+                self.pos = match.start()
+            if not self._more():
+                raise ValueError("Unterminated string in JSON document")
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self._more():
+                    raise ValueError("Unterminated object or array in JSON document")
+                continue
+            self.pos = match.end()
+            char = match.group()
+            if char == b'"':
+                self._skip_string()
+            elif char in (b"{", b"["):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_scalar(self) -> None:
+        while True:
+            match = _SCALAR_END.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return
+            self.pos = len(self.buffer)
+            if not self._more():
+                return
+
+
+def read_json_path(
+    stream: BinaryIO, path: tuple[str, ...], chunk_size: int = CHUNK_SIZE
+) -> Any:
+    """Parse only the value at `path` of the JSON document read from `stream`.
+
+    The document is read incrementally and the stream isn't read any further
+    once the value was parsed, so the keys after it are never read.
+    Values before it are skipped without being parsed or kept in memory. The
+    caller is responsible for closing the stream.
+
+    Args:
+        stream: A binary file-like object, e.g. the body of an S3 object
+        path: The keys leading to the value, e.g. `SCORES_PATH`
+        chunk_size: Number of bytes read from the stream at a time
+
+    Returns:
+        The parsed value.
+
+    Raises:
+        PathNotFound: If a key is missing or one of the values on the path
+            isn't an object.
+        ValueError: If the document isn't valid JSON.
+
+    """
+    scanner = _Scanner(stream, chunk_size)
+    for depth, key in enumerate(path):
+        if scanner.peek() != b"{":
+            raise PathNotFound(".".join(path[:depth]) or "<root>")
+        scanner.pos += 1
+        while True:
+            name = scanner.read_key()
+            if name is None:
+                raise PathNotFound(".".join(path[: depth + 1]))
+            if name == key:
+                break
+            scanner.skip_value()
+    return scanner.read_value()
+
+
+def read_scores(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> list[dict[str, Any]]:
+    """Parse only the scores of a dashboard log, see `read_json_path`.
+
+    Returns an empty list if the log has no scores.
+    """
+    try:
+        return read_json_path(stream, SCORES_PATH, chunk_size)
+    except PathNotFound:
+        return []
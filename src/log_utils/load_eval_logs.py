@@ -1,51 +1,387 @@
-import json
+import logging
 import os
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, as_completed
 from itertools import chain
-from pathlib import Path
+from typing import Any
 
 import streamlit as st
+from botocore.client import BaseClient
 from inspect_evals_dashboard_schema import DashboardLog
 from src.config import EvaluationConfig
-from st_files_connection import FilesConnection  # type: ignore
+from src.log_utils.aws_s3_utils import get_s3_client, parse_s3_url, read_s3_object
+from src.log_utils.decode import (
+    PROJECTIONS,
+    TRUSTED_DECODE,
+    FieldSet,
+    parse_dashboard_log,
+)
+from src.log_utils.disk_cache import LOG_CACHE_MAX_AGE, DiskCache, get_disk_cache
+from src.log_utils.io_scheduler import Priority, current_session_id
+from src.log_utils.local_backend import read_local_file
+from src.log_utils.log_store import get_log_store
+from src.log_utils.model_registry import get_model_registry
+from src.log_utils.request_policy import RequestPolicy, get_request_policy
+from src.log_utils.snapshot import get_snapshot
 
+# Upper bound on the number of dashboard logs downloaded at the same time, this
+# is also the size of the connection pool of the shared S3 client
+MAX_CONCURRENT_FETCHES = int(os.getenv("LOG_FETCH_MAX_CONCURRENCY", "10"))
 
-@st.cache_data
-def load_evaluation_logs(evaluation_paths: list[str]) -> list[DashboardLog]:
+# Projection (see `src.log_utils.decode.PROJECTIONS`) of the logs loaded for the
+# pages, "chart" keeps only the fields used by the pages and the plots
+DEFAULT_PROJECTION = os.getenv("LOG_PROJECTION", "chart")
+
+# Seconds a page waits for its logs before it renders with the logs loaded so
+# far, 0 waits for all of them. Logs that arrive later are shown on the next rerun.
+PAGE_LOAD_DEADLINE = float(os.getenv("LOG_PAGE_DEADLINE", "0"))
+
+
+def load_evaluation_logs(
+    evaluation_paths: list[str],
+    projection: str = DEFAULT_PROJECTION,
+    timeout: float | None = None,
+) -> list[DashboardLog]:
     """Load evaluation logs from S3 or local path based on config.
 
+    Logs are kept in the process-wide log store, keyed by path. Paths that aren't
+    stored yet are served from the data snapshot of the environment if there is
+    one, and the rest are fetched (concurrently), so a run listed in several
+    categories is downloaded and parsed once and every caller gets a reference
+    to the same object. Sessions loading the same paths at the same time wait
+    for each other instead of fetching them twice. The model metadata of the
+    logs is interned in the model registry, so that all runs of a model share
+    one copy. Paths that fail to load are reported and skipped, the remaining
+    logs are returned in the order of `evaluation_paths`.
+
+    By default logs only hold the fields used by the pages, use `load_full_logs`
+    to get the full logs.
+
     Args:
         evaluation_paths: List of paths (S3 or local) to evaluation log files
+        projection: Name of the field projection of the logs, see
+            `src.log_utils.decode.PROJECTIONS`
+        timeout: Seconds after which the logs loaded so far are returned, the
+            others keep loading in the background (see `get_loading_paths`)
 
     Returns:
         List of DashboardLog objects
 
     """
+    ((_, dashboard_logs),) = iter_evaluation_logs(
+        {"logs": evaluation_paths}, projection, timeout
+    )
+    return dashboard_logs
+
+
+def iter_evaluation_logs(
+    groups: dict[str, list[str]],
+    projection: str = DEFAULT_PROJECTION,
+    timeout: float | None = None,
+) -> Iterator[tuple[str, list[DashboardLog]]]:
+    """Load the logs of several groups of paths, e.g. the categories of the home page.
+
+    The logs of all groups are loaded together like in `load_evaluation_logs`,
+    and each group is yielded as `(name, logs)` as soon as all of its logs are
+    loaded, so that callers can render it while the other groups are loading.
+    Once `timeout` seconds have passed, the remaining groups are yielded with
+    the logs loaded so far.
+
+    Args:
+        groups: Mapping from a group name to the paths of its logs
+        projection: Name of the field projection of the logs, see
+            `src.log_utils.decode.PROJECTIONS`
+        timeout: Seconds to wait for the logs, None to wait for all of them
+
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    fields = PROJECTIONS[projection]
+    store = get_log_store(projection)
+    model_registry = get_model_registry()
+
+    missing_paths = store.missing(chain.from_iterable(groups.values()))
+    # The snapshot holds the fields of the chart projection
+    snapshot = get_snapshot() if missing_paths and projection == "chart" else None
+    if snapshot is not None:
+        # Logs whose file changed since the snapshot was built are read again
+        changed = store.changed(missing_paths)
+        snapshot_logs = snapshot.load_logs(
+            [path for path in missing_paths if path not in changed]
+        )
+        snapshot_logs = {
+            path: model_registry.intern_log(log) for path, log in snapshot_logs.items()
+        }
+        store.put_many(snapshot_logs)
+        missing_paths = [path for path in missing_paths if path not in snapshot_logs]
+
+    pending_paths = set(missing_paths)
+    pending_groups = dict(groups)
+
+    def ready_groups() -> Iterator[tuple[str, list[DashboardLog]]]:
+        for name, paths in list(pending_groups.items()):
+            if pending_paths.isdisjoint(paths):
+                del pending_groups[name]
+                yield name, store.get_many(paths)
 
-    def load_json_from_s3(path: str, conn: FilesConnection) -> dict:
-        return conn.read(path, input_format="json", ttl=600)
+    yield from ready_groups()
+    executor = get_fetch_executor()
+    load_log = make_log_loader(missing_paths, fields=fields)
+
+    def load_and_store(path: str) -> None:
+        result: DashboardLog | Exception = RuntimeError("Loading was interrupted")
+        try:
+            result = load_log(path)
+            if isinstance(result, CancelledError):
+                # The session ended before the read ran, sessions waiting for
+                # the log load it themselves
+                store.abandon([path])
+                return
+            if isinstance(result, Exception):
+                logging.error(f"Failed to load evaluation log {path}: {result!r}")
+            else:
+                result = model_registry.intern_log(result)
+                store.put_many({path: result})
+        finally:
+            store.release(path, result)
+
+    # Paths loaded concurrently by other sessions are waited for instead of being
+    # fetched again, and fetched here if the other session gives up
+    while missing_paths:
+        claimed, waiting = store.claim(missing_paths)
+        # Paths stored since they were found missing
+        pending_paths.difference_update(set(missing_paths).difference(claimed, waiting))
+        yield from ready_groups()
+
+        futures: dict[Future[Any], str] = {
+            executor.submit(load_and_store, path): path for path in claimed
+        }
+        futures.update({future: path for path, future in waiting.items()})
+        missing_paths = []
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                if future.cancelled():
+                    missing_paths.append(futures[future])
+                else:
+                    pending_paths.discard(futures[future])
+                    yield from ready_groups()
+        except TimeoutError:
+            break
+
+    # Past the deadline, the groups are returned with the logs loaded so far
+    for name, paths in pending_groups.items():
+        yield name, store.get_many(paths)
+
+
+def load_full_logs(evaluation_paths: list[str]) -> list[DashboardLog]:
+    """Fetch the full logs for the given paths, e.g. for downloads.
+
+    Unlike `load_evaluation_logs`, the logs are always read from their files,
+    never from the log store or the data snapshot, and are not kept in memory
+    once the caller drops them. Paths that fail to load are reported and skipped.
+    """
+    dashboard_logs, failures = fetch_evaluation_logs(
+        evaluation_paths, priority=Priority.DOWNLOAD
+    )
+    for path, error in failures.items():
+        logging.error(f"Failed to load evaluation log {path}: {error!r}")
+    return dashboard_logs
+
+
+def fetch_evaluation_logs(
+    evaluation_paths: list[str],
+    max_concurrency: int | None = None,
+    s3_client: BaseClient | None = None,
+    fields: FieldSet | None = None,
+    revalidate: bool = False,
+    policy: RequestPolicy | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> tuple[list[DashboardLog], dict[str, Exception]]:
+    """Fetch and parse evaluation logs with bounded concurrency.
+
+    All S3 paths are read through a single pooled S3 client and the local content
+    cache for dashboard logs.
+
+    Args:
+        evaluation_paths: List of paths (S3 or local) to evaluation log files
+        max_concurrency: Maximum number of in-flight requests, defaults to
+            `LOG_FETCH_MAX_CONCURRENCY`
+        s3_client: The S3 client to use, defaults to the shared client
+        fields: The fields to keep from each log, defaults to the full log
+        revalidate: Whether to revalidate every cached S3 object, even the ones
+            within `LOG_CACHE_MAX_AGE`
+        policy: The timeouts, retries and hedging of the reads, defaults to the
+            shared request policy
+        priority: The priority of the reads on the I/O scheduler
 
-    def load_json_from_local(path: str) -> dict:
-        with open(Path(path), "r") as f:
-            return json.load(f)
+    Returns:
+        The successfully loaded logs in the order of `evaluation_paths`, and
+        a mapping from each path that failed to load to its exception
 
-    env = os.getenv("STREAMLIT_ENV", "dev")
-    conn = None
-    if env != "test":
-        conn = st.connection("s3", type=FilesConnection)
+    """
+    results = dict(
+        iter_fetch_evaluation_logs(
+            evaluation_paths,
+            max_concurrency,
+            s3_client,
+            fields,
+            revalidate,
+            policy,
+            priority,
+        )
+    )
 
     dashboard_logs = []
+    failures = {}
     for path in evaluation_paths:
-        if path.startswith("s3://"):
-            if conn is None:
-                raise ValueError("S3 connection not initialized but S3 path provided")
-            data = load_json_from_s3(path, conn)
+        result = results[path]
+        if isinstance(result, Exception):
+            failures[path] = result
         else:
-            data = load_json_from_local(path)
-        data["location"] = path  # Set location of DashboardLog from downloaded path
-        dashboard_logs.append(DashboardLog(**data))
+            dashboard_logs.append(result)
+
+    return dashboard_logs, failures
+
+
+def iter_fetch_evaluation_logs(
+    evaluation_paths: list[str],
+    max_concurrency: int | None = None,
+    s3_client: BaseClient | None = None,
+    fields: FieldSet | None = None,
+    revalidate: bool = False,
+    policy: RequestPolicy | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Iterator[tuple[str, DashboardLog | Exception]]:
+    """Fetch and parse evaluation logs, yielding `(path, log or exception)` as they complete.
+
+    See `fetch_evaluation_logs` for the arguments.
+    """
+    max_concurrency = max_concurrency or MAX_CONCURRENT_FETCHES
+    load_log = make_log_loader(
+        evaluation_paths,
+        max_concurrency,
+        s3_client,
+        fields,
+        revalidate,
+        policy,
+        priority,
+    )
+
+    if not evaluation_paths:
+        return
+
+    max_workers = max(1, min(max_concurrency, len(evaluation_paths)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(load_log, path): path for path in evaluation_paths}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def make_log_loader(
+    evaluation_paths: list[str],
+    max_concurrency: int | None = None,
+    s3_client: BaseClient | None = None,
+    fields: FieldSet | None = None,
+    revalidate: bool = False,
+    policy: RequestPolicy | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Callable[[str], DashboardLog | Exception]:
+    """Return a function that reads and parses one log, returning its exception on failure.
+
+    The shared resources (S3 client, content cache, request policy) and the
+    session are looked up here, in the calling thread, so that the loader can
+    run in worker threads. Reads are dropped if the session ends while they're
+    queued, the loader then returns a `CancelledError`.
+    See `fetch_evaluation_logs` for the arguments.
+    """
+    max_concurrency = max_concurrency or MAX_CONCURRENT_FETCHES
+    if (
+        s3_client is None
+        and os.getenv("STREAMLIT_ENV", "dev") != "test"
+        and any(path.startswith("s3://") for path in evaluation_paths)
+    ):
+        s3_client = get_s3_client(max_pool_connections=max_concurrency)
+    cache = get_disk_cache()
+    max_age = 0 if revalidate else LOG_CACHE_MAX_AGE
+    policy = policy or get_request_policy()
+    owner = current_session_id()
+
+    def load_log(path: str) -> DashboardLog | Exception:
+        try:
+            raw = read_log_bytes(
+                path, s3_client, cache, max_age, policy, priority, owner
+            )
+            return parse_dashboard_log(
+                raw, path, cache, trusted=TRUSTED_DECODE, fields=fields
+            )
+        except Exception as e:
+            return e
+
+    return load_log
 
-    return dashboard_logs
 
+@st.cache_resource
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Return the worker threads loading logs into the log store, shared by all sessions."""
+    return ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_FETCHES, thread_name_prefix="log-fetch"
+    )
 
-def get_log_paths(config: list[EvaluationConfig]) -> list[str]:
-    return list(chain.from_iterable([t.paths for t in config]))
+
+def read_log_bytes(
+    path: str,
+    s3_client: BaseClient | None,
+    cache: DiskCache | None = None,
+    max_age: float = LOG_CACHE_MAX_AGE,
+    policy: RequestPolicy | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+    owner: str | None = None,
+) -> bytes | memoryview:
+    """Read the raw contents of a log file from S3 or the local filesystem.
+
+    Large local files are memory-mapped rather than read (see `read_local_file`).
+
+    If `policy` is given, the read runs on its I/O scheduler with the given
+    priority on behalf of the session `owner`, with its timeouts, retries and
+    hedging.
+    """
+    if path.startswith("s3://"):
+        if s3_client is None:
+            raise ValueError("S3 connection not initialized but S3 path provided")
+        bucket_name, object_name = parse_s3_url(path)
+
+        def read() -> bytes | memoryview:
+            return read_s3_object(
+                s3_client, bucket_name, object_name, cache, max_age=max_age
+            )
+    else:
+
+        def read() -> bytes | memoryview:
+            return read_local_file(path)
+
+    return policy.call(read, priority, owner) if policy is not None else read()
+
+
+def is_loaded(
+    evaluation_paths: list[str], projection: str = DEFAULT_PROJECTION
+) -> bool:
+    """Return whether all logs for the paths are already in the log store."""
+    return not get_log_store(projection).missing(evaluation_paths)
+
+
+def get_loading_paths(
+    evaluation_paths: list[str], projection: str = DEFAULT_PROJECTION
+) -> list[str]:
+    """Return the paths whose logs are still loading, e.g. after a page deadline."""
+    return get_log_store(projection).loading(evaluation_paths)
+
+
+def get_log_paths(config: Sequence[EvaluationConfig]) -> list[str]:
+    """Return the log store keys (paths) of all runs in a category config.
+
+    Runs that the background refresher found to be outdated, added or removed
+    since the config was generated are replaced accordingly.
+    """
+    paths = list(chain.from_iterable([t.paths for t in config]))
+    return get_log_store(DEFAULT_PROJECTION).resolve_paths(paths)
@@ -0,0 +1,128 @@
+import logging
+import mmap
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from src.log_utils.log_store import LogStore
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+# Local logs at least this large are memory-mapped instead of read into memory,
+# the JSON parser then reads them straight from the page cache
+MMAP_MIN_BYTES = int(float(os.getenv("LOG_MMAP_MIN_MB", "4")) * 1024 * 1024)
+
+# Whether to watch the directories of local logs and reload the logs that change
+WATCH_LOCAL_LOGS = os.getenv("LOG_WATCH_LOCAL", "true").lower() == "true"
+
+
+def read_local_file(
+    path: str, mmap_min_bytes: int = MMAP_MIN_BYTES
+) -> bytes | memoryview:
+    """Read a local log, memory-mapping it if it's at least `mmap_min_bytes` long.
+
+    The mapping is closed once the returned memoryview is garbage collected.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < mmap_min_bytes or size == 0:
+            return f.read()
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class LocalLogWatcher(FileSystemEventHandler):
+    """Invalidates stored logs when their local file changes.
+
+    Watches the directories of the local logs (inotify on Linux) and drops a log
+    from the log stores as soon as its file is modified, replaced or deleted, so
+    the next rerun loads the new version. Logs whose files didn't change are
+    never read again.
+    """
+
+    def __init__(self, paths: Iterable[str], stores: list[LogStore]) -> None:
+        # Absolute path -> path as used in the config and the log stores
+        self._paths = {
+            os.path.abspath(path): path
+            for path in paths
+            if not path.startswith("s3://")
+        }
+        self.stores = stores
+        self.invalidated = 0
+        self._observer = Observer()
+        self._watched: set[str] = set()
+
+    @property
+    def directories(self) -> list[str]:
+        return sorted({os.path.dirname(path) for path in self._paths})
+
+    def start(self) -> None:
+        self._watch_directories()
+        self._observer.daemon = True
+        self._observer.start()
+
+    def set_paths(self, paths: Iterable[str]) -> None:
+        """Watch the logs of a new config, e.g. after config.yml was reloaded."""
+        self._paths = {
+            os.path.abspath(path): path
+            for path in paths
+            if not path.startswith("s3://")
+        }
+        self._watch_directories()
+
+    def _watch_directories(self) -> None:
+        for directory in self.directories:
+            if directory not in self._watched and Path(directory).is_dir():
+                self._observer.schedule(self, directory, recursive=False)
+                self._watched.add(directory)
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join()
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        changed = [event.src_path, getattr(event, "dest_path", "")]
+        paths = [
+            self._paths[os.path.abspath(os.fsdecode(path))]
+            for path in changed
+            if path and os.path.abspath(os.fsdecode(path)) in self._paths
+        ]
+        if paths:
+            logging.info(f"Local logs changed: {', '.join(paths)}")
+            self.invalidated += len(paths)
+            for store in self.stores:
+                store.invalidate(paths)
+
+
+# The watcher of the process, kept outside of `st.cache_resource` so that
+# clearing the resources doesn't start a second thread
+_watcher: LocalLogWatcher | None = None
+# Whether the config was checked for local logs, which is done once
+_watcher_checked = False
+_watcher_lock = threading.Lock()
+
+
+def get_local_watcher() -> LocalLogWatcher | None:
+    """Start watching the local logs of the config, or return None if there are none."""
+    global _watcher, _watcher_checked
+    from src.config import load_config
+    from src.log_utils.decode import PROJECTIONS
+    from src.log_utils.log_store import get_log_store
+
+    if not WATCH_LOCAL_LOGS or os.getenv("STREAMLIT_ENV", "dev") == "test":
+        return None
+
+    with _watcher_lock:
+        if not _watcher_checked:
+            _watcher_checked = True
+            config = load_config()
+            watcher = LocalLogWatcher(
+                list(config.index.runs),
+                [get_log_store(projection) for projection in PROJECTIONS],
+            )
+            if watcher.directories:
+                watcher.start()
+                _watcher = watcher
+        return _watcher
@@ -0,0 +1,177 @@
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future
+
+from inspect_evals_dashboard_schema import DashboardLog
+from src.log_utils.frozen import freeze_log
+
+
+class LogStore:
+    """Process-wide store of parsed dashboard logs keyed by their path.
+
+    A run that is listed in several categories is fetched and parsed once, every
+    category page then holds references to the same `DashboardLog` object. Logs
+    are shared between sessions without copying, so they're read-only (see
+    `src.log_utils.frozen`): logs that aren't are stored as read-only copies.
+
+    The store also knows the current run of every configured model under the
+    storage prefixes watched by the background refresher, which
+    `resolve_paths` uses to replace outdated runs from the config.
+
+    Concurrent loads of the same path are coalesced: the session that claims a
+    path first loads it, the others wait for it (see `claim`).
+    """
+
+    def __init__(self) -> None:
+        self._logs: dict[str, DashboardLog] = {}
+        # Storage prefix (e.g. s3://bucket/logs/prod/bbh/) -> model -> path of its latest run
+        self._runs: dict[str, dict[str, str]] = {}
+        # Path being loaded -> the log, or the exception it failed with
+        self._loading: dict[str, Future[DashboardLog | Exception]] = {}
+        # Number of loads that waited for a concurrent load of the same path
+        self.coalesced = 0
+        # Paths invalidated because their file changed, their snapshot rows are outdated
+        self._changed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._logs
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def get(self, path: str) -> DashboardLog | None:
+        return self._logs.get(path)
+
+    def get_many(self, paths: Iterable[str]) -> list[DashboardLog]:
+        """Return the stored logs for `paths`, skipping paths that aren't stored."""
+        logs = self._logs
+        return [logs[path] for path in paths if path in logs]
+
+    def missing(self, paths: Iterable[str]) -> list[str]:
+        """Return the unique paths that aren't stored yet, in order of first occurrence."""
+        return [path for path in dict.fromkeys(paths) if path not in self._logs]
+
+    def loading(self, paths: Iterable[str]) -> list[str]:
+        """Return the unique paths that are being loaded, in order of first occurrence."""
+        return [path for path in dict.fromkeys(paths) if path in self._loading]
+
+    def changed(self, paths: Iterable[str]) -> set[str]:
+        """Return the paths that were invalidated since the process started."""
+        return self._changed.intersection(paths)
+
+    def claim(
+        self, paths: Iterable[str]
+    ) -> tuple[list[str], dict[str, "Future[DashboardLog | Exception]"]]:
+        """Claim the loading of paths that aren't stored yet.
+
+        Returns the paths the caller must load and then `release`, and the
+        futures of the paths that other callers are already loading. A future
+        is cancelled if its loader gave up, e.g. because its session ended.
+        """
+        claimed = []
+        waiting = {}
+        with self._lock:
+            for path in paths:
+                if path in self._logs:
+                    continue
+                loading = self._loading.get(path)
+                if loading is None:
+                    self._loading[path] = Future()
+                    claimed.append(path)
+                else:
+                    waiting[path] = loading
+            self.coalesced += len(waiting)
+        return claimed, waiting
+
+    def release(self, path: str, result: DashboardLog | Exception) -> None:
+        """Hand the loaded log (stored beforehand) or its error to the waiting callers."""
+        with self._lock:
+            loading = self._loading.pop(path, None)
+        if loading is not None:
+            loading.set_result(result)
+
+    def abandon(self, paths: Iterable[str]) -> None:
+        """Give up loading claimed paths, waiting callers then load them themselves."""
+        with self._lock:
+            abandoned = [self._loading.pop(path, None) for path in paths]
+        for loading in abandoned:
+            if loading is not None:
+                loading.cancel()
+                # Wakes up callers waiting in `concurrent.futures.as_completed`
+                loading.set_running_or_notify_cancel()
+
+    def put_many(self, logs: dict[str, DashboardLog]) -> None:
+        """Store logs, which are shared from then on."""
+        logs = {path: freeze_log(log) for path, log in logs.items()}
+        with self._lock:
+            self._logs.update(logs)
+
+    def invalidate(self, paths: Iterable[str]) -> None:
+        """Drop logs so that they are fetched again on next access."""
+        with self._lock:
+            for path in paths:
+                self._logs.pop(path, None)
+                self._changed.add(path)
+
+    def discard(self, paths: Iterable[str]) -> None:
+        """Drop logs of runs that aren't used anymore."""
+        with self._lock:
+            for path in paths:
+                self._logs.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._logs.clear()
+            self._runs = {}
+
+    def swap(
+        self,
+        updated: dict[str, DashboardLog],
+        removed: Iterable[str],
+        runs: dict[str, dict[str, str]],
+    ) -> None:
+        """Atomically replace logs and the runs under the watched prefixes."""
+        updated = {path: freeze_log(log) for path, log in updated.items()}
+        with self._lock:
+            self._logs.update(updated)
+            for path in removed:
+                self._logs.pop(path, None)
+            self._runs = runs
+
+    def resolve_paths(self, paths: list[str]) -> list[str]:
+        """Replace the runs under watched prefixes by the current run of their model.
+
+        Only the models of `paths` are kept: runs of models that aren't in the
+        config aren't added, and models without any run left are dropped.
+        Paths outside the watched prefixes are returned unchanged.
+        """
+        runs = self._runs
+        if not runs:
+            return paths
+
+        resolved = []
+        for path in paths:
+            prefix = next((p for p in runs if path.startswith(p)), None)
+            if prefix is None:
+                resolved.append(path)
+                continue
+            # The model directory right under the prefix
+            model = path[len(prefix) :].split("/", 1)[0]
+            latest = runs[prefix].get(model)
+            if latest is not None:
+                resolved.append(latest)
+        return list(dict.fromkeys(resolved))
+
+
+# Projection -> its store. Kept outside of `st.cache_resource`, like the
+# background threads that update them (see `get_refresher`), so that clearing
+# the resources doesn't leave those threads updating stores nobody reads.
+_stores: dict[str, LogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_log_store(projection: str = "chart") -> LogStore:
+    """Return the store for logs with the given field projection, shared by all sessions."""
+    with _stores_lock:
+        return _stores.setdefault(projection, LogStore())
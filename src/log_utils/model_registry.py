@@ -0,0 +1,75 @@
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import streamlit as st
+from inspect_evals_dashboard_schema import DashboardLog
+from src.log_utils.fingerprint import assign_fingerprint, log_fingerprint
+
+if TYPE_CHECKING:
+    from inspect_evals_dashboard_schema import ModelMetadata
+
+
+class ModelRegistry:
+    """Interned model metadata shared by all logs of a model, keyed by model id.
+
+    The same model appears in dozens of runs across every category. Instead of
+    each `DashboardLog` carrying its own copy of `model_metadata`, logs with equal
+    metadata refer to one shared entry. Entries are shared between logs and
+    sessions and are read-only.
+
+    Entries are held weakly: once no log refers to an entry (e.g. its runs were
+    replaced by a refresh), it's dropped, so the registry only ever holds the
+    metadata of the logs in use.
+    """
+
+    def __init__(self) -> None:
+        # Model id (e.g. "openai/gpt-4o") -> most recently interned metadata
+        self._models: weakref.WeakValueDictionary[str, ModelMetadata] = (
+            weakref.WeakValueDictionary()
+        )
+        # (model id, serialized metadata) -> interned metadata, so that runs with
+        # differing metadata for the same model keep their own values
+        self._interned: weakref.WeakValueDictionary[tuple[str, str], ModelMetadata] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def get(self, model_id: str) -> "ModelMetadata | None":
+        """Return the metadata of a model, e.g. `registry.get("openai/gpt-4o").provider`."""
+        return self._models.get(model_id)
+
+    def intern(self, model_id: str, metadata: "ModelMetadata") -> "ModelMetadata":
+        """Return the shared entry equal to `metadata`, registering it if it's new."""
+        key = (model_id, metadata.model_dump_json())
+        with self._lock:
+            interned = self._interned.setdefault(key, metadata)
+            self._models[model_id] = interned
+        return interned
+
+    def intern_log(self, log: DashboardLog) -> DashboardLog:
+        """Return the log with its model metadata pointing at the shared entry.
+
+        Logs are read-only, so a log whose metadata isn't the shared entry yet
+        is replaced by a copy, with the same fingerprint.
+        """
+        metadata = self.intern(log.eval.model, log.model_metadata)
+        if metadata is log.model_metadata:
+            return log
+        interned = log.model_copy(update={"model_metadata": metadata})
+        assign_fingerprint(interned, log_fingerprint(log))
+        return interned
+
+    def intern_logs(self, logs: Iterable[DashboardLog]) -> list[DashboardLog]:
+        """Return the logs with their model metadata pointing at the shared entries."""
+        return [self.intern_log(log) for log in logs]
+
+
+@st.cache_resource
+def get_model_registry() -> ModelRegistry:
+    """Return the model registry shared by all sessions of this process."""
+    return ModelRegistry()
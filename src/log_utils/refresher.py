@@ -0,0 +1,224 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from botocore.client import BaseClient
+from src.config import extract_timestamp, load_config
+from src.log_utils.aws_s3_utils import get_s3_client, parse_s3_url
+from src.log_utils.decode import PROJECTIONS
+from src.log_utils.io_scheduler import IOScheduler, Priority, get_io_scheduler
+from src.log_utils.load_eval_logs import (
+    DEFAULT_PROJECTION,
+    fetch_evaluation_logs,
+)
+from src.log_utils.log_store import LogStore, get_log_store
+from src.log_utils.model_registry import get_model_registry
+
+# Seconds between two polls of the storage prefixes, 0 disables the refresher
+REFRESH_INTERVAL = float(os.getenv("LOG_REFRESH_INTERVAL", "0"))
+
+DASHBOARD_LOG_FILE_SUFFIX = ".dashboard.json"
+
+
+@dataclass(frozen=True)
+class RefreshStatus:
+    poll_interval: float
+    prefixes: int
+    last_poll_at: float | None = None
+    last_swap_at: float | None = None
+    last_swap_duration: float | None = None
+    last_added: int = 0
+    last_changed: int = 0
+    last_removed: int = 0
+    last_error: str | None = None
+
+
+class LogRefresher:
+    """Background thread that keeps the log store in sync with S3.
+
+    Each poll lists the storage prefix of every evaluation in the config (e.g.
+    s3://bucket/logs/prod/bbh/), works out the latest run of every model of
+    the config and compares it with the previous poll. Runs of models that
+    aren't in the config for that evaluation are ignored. Only runs that were added or whose ETag
+    changed are fetched, then they are swapped into the log store together with
+    the new list of runs in one step, so sessions never wait for a refresh.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        store: LogStore,
+        interval: float,
+        s3_client: BaseClient | None = None,
+        scheduler: IOScheduler | None = None,
+    ) -> None:
+        self.store = store
+        self.interval = interval
+        self.s3_client = s3_client
+        self.scheduler = scheduler
+        self.status = RefreshStatus(poll_interval=interval, prefixes=0)
+        self.set_paths(paths)
+        # Path of the latest run of each model -> its ETag, as of the last poll
+        self._etags: dict[str, str] | None = None
+        self._thread: threading.Thread | None = None
+
+    def set_paths(self, paths: list[str]) -> None:
+        """Poll the prefixes of a new config, e.g. after config.yml was reloaded."""
+        self.configured_paths = paths
+        self.prefixes = get_storage_prefixes(paths)
+        # Prefix -> the models configured under it
+        self.models: dict[str, set[str]] = {prefix: set() for prefix in self.prefixes}
+        for path in paths:
+            prefix = next((p for p in self.prefixes if path.startswith(p)), None)
+            model = extract_model(path)
+            if prefix is not None and model is not None:
+                self.models[prefix].add(model)
+        self.status = replace(self.status, prefixes=len(self.prefixes))
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="log-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logging.exception("Failed to refresh evaluation logs")
+                self.status = replace(self.status, last_error=repr(e))
+            time.sleep(self.interval)
+
+    def poll(self) -> None:
+        """List the prefixes, fetch the new and changed runs and swap them in."""
+        s3_client = self.s3_client or get_s3_client()
+        runs: dict[str, dict[str, str]] = {}
+        etags: dict[str, str] = {}
+        for prefix in self.prefixes:
+            runs[prefix] = {}
+            latest: dict[str, tuple[str, str]] = {}
+            models = self.models[prefix]
+            for key, etag in list_dashboard_logs(s3_client, prefix, self.scheduler):
+                model = extract_model(key)
+                if model in models and (
+                    model not in latest
+                    or extract_timestamp(key) > extract_timestamp(latest[model][0])
+                ):
+                    latest[model] = (key, etag)
+            for model, (path, etag) in latest.items():
+                runs[prefix][model] = path
+                etags[path] = etag
+
+        previous = self._etags
+        if previous is None:
+            # First poll: the logs of the config are assumed to be up to date,
+            # only the runs that aren't in the config are fetched
+            configured = set(self.configured_paths)
+            previous = {
+                path: etag for path, etag in etags.items() if path in configured
+            }
+
+        added = [path for path in etags if path not in previous]
+        changed = [
+            path for path in etags if path in previous and etags[path] != previous[path]
+        ]
+        removed = [path for path in previous if path not in etags]
+
+        started_at = time.time()
+        logs, failures = fetch_evaluation_logs(
+            added + changed,
+            s3_client=s3_client,
+            fields=PROJECTIONS[DEFAULT_PROJECTION],
+            revalidate=True,
+            priority=Priority.BACKGROUND,
+        )
+        for path, error in failures.items():
+            logging.error(f"Failed to refresh evaluation log {path}: {error!r}")
+            # Try again on the next poll
+            etags.pop(path, None)
+        logs = get_model_registry().intern_logs(logs)
+        self.store.swap({log.location: log for log in logs}, removed, runs)
+        self._etags = etags
+
+        finished_at = time.time()
+        self.status = replace(
+            self.status,
+            last_poll_at=finished_at,
+            last_swap_at=finished_at,
+            last_swap_duration=finished_at - started_at,
+            last_added=len(added),
+            last_changed=len(changed),
+            last_removed=len(removed),
+            last_error=None,
+        )
+
+
+def list_dashboard_logs(
+    s3_client: BaseClient, prefix: str, scheduler: IOScheduler | None = None
+) -> list[tuple[str, str]]:
+    """List the dashboard logs under an s3:// prefix as (path, ETag) pairs.
+
+    The listing requests run on `scheduler` as background work if given.
+    """
+    bucket_name, key_prefix = parse_s3_url(prefix)
+    result = []
+    request = {"Bucket": bucket_name, "Prefix": key_prefix}
+    while True:
+        if scheduler is not None:
+            page = scheduler.run(
+                lambda: s3_client.list_objects_v2(**request), Priority.BACKGROUND
+            )
+        else:
+            page = s3_client.list_objects_v2(**request)
+        for obj in page.get("Contents", []):
+            if obj["Key"].endswith(DASHBOARD_LOG_FILE_SUFFIX):
+                result.append((f"s3://{bucket_name}/{obj['Key']}", obj["ETag"]))
+        if not page.get("IsTruncated"):
+            return result
+        request["ContinuationToken"] = page["NextContinuationToken"]
+
+
+def get_storage_prefixes(paths: list[str]) -> list[str]:
+    """Return the evaluation prefixes (s3://bucket/logs/<env>/<eval>/) of S3 paths."""
+    prefixes = []
+    for path in paths:
+        match = re.match(r"s3://[^/]+/logs/[^/]+/[^/]+/", path)
+        if match:
+            prefixes.append(match.group(0))
+    return list(dict.fromkeys(prefixes))
+
+
+def extract_model(path: str) -> str | None:
+    """Extract the <provider>+<model> directory name from a log path."""
+    match = re.search(r"/([^/]+\+[^/]+)/", path)
+    return match.group(1) if match else None
+
+
+# The refresher of the process, kept outside of `st.cache_resource` so that
+# clearing the resources doesn't start a second thread
+_refresher: LogRefresher | None = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher() -> LogRefresher | None:
+    """Start the refresher of this process, or return None if it's disabled."""
+    global _refresher
+    if REFRESH_INTERVAL <= 0 or os.getenv("STREAMLIT_ENV", "dev") == "test":
+        return None
+
+    with _refresher_lock:
+        if _refresher is None:
+            config = load_config()
+            paths = list(config.index.runs)
+            _refresher = LogRefresher(
+                paths,
+                get_log_store(DEFAULT_PROJECTION),
+                REFRESH_INTERVAL,
+                scheduler=get_io_scheduler(),
+            )
+            _refresher.start()
+        return _refresher
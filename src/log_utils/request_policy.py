@@ -0,0 +1,197 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+import streamlit as st
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+from src.log_utils.io_scheduler import IOScheduler, Priority, get_io_scheduler
+
+# Seconds an attempt to read one log object may take before it's given up on
+FETCH_TIMEOUT = float(os.getenv("LOG_FETCH_TIMEOUT", "30"))
+
+# Number of retries of a failed or timed out read, after a jittered exponential
+# backoff starting at FETCH_BACKOFF seconds
+FETCH_RETRIES = int(os.getenv("LOG_FETCH_RETRIES", "2"))
+FETCH_BACKOFF = float(os.getenv("LOG_FETCH_BACKOFF", "0.5"))
+
+# Percentile of recent read latencies (e.g. 95) after which a duplicate request
+# is sent, the first response wins. 0 disables hedged requests.
+FETCH_HEDGE_PERCENTILE = float(os.getenv("LOG_FETCH_HEDGE_PERCENTILE", "0"))
+
+# S3 error codes worth retrying, other errors (e.g. NoSuchKey) fail right away
+RETRYABLE_ERROR_CODES = {
+    "500",
+    "502",
+    "503",
+    "504",
+    "InternalError",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RequestStats:
+    requests: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    hedges: int = 0
+    # Hedged requests that answered before the original request
+    hedge_wins: int = 0
+
+
+class LatencyTracker:
+    """Rolling window of the latencies of recent successful requests."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the given percentile of the window, None until there are enough samples."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.min_samples:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        return latencies[index]
+
+
+class RequestPolicy:
+    """Timeouts, retries with jittered backoff and hedging for storage reads.
+
+    Each attempt runs on the I/O scheduler, so that the caller can give up on it
+    after `timeout` seconds (the time spent queued doesn't count); a stuck
+    request keeps its worker until the client timeouts end it. With
+    `hedge_percentile`, an attempt that takes longer than that percentile of
+    recent latencies gets a duplicate, and the first of the two to succeed is
+    returned.
+    """
+
+    def __init__(
+        self,
+        scheduler: IOScheduler,
+        timeout: float = FETCH_TIMEOUT,
+        retries: int = FETCH_RETRIES,
+        backoff: float = FETCH_BACKOFF,
+        hedge_percentile: float = FETCH_HEDGE_PERCENTILE,
+    ) -> None:
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_percentile = hedge_percentile
+        self.latencies = LatencyTracker()
+        self.stats = RequestStats()
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        func: Callable[[], T],
+        priority: Priority = Priority.INTERACTIVE,
+        owner: str | None = None,
+    ) -> T:
+        """Call `func` on the I/O scheduler, retrying retryable errors and timeouts.
+
+        Raises `concurrent.futures.CancelledError` if the request was dropped
+        because the session `owner` ended.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return self._attempt(func, priority, owner)
+            except Exception as e:
+                if attempt == self.retries or not is_retryable(e):
+                    raise
+                self._count("retries")
+                # Full jitter, so that requests that failed together don't retry together
+                time.sleep(random.uniform(0, self.backoff * 2**attempt))
+        raise AssertionError("unreachable")
+
+    def _attempt(
+        self, func: Callable[[], T], priority: Priority, owner: str | None
+    ) -> T:
+        self._count("requests")
+        started: Future[None] = Future()
+
+        def run() -> T:
+            started.set_result(None)
+            return func()
+
+        original = self.scheduler.submit(run, priority, owner)
+        # The timeout starts once a worker picks the request up, or the request
+        # is dropped before that
+        first: list[Future[Any]] = [started, original]
+        wait(first, return_when=FIRST_COMPLETED)
+        start = time.monotonic()
+        pending = {original}
+        hedge_after = (
+            self.latencies.percentile(self.hedge_percentile)
+            if self.hedge_percentile
+            else None
+        )
+
+        error: BaseException | None = None
+        while pending:
+            elapsed = time.monotonic() - start
+            if elapsed >= self.timeout:
+                self._count("timeouts")
+                raise TimeoutError(f"No response within {self.timeout:g} s")
+
+            wait_for = self.timeout - elapsed
+            if hedge_after is not None:
+                wait_for = min(wait_for, max(0.0, hedge_after - elapsed))
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self.latencies.record(time.monotonic() - start)
+                    if future is not original:
+                        self._count("hedge_wins")
+                    return future.result()
+
+            if hedge_after is not None and time.monotonic() - start >= hedge_after:
+                hedge_after = None
+                if pending:
+                    self._count("hedges")
+                    pending.add(self.scheduler.submit(func, priority, owner))
+
+        assert error is not None
+        raise error
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.stats = replace(
+                self.stats, **{counter: getattr(self.stats, counter) + 1}
+            )
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed read may succeed when it's tried again."""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+    return isinstance(
+        error, (TimeoutError, ConnectionError, BotocoreConnectionError, HTTPClientError)
+    )
+
+
+@st.cache_resource
+def get_request_policy() -> RequestPolicy:
+    """Return the request policy for log reads, shared by all sessions."""
+    return RequestPolicy(get_io_scheduler())
@@ -0,0 +1,136 @@
+import os
+import time
+from pathlib import Path
+
+import orjson
+import pyarrow as pa  # type: ignore
+import streamlit as st
+from inspect_evals_dashboard_schema import DashboardLog
+from src.log_utils.decode import CHART_FIELDS, project_log_data
+from src.log_utils.fingerprint import assign_fingerprint, content_fingerprint
+from src.log_utils.frozen import FrozenDashboardLog
+
+# Bump whenever the layout of the snapshot changes, snapshots written with another
+# version are ignored
+SNAPSHOT_VERSION = 3
+
+SNAPSHOT_DIR = Path(
+    os.getenv("LOG_SNAPSHOT_DIR", str(Path(__file__).parents[2] / "snapshots"))
+)
+# Seconds after it was built during which a snapshot is used, the logs of an
+# older snapshot are read from S3 again. 0 never expires snapshots.
+SNAPSHOT_MAX_AGE = float(os.getenv("LOG_SNAPSHOT_MAX_AGE", "86400"))
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [
+        ("location", pa.string()),
+        # The JSON of the log with the fields of the chart projection, which the
+        # logs are validated from
+        ("log_json", pa.binary()),
+    ]
+)
+
+
+def get_snapshot_path(env: str, directory: Path = SNAPSHOT_DIR) -> Path:
+    return directory / f"{env}.v{SNAPSHOT_VERSION}.arrow"
+
+
+def build_snapshot_table(logs: list[DashboardLog]) -> pa.Table:
+    """Build the columnar snapshot of `logs`, with one row per run."""
+    data = {
+        "location": [log.location for log in logs],
+        "log_json": [
+            orjson.dumps(project_log_data(log.model_dump(mode="json"), CHART_FIELDS))
+            for log in logs
+        ],
+    }
+    return pa.Table.from_pydict(
+        data, schema=SNAPSHOT_SCHEMA.with_metadata({"version": str(SNAPSHOT_VERSION)})
+    )
+
+
+def write_snapshot(logs: list[DashboardLog], path: Path) -> None:
+    """Write the snapshot of `logs` as an uncompressed Arrow IPC file.
+
+    The file is left uncompressed so that readers can memory-map it, which lets
+    several processes share the same pages.
+    """
+    table = build_snapshot_table(logs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Memory-mapped snapshot of the dashboard logs of one environment."""
+
+    def __init__(self, table: pa.Table) -> None:
+        self.table = table
+        self._rows = {
+            location: index
+            for index, location in enumerate(table.column("location").to_pylist())
+        }
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @classmethod
+    def read(cls, path: Path) -> "Snapshot | None":
+        """Memory-map the snapshot at `path`, or return None if it's missing or outdated."""
+        if not path.exists():
+            return None
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"version") != str(SNAPSHOT_VERSION).encode():
+            return None
+        return cls(table)
+
+    def load_logs(self, paths: list[str]) -> dict[str, DashboardLog]:
+        """Rebuild the logs for the given paths, skipping paths that aren't in the snapshot.
+
+        The rebuilt logs hold the fields of the chart projection, like the logs
+        loaded for the pages. Only the JSON of these rows is read from the
+        memory-mapped table.
+        """
+        column = self.table.column("log_json")
+        return {
+            path: _load_log(path, column[self._rows[path]].as_buffer().to_pybytes())
+            for path in paths
+            if path in self._rows
+        }
+
+
+def _load_log(location: str, log_json: bytes) -> DashboardLog:
+    # The location isn't serialized with the log
+    log = FrozenDashboardLog.model_validate_json(log_json).model_copy(
+        update={"location": location}
+    )
+    assign_fingerprint(log, content_fingerprint(log, b"snapshot", log_json))
+    return log
+
+
+def get_snapshot() -> Snapshot | None:
+    """Return the snapshot of the active environment, or None if there isn't a fresh one.
+
+    The file is checked on every call, so a rebuilt snapshot is used without a
+    restart and a snapshot older than `SNAPSHOT_MAX_AGE` is ignored.
+    """
+    path = get_snapshot_path(os.getenv("STREAMLIT_ENV", "dev"), SNAPSHOT_DIR)
+    try:
+        modified_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if SNAPSHOT_MAX_AGE > 0 and time.time() - modified_ns / 1e9 > SNAPSHOT_MAX_AGE:
+        return None
+    return _read_snapshot(path, modified_ns)
+
+
+@st.cache_resource(max_entries=1)
+def _read_snapshot(path: Path, modified_ns: int) -> Snapshot | None:
+    return Snapshot.read(path)
@@ -1,20 +1,77 @@
 import json
+from collections.abc import Sequence
 
 import pandas as pd
 import streamlit as st
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
+from src.config import EvaluationConfig
 from src.log_utils.aws_s3_utils import (
     create_presigned_url,
     parse_s3_url_for_presigned_url,
 )
-from src.log_utils.dashboard_log_utils import get_all_metrics
+from src.log_utils.dashboard_log_utils import (
+    get_all_metrics,
+    get_model_metadata,
+    get_models_metadata,
+)
+from src.log_utils.fingerprint import log_fingerprint
+from src.log_utils.load_eval_logs import (
+    PAGE_LOAD_DEADLINE,
+    get_loading_paths,
+    get_log_paths,
+    is_loaded,
+    iter_evaluation_logs,
+    load_full_logs,
+)
 from src.plots.bar import create_bar_chart
 from src.plots.cost_scatter import create_cost_scatter
 from src.plots.cutoff_scatter import create_cutoff_scatter
+from src.plots.figure_cache import plotly_chart
 from src.plots.pairwise import create_pairwise_analysis_table, create_pairwise_scatter
 from src.plots.plot_utils import highlight_confidence_intervals
 
 
+def load_category_logs(group_config: Sequence[EvaluationConfig]) -> list[DashboardLog]:
+    """Load the logs of a category page, showing the progress task by task.
+
+    The title and description of the page are already rendered while the logs
+    are loading. Past `LOG_PAGE_DEADLINE`, the page is rendered with the logs
+    loaded so far.
+    """
+    paths = get_log_paths(group_config)
+    groups = {task.name: get_log_paths([task]) for task in group_config}
+    progress = None
+    if not is_loaded(paths):
+        progress = st.progress(0.0, text="Loading evaluation logs...")
+
+    task_logs = {}
+    for name, logs in iter_evaluation_logs(groups, timeout=PAGE_LOAD_DEADLINE):
+        task_logs[name] = logs
+        if progress is not None:
+            progress.progress(
+                len(task_logs) / len(groups),
+                text=f"Loaded {name} ({len(task_logs)}/{len(groups)} evaluations)",
+            )
+    if progress is not None:
+        progress.empty()
+
+    warn_missing_runs(paths)
+    return [log for task in group_config for log in task_logs[task.name]]
+
+
+def warn_missing_runs(paths: list[str]) -> None:
+    """Flag the runs that are still loading after the page deadline."""
+    loading = get_loading_paths(paths)
+    if loading:
+        st.warning(
+            f"{len(loading)} runs took too long to load and aren't shown yet, reload the page to include them.",
+            icon="⏳",
+        )
+        with st.expander("Runs still loading"):
+            st.markdown("\n".join(f"* `{path}`" for path in loading))
+
+
 def render_page(
     eval_logs: list[DashboardLog], default_values: dict[str, dict[str, str]]
 ):
@@ -43,7 +100,12 @@ def render_page(
     with col2:
         model_providers = st.multiselect(
             "Model providers",
-            sorted(set(log.model_metadata.provider for log in task_filtered_logs)),
+            sorted(
+                set(
+                    metadata.provider
+                    for metadata in get_models_metadata(task_filtered_logs)
+                )
+            ),
             default=None,
             help="Name of the model developer companies",
             label_visibility="visible",
@@ -53,13 +115,18 @@ def render_page(
     provider_filtered_logs: list[DashboardLog] = [
         log
         for log in task_filtered_logs
-        if log.model_metadata.provider in model_providers or not model_providers
+        if get_model_metadata(log).provider in model_providers or not model_providers
     ]
 
     with col3:
         model_families = st.multiselect(
             "Model families",
-            sorted(set(log.model_metadata.family for log in provider_filtered_logs)),
+            sorted(
+                set(
+                    metadata.family
+                    for metadata in get_models_metadata(provider_filtered_logs)
+                )
+            ),
             default=None,
             help="Name of the model families",
             label_visibility="visible",
@@ -69,7 +136,7 @@ def render_page(
     family_filtered_logs: list[DashboardLog] = [
         log
         for log in provider_filtered_logs
-        if log.model_metadata.family in model_families or not model_families
+        if get_model_metadata(log).family in model_families or not model_families
     ]
 
     # Get available metrics from filtered logs
@@ -115,20 +182,33 @@ def render_page(
         scorer = default_values[naive_task_name]["default_scorer"]
 
         fig_bar = create_bar_chart(family_filtered_logs, scorer, metric)
-        st.plotly_chart(fig_bar)
+        plotly_chart(fig_bar)
 
         fig_cutoff = create_cutoff_scatter(family_filtered_logs, scorer, metric)
-        st.plotly_chart(fig_cutoff)
+        plotly_chart(fig_cutoff)
 
         fig_cost = create_cost_scatter(family_filtered_logs, scorer, metric)
-        st.plotly_chart(fig_cost)
-
-        st.download_button(
-            label="Download chart data as JSON",
-            data=convert_logs_to_json_string(family_filtered_logs),
-            file_name="dashboard_logs.json",
-            mime="application/json",
-        )
+        plotly_chart(fig_cost)
+
+        # The download needs the full logs, which are only fetched once asked for
+        chart_data_paths = [log.location for log in family_filtered_logs]
+        chart_data = st.session_state.get("chart_data_json")
+        if chart_data is None or chart_data[0] != chart_data_paths:
+            chart_data = None
+            if st.button("Prepare chart data as JSON"):
+                with st.spinner("Fetching the full logs..."):
+                    chart_data = (
+                        chart_data_paths,
+                        convert_logs_to_json_string(family_filtered_logs),
+                    )
+                st.session_state["chart_data_json"] = chart_data
+        if chart_data is not None:
+            st.download_button(
+                label="Download chart data as JSON",
+                data=chart_data[1],
+                file_name="dashboard_logs.json",
+                mime="application/json",
+            )
 
     st.text("")  # Add a blank line for spacing
     st.divider()
@@ -184,7 +264,7 @@ def render_page(
             )
 
             fig_pairwise = create_pairwise_scatter(pairwise_analysis_df)
-            st.plotly_chart(fig_pairwise)
+            plotly_chart(fig_pairwise)
         else:
             st.warning(
                 "These models have not been evaluated on overlapping tasks. No pairwise analysis data available. Select different models to see pairwise analysis.",
@@ -316,12 +396,16 @@ def render_page(
         st.table(pd.DataFrame(responses))
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(
+    hash_funcs={DashboardLog: log_fingerprint}, max_entries=16, ttl=3600, copy=False
+)
 def convert_logs_to_json_string(logs: list[DashboardLog]) -> str:
-    return json.dumps([log.model_dump(mode="json") for log in logs])
+    # The logs of the pages only hold the fields used by the charts
+    full_logs = load_full_logs([log.location for log in logs])
+    return json.dumps([log.model_dump(mode="json") for log in full_logs])
 
 
-@st.cache_data
+@cached(max_entries=64, ttl=3600, copy=False)
 def convert_df_to_csv(df):
     return df.to_csv().encode("utf-8")
 
@@ -0,0 +1,167 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+from src.cache_policy import CACHE_POLICY
+from src.config import get_config_load_timings
+from src.config_reloader import get_config_reloader
+from src.log_utils.io_scheduler import get_io_scheduler
+from src.log_utils.load_eval_logs import DEFAULT_PROJECTION
+from src.log_utils.log_store import get_log_store
+from src.log_utils.refresher import get_refresher
+from src.log_utils.request_policy import get_request_policy
+from src.warmup import get_readiness
+
+st.title("Status")
+
+st.markdown("""
+            Operational information about the data served by this instance of the dashboard.
+            """)
+
+
+def format_timestamp(timestamp: float | None) -> str:
+    if timestamp is None:
+        return "Never"
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(
+        "%Y-%m-%d %H:%M:%S UTC"
+    )
+
+
+def show_values(values: dict[str, object]) -> None:
+    st.table(
+        pd.DataFrame(
+            {"Value": [str(value) for value in values.values()]},
+            index=list(values.keys()),
+        )
+    )
+
+
+st.subheader("Background log refresh")
+
+refresher = get_refresher()
+if refresher is None:
+    st.info("Background refresh is disabled, set `LOG_REFRESH_INTERVAL` to enable it.")
+else:
+    status = refresher.status
+    show_values(
+        {
+            "Poll interval": f"{status.poll_interval:.0f} s",
+            "Watched prefixes": status.prefixes,
+            "Last swap": format_timestamp(status.last_swap_at),
+            "Last swap duration": f"{status.last_swap_duration:.2f} s"
+            if status.last_swap_duration is not None
+            else "N/A",
+            "Runs added / changed / removed": f"{status.last_added} / {status.last_changed} / {status.last_removed}",
+            "Last error": status.last_error or "None",
+        }
+    )
+
+st.subheader("Evaluation logs")
+
+store = get_log_store(DEFAULT_PROJECTION)
+request_stats = get_request_policy().stats
+show_values(
+    {
+        "Loaded logs": len(store),
+        "Loads coalesced with a concurrent session": store.coalesced,
+        "S3 requests / retries / timeouts": f"{request_stats.requests} / {request_stats.retries} / {request_stats.timeouts}",
+        "Hedged requests (won)": f"{request_stats.hedges} ({request_stats.hedge_wins})",
+    }
+)
+
+st.subheader("Storage requests")
+
+scheduler_stats = get_io_scheduler().stats()
+show_values(
+    {
+        "Running / limit": f"{scheduler_stats.running} / {scheduler_stats.max_concurrency}",
+        **{
+            f"Queued ({priority.name.lower()})": count
+            for priority, count in scheduler_stats.queued.items()
+        },
+        "Completed": scheduler_stats.completed,
+        "Cancelled (session ended)": scheduler_stats.cancelled,
+    }
+)
+
+st.subheader("Startup warm-up")
+
+readiness = get_readiness()
+if readiness.started_at is None:
+    st.info(
+        "The caches weren't warmed up, start the dashboard with `make serve` or set `WARMUP_IN_BACKGROUND=true` to warm them up."
+    )
+else:
+    show_values(
+        {
+            "Ready": readiness.is_ready,
+            "Started": format_timestamp(readiness.started_at),
+            "Finished": format_timestamp(readiness.finished_at),
+            **{
+                f"Step {name}": f"{duration:.2f} s"
+                for name, duration in readiness.timings.items()
+            },
+            "Errors": ", ".join(readiness.errors) or "None",
+        }
+    )
+
+st.subheader("Config")
+
+config_timings = get_config_load_timings()
+if config_timings is not None:
+    show_values(
+        {
+            "Environment": config_timings.env,
+            "Loaded from": "compiled config"
+            if config_timings.source == "compiled"
+            else "config.yml (run `make config` to compile it)",
+            "Read": f"{config_timings.read * 1000:.1f} ms",
+            "Parse": f"{config_timings.parse * 1000:.1f} ms",
+            "Validation": f"{config_timings.validate * 1000:.1f} ms",
+        }
+    )
+
+reloader = get_config_reloader()
+if reloader is None:
+    st.info(
+        "Hot reloading of config.yml is disabled, set `CONFIG_RELOAD_INTERVAL` to enable it."
+    )
+else:
+    reload_status = reloader.status
+    show_values(
+        {
+            "Check interval": f"{reload_status.interval:g} s",
+            "Content hash": reload_status.content_hash,
+            "Reloads": reload_status.reloads,
+            "Last reload": format_timestamp(reload_status.last_reload_at),
+            "Runs added (last reload)": reload_status.last_added,
+            "Runs removed (last reload)": reload_status.last_removed,
+            "Last error": reload_status.last_error or "None",
+        }
+    )
+
+st.subheader("Cached functions")
+
+st.markdown(
+    f"{CACHE_POLICY.size / 1024 / 1024:.1f} MB of {CACHE_POLICY.max_bytes / 1024 / 1024:.0f} MB used, set `CACHE_MAX_MB` to change the budget."
+)
+st.dataframe(
+    pd.DataFrame(
+        [
+            {
+                "Function": stats.function.removeprefix("src."),
+                "Entries": stats.entries,
+                "Entry limit": stats.max_entries,
+                "TTL (s)": stats.ttl,
+                "Size (KB)": round(stats.size / 1024, 1),
+                "Hits": stats.hits,
+                "Misses": stats.misses,
+                "Evictions": stats.evictions,
+                "Expirations": stats.expirations,
+                "Coalesced": stats.coalesced,
+            }
+            for stats in CACHE_POLICY.stats()
+        ]
+    ),
+    hide_index=True,
+)
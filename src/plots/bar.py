@@ -1,16 +1,20 @@
 from operator import itemgetter
 
 import plotly.graph_objs as go  # type: ignore
-import streamlit as st
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
 from src.log_utils.dashboard_log_utils import get_scorer_by_name
+from src.log_utils.fingerprint import log_fingerprint
+from src.plots.figure_cache import FigureJSON, figure_to_json
 from src.plots.plot_utils import create_hover_text, get_human_baseline
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(
+    hash_funcs={DashboardLog: log_fingerprint}, max_entries=256, ttl=86400, copy=False
+)
 def create_bar_chart(
     eval_logs: list[DashboardLog], scorer: str, metric: str
-) -> go.Figure:
+) -> FigureJSON:
     # Extract data from filtered logs
     models = [log.model_metadata.name for log in eval_logs]
 
@@ -100,4 +104,4 @@ def create_bar_chart(
         yaxis_title=f"Value of {metric} metric",
     )
 
-    return fig
+    return figure_to_json(fig)
@@ -1,8 +1,10 @@
 import pandas as pd
 import plotly.graph_objs as go  # type: ignore
-import streamlit as st
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
 from src.log_utils.dashboard_log_utils import get_scorer_by_name
+from src.log_utils.fingerprint import log_fingerprint
+from src.plots.figure_cache import FigureJSON, figure_to_json
 from src.plots.plot_utils import (
     create_hover_text,
     get_human_baseline,
@@ -10,12 +12,14 @@ from src.plots.plot_utils import (
 )
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(
+    hash_funcs={DashboardLog: log_fingerprint}, max_entries=256, ttl=86400, copy=False
+)
 def create_cutoff_scatter(
     eval_logs: list[DashboardLog],
     scorer_name: str,
     metric_name: str,
-) -> go.Figure:
+) -> FigureJSON:
     """Create a plotly figure showing model performance over time.
 
     Args:
@@ -24,7 +28,7 @@ def create_cutoff_scatter(
         metric_name (str): Metric to plot
 
     Returns:
-        go.Figure: Plotly figure object
+        FigureJSON: The serialized plotly figure, see `plotly_chart`
 
     """
     human_baseline = get_human_baseline(eval_logs[0])
@@ -124,4 +128,4 @@ def create_cutoff_scatter(
         xaxis_tickangle=45,
     )
 
-    return fig
+    return figure_to_json(fig)
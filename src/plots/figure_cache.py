@@ -0,0 +1,123 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import plotly.graph_objects as go  # type: ignore
+import plotly.io as pio  # type: ignore
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+from streamlit.elements.lib.form_utils import current_form_id
+from streamlit.elements.lib.utils import compute_and_register_element_id, to_key
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+# Numeric arrays at least this long are sent as base64 typed arrays, which
+# plotly.js decodes natively, instead of JSON numbers
+TYPED_ARRAY_MIN_LENGTH = 8
+
+_INT32 = np.iinfo(np.int32)
+
+# Plot config of `st.plotly_chart` without arguments
+_PLOT_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+
+@dataclass(frozen=True)
+class FigureJSON:
+    """A plotly figure serialized once, ready to be displayed with `plotly_chart`.
+
+    The chart functions return this instead of the figure, so that their caches
+    hold compact JSON that is shared by every session.
+    """
+
+    spec: str
+
+    @property
+    def nbytes(self) -> int:
+        # The size counted against the memory budget of the chart caches
+        return len(self.spec)
+
+
+def figure_to_json(figure: go.Figure) -> FigureJSON:
+    """Serialize a figure to compact JSON, with numeric arrays as typed arrays."""
+    data = figure.to_dict()
+    for trace in data.get("data", []):
+        _compact_arrays(trace)
+    # plotly's JSON encoder also handles object arrays, dates and pandas types
+    return FigureJSON(pio.to_json(data, validate=False))
+
+
+def _compact_arrays(value: dict[str, Any]) -> None:
+    for key, item in value.items():
+        if isinstance(item, dict):
+            _compact_arrays(item)
+        elif (
+            isinstance(item, (list, tuple))
+            and len(item) >= TYPED_ARRAY_MIN_LENGTH
+            and all(
+                isinstance(number, (int, float)) and not isinstance(number, bool)
+                for number in item
+            )
+        ):
+            value[key] = _typed_array(item)
+
+
+def _typed_array(numbers: list | tuple) -> dict[str, str]:
+    # The typed array spec of plotly.js: a dtype and the base64 of the buffer
+    array = np.asarray(numbers)
+    if (
+        array.dtype.kind == "i"
+        and _INT32.min <= array.min()
+        and array.max() <= _INT32.max
+    ):
+        array = array.astype("<i4")
+    else:
+        array = array.astype("<f8")
+    return {
+        "dtype": array.dtype.str[1:],
+        "bdata": base64.b64encode(array.tobytes()).decode("ascii"),
+    }
+
+
+def plotly_chart(
+    figure: FigureJSON,
+    container: DeltaGenerator | None = None,
+    *,
+    use_container_width: bool = True,
+    key: str | None = None,
+) -> None:
+    """Display a serialized figure like `st.plotly_chart`, without rebuilding it.
+
+    `st.plotly_chart` validates the figure into a `go.Figure` and serializes it
+    again on every rerun. This sends the cached spec to the browser as is, in
+    the element `st.plotly_chart` creates for a figure without selections, so
+    it must be kept in sync with the pinned version of Streamlit.
+
+    Args:
+        figure: The figure to display, e.g. from `create_bar_chart`
+        container: Where to display the figure (e.g. an `st.empty` placeholder),
+            defaults to the current container
+        use_container_width: Whether to use the width of the container
+        key: The element key, like the key of `st.plotly_chart`
+
+    """
+    dg = container if container is not None else st._main
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(dg)
+    proto.spec = figure.spec
+    proto.config = _PLOT_CONFIG
+    # Same element id as `st.plotly_chart` gives the figure
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=to_key(key),
+        form_id=proto.form_id,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=("points", "box", "lasso"),
+        is_selection_activated=False,
+        theme="streamlit",
+        use_container_width=use_container_width,
+    )
+    dg._enqueue("plotly_chart", proto)
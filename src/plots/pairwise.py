@@ -1,12 +1,14 @@
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go  # type: ignore
-import streamlit as st
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
+from src.log_utils.fingerprint import log_fingerprint
+from src.plots.figure_cache import FigureJSON, figure_to_json
 from src.plots.plot_utils import get_metric_value_from_score
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(hash_funcs={DashboardLog: log_fingerprint}, max_entries=256, ttl=86400)
 def create_pairwise_analysis_table(
     eval_logs: list[DashboardLog],
     model_name: str,
@@ -96,8 +98,8 @@ def create_pairwise_analysis_table(
     return pd.DataFrame(rows)
 
 
-@st.cache_data
-def create_pairwise_scatter(pairwise_analysis_df: pd.DataFrame) -> go.Figure:
+@cached(max_entries=256, ttl=86400, copy=False)
+def create_pairwise_scatter(pairwise_analysis_df: pd.DataFrame) -> FigureJSON:
     # Extract data from the DataFrame
     tasks = pairwise_analysis_df["Task"].tolist()
 
@@ -178,4 +180,4 @@ def create_pairwise_scatter(pairwise_analysis_df: pd.DataFrame) -> go.Figure:
         xaxis=dict(tickangle=45),  # Angle task names for better readability
     )
 
-    return fig
+    return figure_to_json(fig)
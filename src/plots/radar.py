@@ -1,8 +1,10 @@
 from typing import Dict, List, Tuple
 
 import plotly.graph_objs as go  # type: ignore
-import streamlit as st
 from inspect_evals_dashboard_schema import DashboardLog
+from src.cache_policy import cached
+from src.log_utils.fingerprint import log_fingerprint
+from src.plots.figure_cache import FigureJSON, figure_to_json
 
 
 def normalize_metric(value: float, min_val: float, max_val: float) -> float:
@@ -51,10 +53,12 @@ def get_task_min_max(
     return task_bounds
 
 
-@st.cache_data(hash_funcs={DashboardLog: id})
+@cached(
+    hash_funcs={DashboardLog: log_fingerprint}, max_entries=256, ttl=86400, copy=False
+)
 def create_radar_chart(
     category_logs: dict[str, list[DashboardLog]], selected_model: str
-) -> go.Figure:
+) -> FigureJSON:
     """Create a radar chart showing model performance across different evaluation categories.
 
     Each task is normalized using all models' scores, then averaged for the selected model.
@@ -64,7 +68,7 @@ def create_radar_chart(
         selected_model: Name of the model to show performance for
 
     Returns:
-        go.Figure: Plotly figure object
+        FigureJSON: The serialized plotly figure, see `plotly_chart`
 
     """
     categories = []
@@ -173,4 +177,4 @@ def create_radar_chart(
         height=600,
     )
 
-    return fig
+    return figure_to_json(fig)
@@ -0,0 +1,205 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from inspect_evals_dashboard_schema import DashboardLog
+from src.config import EnvironmentConfig, load_config
+from src.log_utils.dashboard_log_utils import (
+    get_all_metrics,
+    read_default_values_from_configs,
+)
+from src.log_utils.load_eval_logs import get_log_paths, load_evaluation_logs
+from src.plots.bar import create_bar_chart
+from src.plots.cost_scatter import create_cost_scatter
+from src.plots.cutoff_scatter import create_cutoff_scatter
+from src.plots.pairwise import create_pairwise_analysis_table, create_pairwise_scatter
+from src.plots.radar import create_radar_chart
+
+# Comma-separated categories to warm up at startup (e.g. "agents,coding"), all
+# categories of the environment by default
+WARMUP_CATEGORIES = os.getenv("WARMUP_CATEGORIES", "")
+
+# File created once the warm-up is done, for readiness probes of the load balancer
+WARMUP_READY_FILE = os.getenv("WARMUP_READY_FILE", "")
+
+# Whether `streamlit run app.py` warms up the caches in the background, from
+# the first session of the process. `scripts.serve` warms them up before the
+# server starts instead.
+WARMUP_IN_BACKGROUND = os.getenv("WARMUP_IN_BACKGROUND", "true").lower() == "true"
+
+
+@dataclass
+class Readiness:
+    """Whether this process finished warming up its caches, and how long it took."""
+
+    ready: threading.Event = field(default_factory=threading.Event)
+    started_at: float | None = None
+    finished_at: float | None = None
+    # Step (e.g. "config", "logs:agents", "figures:agents") -> duration in seconds
+    timings: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+
+# Kept outside of `st.cache_resource`, clearing the resources mustn't make the
+# process look like it never warmed up
+_readiness = Readiness()
+_warm_up_lock = threading.Lock()
+
+
+def get_readiness() -> Readiness:
+    """Return the readiness of this process, shared by all sessions."""
+    return _readiness
+
+
+def start_warm_up(
+    categories: list[str] | None = None, ready_file: str = WARMUP_READY_FILE
+) -> Readiness:
+    """Warm up the caches in a background thread, unless this process already started.
+
+    This is the warm-up of `streamlit run app.py`, which has no hook before
+    the server starts: the first session starts it, and the process is flagged
+    as ready (`get_readiness`, `ready_file`) once it's done.
+    """
+    readiness = get_readiness()
+    with _warm_up_lock:
+        if readiness.started_at is None:
+            # Set here so that concurrent first sessions start a single thread
+            readiness.started_at = time.time()
+            threading.Thread(
+                target=warm_up,
+                args=(categories, ready_file),
+                name="warm-up",
+                daemon=True,
+            ).start()
+    return readiness
+
+
+def parse_categories(value: str) -> list[str] | None:
+    """Parse a comma-separated list of categories, None (all categories) if empty."""
+    categories = [category.strip() for category in value.split(",") if category.strip()]
+    return categories or None
+
+
+def warm_up(
+    categories: list[str] | None = None, ready_file: str = WARMUP_READY_FILE
+) -> Readiness:
+    """Preload the config, the logs and the default figures, then flag the process as ready.
+
+    The steps run in the order of a first visit: the config, the logs of every
+    category, then the figures each category page and the home page show with
+    their default selections. Failed steps are logged and don't block readiness.
+    A ready file left by a previous process is removed when the warm-up starts.
+
+    Args:
+        categories: The categories to warm up, defaults to `WARMUP_CATEGORIES` or
+            every category of the active environment
+        ready_file: File to create once the warm-up is done, skipped if empty
+
+    Returns:
+        The readiness of this process
+
+    """
+    readiness = get_readiness()
+    if readiness.started_at is None:
+        readiness.started_at = time.time()
+    if ready_file:
+        Path(ready_file).unlink(missing_ok=True)
+
+    def step(name: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as e:
+            logging.exception(f"Warm-up step {name} failed")
+            readiness.errors[name] = repr(e)
+            return None
+        finally:
+            readiness.timings[name] = time.perf_counter() - start
+            logging.info(f"Warm-up step {name} took {readiness.timings[name]:.2f} s")
+
+    config: EnvironmentConfig | None = step("config", load_config)
+    if config is not None:
+        categories = categories or parse_categories(WARMUP_CATEGORIES)
+        all_categories = [c for c in config.model_fields if getattr(config, c)]
+        selected = [c for c in all_categories if categories is None or c in categories]
+        for unknown in set(categories or []) - set(config.model_fields):
+            logging.warning(f"Unknown warm-up category: {unknown}")
+
+        category_logs = {}
+        for category in selected:
+            logs = step(
+                f"logs:{category}",
+                load_evaluation_logs,
+                get_log_paths(getattr(config, category)),
+            )
+            if logs is not None:
+                category_logs[category] = logs
+
+        for category, logs in category_logs.items():
+            step(
+                f"figures:{category}",
+                warm_up_category_figures,
+                logs,
+                read_default_values_from_configs(getattr(config, category)),
+            )
+
+        # The home page charts every category
+        if category_logs and selected == all_categories:
+            step("figures:home", warm_up_home_figures, category_logs)
+
+    readiness.finished_at = time.time()
+    readiness.ready.set()
+    if ready_file:
+        Path(ready_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(ready_file).touch()
+    logging.info(
+        f"Warm-up finished in {readiness.finished_at - readiness.started_at:.2f} s"
+    )
+    return readiness
+
+
+def warm_up_category_figures(
+    eval_logs: list[DashboardLog], default_values: dict[str, dict[str, str]]
+) -> None:
+    """Build the figures a category page shows with its default selections."""
+    for task in sorted(set(log.eval.task for log in eval_logs)):
+        task_logs = [log for log in eval_logs if log.eval.task == task]
+        task_metrics = sorted(set().union(*[get_all_metrics(log) for log in task_logs]))
+        if not task_metrics or task not in default_values:
+            continue
+
+        default_metric = default_values[task]["default_metric"]
+        metric = default_metric if default_metric in task_metrics else task_metrics[0]
+        scorer = default_values[task]["default_scorer"]
+
+        create_bar_chart(task_logs, scorer, metric)
+        create_cutoff_scatter(task_logs, scorer, metric)
+        create_cost_scatter(task_logs, scorer, metric)
+
+    # Default pair of the pairwise analysis, the first two models by name
+    models = sorted(
+        set(log.eval.model for log in eval_logs), key=lambda m: m.split("/")[-1]
+    )
+    if len(models) >= 2:
+        pairwise_logs = [log for log in eval_logs if log.eval.model in models[:2]]
+        pairwise_analysis_df = create_pairwise_analysis_table(
+            pairwise_logs, models[0], models[1], default_values
+        )
+        if not pairwise_analysis_df.empty:
+            create_pairwise_scatter(pairwise_analysis_df)
+
+
+def warm_up_home_figures(category_logs: dict[str, list[DashboardLog]]) -> None:
+    """Build the radar chart the home page shows for its default model."""
+    all_models: set[str] = set()
+    for logs in category_logs.values():
+        all_models.update(log.model_metadata.name for log in logs)
+    if all_models:
+        create_radar_chart(category_logs, sorted(all_models, key=str.lower)[0])
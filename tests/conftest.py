@@ -1,7 +1,14 @@
+import hashlib
+import io
 import os
+import time
+from pathlib import Path
 
 import pytest
+from botocore.exceptions import ClientError
 from src.config import load_config
+from src.log_utils import load_eval_logs
+from src.log_utils.disk_cache import DiskCache
 from src.log_utils.load_eval_logs import get_log_paths, load_evaluation_logs
 
 # Set default environment variables needed for testing
@@ -18,7 +25,85 @@ def set_test_env_vars():
     yield
 
 
+@pytest.fixture(autouse=True)
+def disk_cache(tmp_path, monkeypatch):
+    """Content cache of the logs fetched by a test, instead of the one in .cache/logs."""
+    cache = DiskCache(tmp_path / "log_cache", max_bytes=64 * 1024 * 1024)
+    monkeypatch.setattr(load_eval_logs, "get_disk_cache", lambda: cache)
+    return cache
+
+
 @pytest.fixture(scope="session")
 def eval_logs():
     group_config = load_config().agents
     return load_evaluation_logs(get_log_paths(group_config))
+
+
+class LocalS3Client:
+    """Minimal in-memory stand-in for the boto3 S3 client used by `src.log_utils`.
+
+    Latency and errors can be injected per key: each GET of a key pops the next
+    delay from `delays[key]` and the next exception from `errors[key]` (None for
+    a successful response).
+    """
+
+    def __init__(self, objects: dict[str, bytes] | None = None):
+        self.objects = dict(objects or {})
+        self.requests: list[tuple[str, str]] = []
+        self.delays: dict[str, list[float]] = {}
+        self.errors: dict[str, list[Exception | None]] = {}
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return f'"{hashlib.md5(body).hexdigest()}"'
+
+    def get_object(self, Bucket: str, Key: str, IfNoneMatch: str | None = None):
+        if self.delays.get(Key):
+            time.sleep(self.delays[Key].pop(0))
+        if self.errors.get(Key):
+            error = self.errors[Key].pop(0)
+            if error is not None:
+                self.requests.append(("error", Key))
+                raise error
+
+        if Key not in self.objects:
+            self.requests.append(("missing", Key))
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": Key}}, "GetObject"
+            )
+
+        body = self.objects[Key]
+        if IfNoneMatch == self.etag(body):
+            self.requests.append(("not_modified", Key))
+            raise ClientError(
+                {"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject"
+            )
+
+        self.requests.append(("get", Key))
+        return {"Body": io.BytesIO(body), "ETag": self.etag(body)}
+
+    @staticmethod
+    def error(code: str) -> ClientError:
+        return ClientError({"Error": {"Code": code, "Message": code}}, "GetObject")
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs):
+        self.requests.append(("list", Prefix))
+        return {
+            "Contents": [
+                {"Key": key, "ETag": self.etag(body), "Size": len(body)}
+                for key, body in sorted(self.objects.items())
+                if key.startswith(Prefix)
+            ],
+            "IsTruncated": False,
+        }
+
+
+@pytest.fixture
+def local_s3():
+    """S3 stand-in serving the test logs as s3://test-bucket/logs/test/test_task/*.json."""
+    return LocalS3Client(
+        {
+            f"logs/test/test_task/{path.name}": path.read_bytes()
+            for path in sorted(Path("tests/data/test_task").glob("*.json"))
+        }
+    )
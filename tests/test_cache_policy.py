@@ -0,0 +1,208 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.cache_policy import CachePolicy, cached, estimate_size
+from src.plots.figure_cache import FigureJSON
+
+
+def test_cached_returns_copies_and_counts_hits():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    calls = []
+
+    @cached(policy=policy)
+    def double(values: list[int]) -> list[int]:
+        calls.append(values)
+        return [value * 2 for value in values]
+
+    first = double([1, 2])
+    second = double([1, 2])
+    second.append(0)
+
+    assert first == [2, 4]
+    assert double([1, 2]) == [2, 4]
+    assert len(calls) == 1
+    (stats,) = policy.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (1, 2, 1)
+
+    double.clear()
+    double([1, 2])
+    assert len(calls) == 2
+
+
+def test_cached_hash_funcs_and_private_arguments():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+
+    @cached(policy=policy, hash_funcs={dict: lambda value: value["id"]})
+    def get_name(item: dict, _session: object) -> str:
+        return item["name"]
+
+    assert get_name({"id": 1, "name": "a"}, object()) == "a"
+    # Same id and a different private argument: served from the cache
+    assert get_name({"id": 1, "name": "b"}, object()) == "a"
+
+
+def test_entry_limit_evicts_least_recently_used():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    calls = []
+
+    @cached(policy=policy, max_entries=2)
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    square(1)
+    square(2)
+    square(1)  # 2 is now the least recently used
+    square(3)
+    square(1)
+    square(2)
+
+    assert calls == [1, 2, 3, 2]
+    (stats,) = policy.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 2
+
+
+def test_memory_budget_evicts_across_functions():
+    policy = CachePolicy(max_bytes=2500)
+
+    @cached(policy=policy)
+    def first(size: int) -> bytes:
+        return b"x" * size
+
+    @cached(policy=policy)
+    def second(size: int) -> bytes:
+        return b"y" * size
+
+    first(1000)
+    second(1000)
+    first(1001)
+
+    assert policy.size <= policy.max_bytes
+    stats = {s.function.rsplit(".", 1)[-1]: s for s in policy.stats()}
+    assert stats["first"].evictions == 1
+    assert stats["second"].entries == 1
+
+    # Values larger than the budget aren't cached
+    first(5000)
+    stats = {s.function.rsplit(".", 1)[-1]: s for s in policy.stats()}
+    assert stats["first"].entries == 1
+    assert policy.size <= policy.max_bytes
+
+
+def test_ttl_expires_entries():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    calls = []
+
+    @cached(policy=policy, ttl=0.05)
+    def now(key: str) -> float:
+        calls.append(key)
+        return time.time()
+
+    now("a")
+    now("a")
+    time.sleep(0.1)
+    now("a")
+
+    assert len(calls) == 2
+    (stats,) = policy.stats()
+    assert stats.expirations == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @cached(policy=policy)
+    def slow(key: str) -> str:
+        calls.append(key)
+        started.set()
+        release.wait(5)
+        return key.upper()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(slow, "a")
+        started.wait(5)
+        waiters = [executor.submit(slow, "a") for _ in range(3)]
+        while policy.stats()[0].coalesced < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [leader.result()] + [waiter.result() for waiter in waiters]
+
+    assert results == ["A"] * 4
+    assert calls == ["a"]
+    assert policy.stats()[0].coalesced == 3
+
+
+def test_coalesced_callers_get_the_exception():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    policy.register("f")
+
+    assert policy.claim("f", "key") is None
+    flight = policy.claim("f", "key")
+    policy.release("f", "key", ValueError("failed"))
+
+    with pytest.raises(ValueError):
+        flight.result()
+    # The next miss computes again
+    assert policy.claim("f", "key") is None
+
+
+def test_shared_values_are_not_copied(mocker):
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    dumps = mocker.spy(pickle, "dumps")
+
+    @cached(policy=policy, copy=False)
+    def letters(word: str) -> frozenset[str]:
+        return frozenset(word)
+
+    first = letters("abc")
+
+    assert letters("abc") is first
+    (stats,) = policy.stats()
+    # Shared values count against the budget with their estimated size
+    assert stats.size == estimate_size(first) > 0 and stats.hits == 1
+    dumps.assert_not_called()
+
+
+def test_estimate_size():
+    spec = '{"data": []}' * 100
+
+    assert estimate_size(FigureJSON(spec)) == len(spec)
+    assert estimate_size(b"abc") == 3
+    assert estimate_size(("a" * 100, "b")) > 100
+
+
+def test_none_is_cached():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+    calls = []
+
+    @cached(policy=policy, copy=False)
+    def nothing(value: int) -> None:
+        calls.append(value)
+
+    assert nothing(1) is None
+    assert nothing(1) is None
+    assert calls == [1]
+
+
+def test_registering_again_keeps_the_stats():
+    policy = CachePolicy(max_bytes=1024 * 1024)
+
+    @cached(policy=policy)
+    def square(value: int) -> int:
+        return value * value
+
+    square(2)
+    # e.g. the module of the function is executed again on a rerun
+    policy.register(f"{__name__}.{square.__qualname__}", max_entries=8)
+    square.clear()
+
+    (stats,) = policy.stats()
+    assert (stats.entries, stats.size, stats.misses) == (0, 0, 1)
+    assert stats.max_entries == 8
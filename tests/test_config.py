@@ -1,7 +1,11 @@
 import re
 
 import pytest
-from src.config import EvaluationConfig, load_config
+import yaml
+from pydantic import ValidationError
+from src import config
+from src.cache_policy import CACHE_POLICY
+from src.config import EvaluationConfig, load_config, read_config
 
 
 def test_substitute_env_vars_replaces_variables(monkeypatch):
@@ -22,11 +26,11 @@ def test_substitute_env_vars_replaces_variables(monkeypatch):
     )
 
     # Assert within the patched context
-    assert config.paths == [
+    assert config.paths == (
         "s3://my-test-bucket/test/data.json",
         "s3://my-test-bucket/fixed/path.json",
         "local/path/no/variables.json",
-    ]
+    )
 
 
 def test_substitute_env_vars_multiple_variables(monkeypatch):
@@ -42,7 +46,7 @@ def test_substitute_env_vars_multiple_variables(monkeypatch):
     )
 
     # Assert
-    assert config.paths == ["first/second/first-second.json"]
+    assert config.paths == ("first/second/first-second.json",)
 
 
 def test_substitute_env_vars_missing_variable(monkeypatch):
@@ -73,14 +77,12 @@ def test_duplicate_entries(monkeypatch):
             return model_name.replace("+", "/")
         return None
 
-    # get the function without @st.cache_data decorator
-    noncached_load_config = load_config.__wrapped__
     monkeypatch.setenv("AWS_S3_BUCKET", "__test-bucket")
 
     for env in ["prod", "stage", "dev"]:
         monkeypatch.setenv("STREAMLIT_ENV", env)
 
-        config = noncached_load_config()
+        config = read_config()
         for field in config.model_fields.keys():
             group_config = getattr(config, field)
             for eval_config in group_config:
@@ -94,3 +96,101 @@ def test_duplicate_entries(monkeypatch):
                 assert len(model_names) == len(set(model_names)), (
                     f"Duplicate models in {env}→{field}→{eval_config.name} paths"
                 )
+
+
+def test_load_config_uses_the_compiled_config(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        yaml.safe_dump(
+            {
+                env: {
+                    "evaluations": {
+                        "agents": [
+                            {
+                                "name": f"{env}_task",
+                                "default_scorer": "choice",
+                                "default_metric": "accuracy",
+                                "paths": ["$AWS_S3_BUCKET/1.json"],
+                            }
+                        ]
+                    }
+                }
+                for env in ("test", "prod")
+            }
+        )
+    )
+    monkeypatch.setattr(config, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(config, "COMPILED_CONFIG_DIR", tmp_path / "compiled")
+    monkeypatch.setenv("STREAMLIT_ENV", "test")
+    from_yaml = read_config()
+    assert config.get_config_load_timings().source == "yaml"
+
+    compiled_paths = config.compile_config(config_path, tmp_path / "compiled")
+
+    assert len(compiled_paths) == 2
+    from_compiled = read_config()
+    assert config.get_config_load_timings().source == "compiled"
+    assert from_compiled == from_yaml
+    # Environment variables are still substituted at load time
+    assert from_compiled.agents[0].paths == ("test-bucket/1.json",)
+
+    # A compiled config is ignored as soon as config.yml changes
+    config_path.write_text(config_path.read_text().replace("test_task", "renamed"))
+    assert read_config().agents[0].name == "renamed"
+    assert config.get_config_load_timings().source == "yaml"
+
+
+def test_config_indexes(monkeypatch):
+    monkeypatch.setenv("AWS_S3_BUCKET", "bucket")
+    prefix = "s3://$AWS_S3_BUCKET/logs/prod"
+    run_1 = f"{prefix}/bbh/openai+gpt-4o/2025-03-24-00-42-50-52d71604/run.json"
+    run_2 = f"{prefix}/bbh/mistral+mistral-large/2025-03-31-10-51-48-b4519144/run.json"
+    run_3 = f"{prefix}/gpqa/openai+gpt-4o/2025-04-01-00-00-00-12345678/run.json"
+    task = {"default_scorer": "choice", "default_metric": "accuracy"}
+    env_config = config.EnvironmentConfig.model_validate(
+        {
+            "reasoning": [
+                {"name": "bbh", "paths": [run_1, run_2], **task},
+                {"name": "gpqa", "paths": [run_3], **task},
+            ],
+            "knowledge": [{"name": "gpqa", "paths": [run_3], **task}],
+        },
+        context={"env": "prod"},
+    )
+    index = env_config.index
+    run_1, run_3 = (path.replace("$AWS_S3_BUCKET", "bucket") for path in (run_1, run_3))
+
+    assert (env_config.total_models, env_config.total_tasks, env_config.total_runs) == (
+        2,
+        2,
+        3,
+    )
+    # Categories are indexed in the order of their fields, knowledge comes first
+    assert index.model_runs["openai+gpt-4o"] == (run_3, run_1)
+    assert index.task_categories["gpqa"] == ("knowledge", "reasoning")
+    assert index.category_tasks["reasoning"] == ("bbh", "gpqa")
+    assert index.category_tasks["agents"] == ()
+    assert index.runs[run_1] == config.RunInfo(
+        "prod", "bbh", "openai+gpt-4o", "2025-03-24-00-42-50"
+    )
+    assert env_config.reasoning[0].model_names == {
+        "openai+gpt-4o",
+        "mistral+mistral-large",
+    }
+    with pytest.raises(TypeError):
+        index.model_runs["openai+gpt-4o"] = ()
+
+
+def test_load_config_is_shared_and_read_only():
+    loaded = load_config()
+
+    assert load_config() is loaded
+    # The config isn't evicted with the caches of `src`
+    CACHE_POLICY.clear()
+    assert load_config() is loaded
+    with pytest.raises(ValidationError):
+        loaded.agents = ()
+    with pytest.raises(ValidationError):
+        loaded.agents[0].default_metric = "mean"
+    with pytest.raises(AttributeError):
+        loaded.agents[0].paths.append("another/run.json")  # type: ignore[attr-defined]
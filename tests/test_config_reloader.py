@@ -0,0 +1,80 @@
+import os
+
+import pytest
+import yaml
+from src import config
+from src.config import load_config, set_config
+from src.config_reloader import ConfigReloader
+from src.log_utils.log_store import LogStore
+
+KEPT = "tests/data/test_task/1.json"
+REMOVED = "tests/data/test_task/2.json"
+ADDED = "tests/data/test_task/3.json"
+
+
+def write_config(path, paths: list[str]) -> None:
+    task = {
+        "name": "test_task",
+        "default_scorer": "choice",
+        "default_metric": "accuracy",
+        "paths": paths,
+    }
+    path.write_text(yaml.safe_dump({"test": {"evaluations": {"agents": [task]}}}))
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = tmp_path / "config.yml"
+    write_config(path, [KEPT, REMOVED])
+    monkeypatch.setattr(config, "CONFIG_PATH", path)
+    monkeypatch.setattr(config, "COMPILED_CONFIG_DIR", tmp_path / "compiled")
+    set_config(None)
+    yield path
+    # Don't leave the temporary config loaded for the other tests
+    set_config(None)
+
+
+def test_reload_replaces_config_and_drops_removed_runs(config_path, eval_logs):
+    store = LogStore()
+    store.put_many({KEPT: eval_logs[0], REMOVED: eval_logs[1]})
+    reloaded = []
+    reloader = ConfigReloader(1, [store], [reloaded.append])
+    old_config = load_config()
+
+    write_config(config_path, [KEPT, ADDED])
+    diff = reloader.check()
+
+    assert diff is not None
+    assert (diff.added, diff.removed) == ({ADDED}, {REMOVED})
+    new_config = load_config()
+    assert new_config is not old_config
+    assert new_config.agents[0].paths == (KEPT, ADDED)
+    assert reloaded == [new_config]
+    # Only the logs of removed runs are dropped
+    assert KEPT in store and REMOVED not in store
+    assert reloader.status.reloads == 1
+
+
+def test_reload_ignores_unchanged_content(config_path):
+    reloader = ConfigReloader(1, [])
+    loaded = load_config()
+
+    # Rewriting the same content changes the modification time, not the hash
+    stat = config_path.stat()
+    config_path.write_bytes(config_path.read_bytes())
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert reloader.check() is None
+    assert load_config() is loaded
+    assert reloader.status.reloads == 0
+
+
+def test_failed_reload_keeps_the_current_config(config_path):
+    reloader = ConfigReloader(1, [])
+    loaded = load_config()
+
+    config_path.write_text("prod: {}")
+    with pytest.raises(ValueError):
+        reloader.check()
+
+    assert load_config() is loaded
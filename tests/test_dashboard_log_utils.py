@@ -2,9 +2,12 @@ from inspect_ai.log import EvalScore
 from src.config import load_config
 from src.log_utils.dashboard_log_utils import (
     get_all_metrics,
+    get_model_metadata,
+    get_models_metadata,
     get_scorer_by_name,
     read_default_values_from_configs,
 )
+from src.log_utils.model_registry import get_model_registry
 
 
 def test_read_default_values_from_configs():
@@ -24,15 +27,33 @@ def test_get_all_metrics(eval_logs):
 
 
 def test_get_scorer_by_name(eval_logs):
-    # deep copy because we are appending some data next
-    log = eval_logs[0].model_copy(deep=True)
-
     # Append a fake score with some fake data to test the name-getting logic
     # If the logic becomes more complex we might need to generate proper data here
-    log.results.scores.append(EvalScore(name="another_choice", scorer="some_data"))
+    # Logs are read-only, so the score is appended to a copy
+    log = eval_logs[0]
+    scores = (*log.results.scores, EvalScore(name="another_choice", scorer="some_data"))
+    log = log.model_copy(
+        update={"results": log.results.model_copy(update={"scores": scores})}
+    )
 
     assert get_scorer_by_name(log, "another_choice").name == "another_choice"
     assert get_scorer_by_name(log, "choice").name == "choice"
 
     # when requesting a non-existintent scorer, it should default to the first scorer on the list
     assert get_scorer_by_name(log, "not-existing").name == "choice"
+
+
+def test_get_models_metadata_uses_the_registry(eval_logs):
+    registry = get_model_registry()
+    metadata = eval_logs[0].model_metadata.model_copy(
+        update={"family": "another-family"}
+    )
+    first, second = registry.intern_logs(
+        [eval_logs[0], eval_logs[0].model_copy(update={"model_metadata": metadata})]
+    )
+
+    # One entry per model, the latest metadata in the registry
+    assert [metadata.family for metadata in get_models_metadata([first, second])] == [
+        "another-family"
+    ]
+    assert get_model_metadata(first) is second.model_metadata
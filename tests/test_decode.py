@@ -0,0 +1,82 @@
+import json
+import math
+import pickle
+from pathlib import Path
+
+from inspect_evals_dashboard_schema import DashboardLog
+from src.log_utils.decode import CHART_FIELDS, _trusted_key, parse_dashboard_log
+from src.log_utils.disk_cache import DiskCache
+from src.log_utils.fingerprint import log_fingerprint
+from src.log_utils.frozen import FrozenDashboardLog
+
+LOG_PATH = "tests/data/test_task/1.json"
+
+
+def expected_log(location: str) -> DashboardLog:
+    data = json.loads(Path(LOG_PATH).read_text())
+    data["location"] = location
+    return FrozenDashboardLog(**data)
+
+
+def test_parse_dashboard_log():
+    raw = Path(LOG_PATH).read_bytes()
+
+    assert parse_dashboard_log(raw, "some/location.json") == expected_log(
+        "some/location.json"
+    )
+
+
+def test_parse_dashboard_log_accepts_nan():
+    data = json.loads(Path(LOG_PATH).read_text())
+    data["results"]["scores"][0]["metrics"]["stderr"]["value"] = float("nan")
+
+    log = parse_dashboard_log(json.dumps(data).encode(), LOG_PATH)
+
+    assert math.isnan(log.results.scores[0].metrics["stderr"].value)
+
+
+def test_parse_dashboard_log_trusted_reuses_validated_logs(tmp_path, mocker):
+    raw = Path(LOG_PATH).read_bytes()
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+
+    first = parse_dashboard_log(raw, "first.json", cache, trusted=True)
+    validate = mocker.spy(FrozenDashboardLog, "model_validate_json")
+    second = parse_dashboard_log(raw, "second.json", cache, trusted=True)
+
+    validate.assert_not_called()
+    assert first == expected_log("first.json")
+    assert second == expected_log("second.json")
+
+
+def test_parse_dashboard_log_trusted_validates_unreadable_entries(tmp_path):
+    raw = Path(LOG_PATH).read_bytes()
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+    key = _trusted_key(raw, None)
+    cache.put(key, b"not a pickle", etag="")
+
+    log = parse_dashboard_log(raw, "first.json", cache, trusted=True)
+
+    assert log == expected_log("first.json")
+    # The entry is replaced by the validated log
+    assert pickle.loads(cache.get(key).body) == log
+
+
+def test_parse_dashboard_log_fingerprints_content():
+    raw = Path(LOG_PATH).read_bytes()
+    data = json.loads(raw)
+    data["results"]["completed_samples"] = 2
+
+    log = parse_dashboard_log(raw, LOG_PATH)
+    fingerprint = log_fingerprint(log)
+
+    # Reloading the same content gives a new object with the same fingerprint
+    assert fingerprint.startswith(f"{log.eval.run_id}:")
+    assert log_fingerprint(parse_dashboard_log(raw, LOG_PATH)) == fingerprint
+    # Other content, another projection or another location change it
+    assert log_fingerprint(
+        parse_dashboard_log(json.dumps(data).encode(), LOG_PATH)
+    ) != (fingerprint)
+    assert log_fingerprint(parse_dashboard_log(raw, LOG_PATH, fields=CHART_FIELDS)) != (
+        fingerprint
+    )
+    assert log_fingerprint(parse_dashboard_log(raw, "other.json")) != fingerprint
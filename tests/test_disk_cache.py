@@ -0,0 +1,71 @@
+from src.log_utils.aws_s3_utils import read_s3_object
+from src.log_utils.disk_cache import DiskCache
+from src.log_utils.load_eval_logs import fetch_evaluation_logs
+
+KEY = "logs/test/test_task/1.json"
+CACHE_KEY = f"test-bucket/{KEY}"
+
+
+def test_read_s3_object_revalidates_with_etag(local_s3, tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+
+    first = read_s3_object(local_s3, "test-bucket", KEY, cache)
+    second = read_s3_object(local_s3, "test-bucket", KEY, cache)
+
+    assert first == second == local_s3.objects[KEY]
+    assert local_s3.requests == [("get", KEY), ("not_modified", KEY)]
+
+
+def test_read_s3_object_trusts_fresh_entries(local_s3, tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+
+    read_s3_object(local_s3, "test-bucket", KEY, cache, max_age=60)
+    read_s3_object(local_s3, "test-bucket", KEY, cache, max_age=60)
+
+    assert local_s3.requests == [("get", KEY)]
+
+
+def test_read_s3_object_downloads_changed_objects(local_s3, tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+    read_s3_object(local_s3, "test-bucket", KEY, cache)
+
+    local_s3.objects[KEY] = b"{}"
+
+    assert read_s3_object(local_s3, "test-bucket", KEY, cache) == b"{}"
+    assert local_s3.requests[-1] == ("get", KEY)
+    assert cache.get(CACHE_KEY).body == b"{}"
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=25)
+    cache.put("a", b"a" * 10, etag="a")
+    cache.put("b", b"b" * 10, etag="b")
+    cache.get("a")  # "a" is now more recently used than "b"
+
+    cache.put("c", b"c" * 10, etag="c")
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_read_s3_object_keys_entries_by_bucket(local_s3, tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1024 * 1024)
+    read_s3_object(local_s3, "test-bucket", KEY, cache, max_age=60)
+
+    # The same key in another bucket isn't served from the cache
+    local_s3.objects[KEY] = b"{}"
+    assert read_s3_object(local_s3, "other-bucket", KEY, cache, max_age=60) == b"{}"
+    assert cache.get(CACHE_KEY).body != b"{}"
+
+
+def test_fetch_evaluation_logs_from_s3(local_s3, disk_cache):
+    paths = [
+        f"s3://test-bucket/logs/test/test_task/{name}" for name in ("2.json", "1.json")
+    ]
+
+    logs, failures = fetch_evaluation_logs(paths, s3_client=local_s3)
+
+    assert failures == {}
+    assert [log.location for log in logs] == paths
+    assert disk_cache.get(CACHE_KEY) is not None
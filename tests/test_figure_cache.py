@@ -0,0 +1,86 @@
+import base64
+import json
+
+import numpy as np
+import plotly.graph_objects as go  # type: ignore
+import plotly.io as pio  # type: ignore
+from src.cache_policy import CACHE_POLICY
+from src.plots.bar import create_bar_chart
+from src.plots.figure_cache import figure_to_json
+from streamlit.testing.v1 import AppTest
+
+
+def test_figure_to_json_encodes_numeric_arrays_compactly():
+    values = [i / 7 for i in range(100)]
+    figure = go.Figure(go.Scatter(x=list(range(100)), y=values, text=["a"] * 100))
+
+    serialized = figure_to_json(figure)
+
+    assert '"bdata"' in serialized.spec
+    assert len(serialized.spec) < len(pio.to_json(figure, validate=False))
+    (trace,) = json.loads(serialized.spec)["data"]
+    y = np.frombuffer(base64.b64decode(trace["y"]["bdata"]), dtype=trace["y"]["dtype"])
+    assert y.tolist() == values
+    x = np.frombuffer(base64.b64decode(trace["x"]["bdata"]), dtype=trace["x"]["dtype"])
+    assert trace["x"]["dtype"] == "i4" and x.tolist() == list(range(100))
+    assert trace["text"] == ["a"] * 100
+
+
+def test_cached_figure_serializes_once(eval_logs):
+    scorer = eval_logs[0].results.scores[0].name
+    metric = next(iter(eval_logs[0].results.scores[0].metrics))
+    create_bar_chart.clear()
+
+    serialized = create_bar_chart(eval_logs, scorer, metric)
+
+    assert create_bar_chart(eval_logs, scorer, metric) is serialized
+    assert serialized == create_bar_chart.__wrapped__(eval_logs, scorer, metric)
+    (stats,) = [
+        stats
+        for stats in CACHE_POLICY.stats()
+        if stats.function == "src.plots.bar.create_bar_chart"
+    ]
+    assert stats.entries == 1
+
+
+def render_charts(figure, compare=False):
+    import json
+
+    import streamlit as st
+    from src.plots.figure_cache import plotly_chart
+
+    plotly_chart(figure, key="chart")
+    if compare:
+        st.plotly_chart(json.loads(figure.spec))
+
+
+def test_plotly_chart_sends_the_serialized_figure():
+    figure = figure_to_json(go.Figure(go.Bar(x=list("abcdefgh"), y=list(range(8)))))
+
+    at = AppTest.from_function(render_charts, args=(figure, True)).run()
+
+    assert not at.exception
+    sent, expected = [element.proto for element in at.get("plotly_chart")]
+    assert sent.spec == figure.spec
+    # The same element as `st.plotly_chart`, which serializes the figure again
+    assert json.loads(sent.spec) == json.loads(expected.spec)
+    assert (sent.config, sent.theme, sent.use_container_width) == (
+        expected.config,
+        expected.theme,
+        expected.use_container_width,
+    )
+
+
+def test_cached_figures_are_rendered_without_building_a_figure(eval_logs, mocker):
+    scorer = eval_logs[0].results.scores[0].name
+    metric = next(iter(eval_logs[0].results.scores[0].metrics))
+    create_bar_chart.clear()
+    create_bar_chart(eval_logs, scorer, metric)
+    spy = mocker.spy(go.Figure, "__init__")
+
+    figure = create_bar_chart(eval_logs, scorer, metric)
+    at = AppTest.from_function(render_charts, args=(figure,)).run()
+
+    assert not at.exception
+    assert at.get("plotly_chart")[0].proto.spec == figure.spec
+    spy.assert_not_called()
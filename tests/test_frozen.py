@@ -0,0 +1,70 @@
+import copy
+import pickle
+
+import pytest
+from inspect_evals_dashboard_schema import DashboardLog
+from pydantic import ValidationError
+from src.log_utils.frozen import FrozenDashboardLog, freeze_log
+from src.log_utils.log_store import LogStore
+
+
+def test_stored_logs_are_read_only(eval_logs):
+    store = LogStore()
+    log = DashboardLog.model_validate_json(eval_logs[0].model_dump_json())
+    log.location = eval_logs[0].location
+
+    store.put_many({log.location: log})
+    stored = store.get(log.location)
+
+    assert isinstance(stored, FrozenDashboardLog)
+    assert isinstance(stored.results.scores, tuple)
+    with pytest.raises(ValidationError):
+        stored.location = "elsewhere.json"
+    with pytest.raises(ValidationError):
+        stored.results.scores[0].metrics["accuracy"].value = 1.0
+    with pytest.raises(TypeError):
+        stored.results.scores[0].metrics["accuracy"] = None
+    # The log that was put is left as it is
+    log.location = "elsewhere.json"
+    assert stored.location == eval_logs[0].location
+
+
+def test_read_only_logs_stay_read_only_when_copied(eval_logs):
+    log = freeze_log(eval_logs[0])
+
+    assert freeze_log(log) is log
+    assert log.model_dump_json() == eval_logs[0].model_dump_json()
+    assert log.location == eval_logs[0].location
+    for copied in (
+        log.model_copy(deep=True),
+        copy.deepcopy(log),
+        pickle.loads(pickle.dumps(log)),
+    ):
+        assert isinstance(copied, FrozenDashboardLog)
+        assert copied == log
+        with pytest.raises(ValidationError):
+            copied.results.scores[0].metrics["accuracy"].value = 1.0
+
+
+def test_placeholder_sample_scores_are_renamed(eval_logs):
+    data = eval_logs[0].model_dump(mode="json")
+    data["samples"] = [
+        {
+            "id": 1,
+            "epoch": 1,
+            "input": "question",
+            "target": "answer",
+            "messages": [],
+            "output": {},
+            "metadata": {},
+            "scores": {"88F74D2C": {"value": "C"}},
+        }
+    ]
+
+    log = FrozenDashboardLog.model_validate(data)
+
+    scorer = log.results.scores[0].name
+    assert list(log.samples[0].scores) == list(
+        DashboardLog.model_validate(data).samples[0].scores
+    )
+    assert list(log.samples[0].scores) == [scorer]
@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from src.log_utils.io_scheduler import IOScheduler, Priority
+
+
+def block(scheduler: IOScheduler) -> threading.Event:
+    """Occupy the only worker of `scheduler` until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit(wait)
+    started.wait(5)
+    return release
+
+
+def test_runs_requests_by_priority():
+    scheduler = IOScheduler(max_concurrency=1)
+    release = block(scheduler)
+    order = []
+
+    futures = [
+        scheduler.submit(lambda: order.append("background"), Priority.BACKGROUND),
+        scheduler.submit(lambda: order.append("download"), Priority.DOWNLOAD),
+        scheduler.submit(lambda: order.append("page 1"), Priority.INTERACTIVE),
+        scheduler.submit(lambda: order.append("page 2"), Priority.INTERACTIVE),
+    ]
+    stats = scheduler.stats()
+    assert stats.running == 1
+    assert stats.queued == {
+        Priority.INTERACTIVE: 2,
+        Priority.DOWNLOAD: 1,
+        Priority.BACKGROUND: 1,
+    }
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["page 1", "page 2", "download", "background"]
+
+
+def test_caps_concurrent_requests():
+    scheduler = IOScheduler(max_concurrency=3)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def request():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    futures = [scheduler.submit(request) for _ in range(12)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert max(peak) == 3
+    assert scheduler.stats().completed == 12
+
+
+def test_drops_requests_of_ended_sessions():
+    active = {"session-1", "session-3"}
+    scheduler = IOScheduler(max_concurrency=1, is_active=lambda s: s in active)
+    release = block(scheduler)
+
+    kept = scheduler.submit(lambda: "kept", owner="session-1")
+    # Ended before its request could run
+    ended = scheduler.submit(lambda: "ended", owner="session-2")
+    # Cancelled explicitly
+    cancelled = scheduler.submit(lambda: "cancelled", owner="session-3")
+    assert scheduler.cancel("session-3") == 1
+
+    release.set()
+    assert kept.result(timeout=5) == "kept"
+    with pytest.raises(CancelledError):
+        ended.result(timeout=5)
+    with pytest.raises(CancelledError):
+        cancelled.result(timeout=5)
+    assert scheduler.stats().cancelled == 2
+
+
+def test_cancels_queued_requests_when_their_session_ends():
+    active = {"session-1", "session-2"}
+    scheduler = IOScheduler(
+        max_concurrency=1,
+        is_active=lambda s: s in active,
+        session_check_interval=0.01,
+    )
+    release = block(scheduler)
+    kept = scheduler.submit(lambda: "kept", owner="session-1")
+    ended = scheduler.submit(lambda: "ended", owner="session-2")
+
+    active.discard("session-2")
+
+    # Cancelled while the worker is still busy, not when it would have run
+    with pytest.raises(CancelledError):
+        ended.result(timeout=5)
+    assert scheduler.stats().queued[Priority.INTERACTIVE] == 1
+    release.set()
+    assert kept.result(timeout=5) == "kept"
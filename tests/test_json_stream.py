@@ -0,0 +1,68 @@
+import io
+import json
+
+import pytest
+from src.log_utils.json_stream import (
+    SCORES_PATH,
+    PathNotFound,
+    read_json_path,
+    read_scores,
+)
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_read_scores_stops_after_the_scores():
+    with open("tests/data/test_task/1.json", "rb") as f:
+        raw = f.read()
+    stream = CountingStream(raw)
+
+    scores = read_scores(stream, chunk_size=256)
+
+    assert scores == json.loads(raw)["results"]["scores"]
+    # The stats and the task metadata after the results are never read
+    assert stream.bytes_read < len(raw)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_read_json_path_skips_values_across_chunks(chunk_size):
+    document = {
+        "reductions": [
+            {"text": 'a "quoted" } ] { [ \\ value', "value": -1.5e-3},
+            [True, False, None, {}, [], ""],
+        ],
+        "results": {"total": 10, "scores": [{"name": "choiceé", "metrics": {}}]},
+        "stats": {"samples": list(range(100))},
+    }
+    raw = json.dumps(document, indent=2).encode()
+
+    value = read_json_path(CountingStream(raw), SCORES_PATH, chunk_size)
+
+    assert value == document["results"]["scores"]
+    assert read_json_path(CountingStream(raw), ("results", "total"), chunk_size) == 10
+
+
+def test_read_json_path_missing_values():
+    raw = b'{"results": {"total": 1}, "scores": []}'
+
+    with pytest.raises(PathNotFound):
+        read_json_path(CountingStream(raw), SCORES_PATH)
+    with pytest.raises(PathNotFound):
+        read_json_path(CountingStream(raw), ("results", "total", "value"))
+    assert read_scores(CountingStream(raw)) == []
+
+
+def test_read_json_path_invalid_documents():
+    with pytest.raises(ValueError):
+        read_json_path(CountingStream(b'{"results": {"scores": [1, 2'), SCORES_PATH)
+    with pytest.raises(ValueError):
+        read_json_path(CountingStream(b'{"results" {"scores": []}}'), SCORES_PATH)
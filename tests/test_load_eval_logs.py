@@ -1,8 +1,20 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from inspect_evals_dashboard_schema import DashboardLog
 from src.config import load_config
-from src.log_utils.load_eval_logs import get_log_paths
+from src.log_utils import load_eval_logs
+from src.log_utils.frozen import FrozenDashboardLog
+from src.log_utils.load_eval_logs import (
+    fetch_evaluation_logs,
+    get_loading_paths,
+    get_log_paths,
+    is_loaded,
+    iter_evaluation_logs,
+    load_evaluation_logs,
+    load_full_logs,
+)
+from src.log_utils.log_store import get_log_store
 
 
 def test_get_log_paths():
@@ -20,8 +32,148 @@ def test_get_log_paths():
 def test_load_evaluation_logs(eval_logs):
     assert len(eval_logs) > 0
 
+    full_logs = load_evaluation_logs(get_log_paths(load_config().agents), "full")
     with open("tests/data/test_task/1.json") as f:
         data = json.load(f)
         # Location is set by load_evaluation_logs to the path the file was downloaded from
         data["location"] = "tests/data/test_task/1.json"
-        assert DashboardLog(**data) == eval_logs[0]
+        assert FrozenDashboardLog(**data) == full_logs[0]
+        assert (
+            FrozenDashboardLog(**data)
+            == load_full_logs(["tests/data/test_task/1.json"])[0]
+        )
+
+
+def test_load_evaluation_logs_chart_projection(eval_logs):
+    log = eval_logs[0]
+
+    # Heavy fields that the pages don't use are dropped
+    assert log.eval.dataset.sample_ids is None
+    assert log.eval.packages == {}
+    assert log.eval.revision is None
+    assert log.plan.steps == ()
+
+    assert log.eval.task == "inspect_evals/test_task"
+    assert log.eval.config.epochs == 1
+    assert log.results.completed_samples == 3
+    assert log.results.scores[0].metrics["accuracy"].value == 0.2
+
+
+def test_fetch_evaluation_logs_preserves_order():
+    paths = [
+        "tests/data/test_task/2.json",
+        "tests/data/test_task/1.json",
+        "tests/data/test_task/2.json",
+    ]
+
+    logs, failures = fetch_evaluation_logs(paths, max_concurrency=2)
+
+    assert failures == {}
+    assert [log.location for log in logs] == paths
+
+
+def test_fetch_evaluation_logs_reports_failures():
+    paths = [
+        "tests/data/test_task/1.json",
+        "tests/data/test_task/missing.json",
+        "tests/data/test_task/2.json",
+    ]
+
+    logs, failures = fetch_evaluation_logs(paths)
+
+    assert [log.location for log in logs] == [paths[0], paths[2]]
+    assert list(failures) == ["tests/data/test_task/missing.json"]
+    assert isinstance(failures["tests/data/test_task/missing.json"], FileNotFoundError)
+
+
+def test_load_evaluation_logs_shares_logs_across_calls(mocker):
+    paths = get_log_paths(load_config().agents)
+    first = load_evaluation_logs(paths)
+
+    spy = mocker.spy(load_eval_logs, "fetch_evaluation_logs")
+    second = load_evaluation_logs(list(reversed(paths)))
+
+    spy.assert_not_called()
+    assert [id(log) for log in second] == [id(log) for log in reversed(first)]
+
+
+def test_iter_evaluation_logs_yields_each_group_once_loaded():
+    get_log_store("full").clear()
+    groups = {
+        "first": ["tests/data/test_task/1.json"],
+        "both": ["tests/data/test_task/2.json", "tests/data/test_task/1.json"],
+        "missing": ["tests/data/test_task/missing.json"],
+    }
+
+    loaded = dict(iter_evaluation_logs(groups, "full"))
+
+    assert sorted(loaded) == sorted(groups)
+    assert [log.location for log in loaded["both"]] == groups["both"]
+    assert loaded["missing"] == []
+    # Groups share the stored logs
+    assert loaded["first"][0] is loaded["both"][1]
+    assert is_loaded(groups["both"], "full")
+
+
+def test_concurrent_loads_wait_for_the_same_path():
+    store = get_log_store("full")
+    store.clear()
+    paths = ["tests/data/test_task/1.json", "tests/data/test_task/2.json"]
+
+    # Another session is loading the first path
+    claimed, _ = store.claim(paths[:1])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        loading = executor.submit(load_evaluation_logs, paths, "full")
+        while paths[1] not in store:
+            time.sleep(0.01)
+        assert not loading.done()
+
+        (log,), _ = fetch_evaluation_logs(claimed)
+        store.put_many({log.location: log})
+        store.release(log.location, log)
+        logs = loading.result(timeout=5)
+
+    assert [log.location for log in logs] == paths
+    assert logs[0] is log
+    assert store.coalesced >= 1
+
+
+def test_abandoned_loads_are_fetched_by_waiting_sessions():
+    store = get_log_store("full")
+    store.clear()
+    paths = ["tests/data/test_task/1.json"]
+
+    claimed, _ = store.claim(paths)
+    coalesced = store.coalesced
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        loading = executor.submit(load_evaluation_logs, paths, "full")
+        while store.coalesced == coalesced:
+            time.sleep(0.01)
+        store.abandon(claimed)
+        logs = loading.result(timeout=5)
+
+    assert [log.location for log in logs] == paths
+
+
+def test_page_deadline_returns_the_logs_loaded_so_far(mocker):
+    store = get_log_store("full")
+    store.clear()
+    paths = ["tests/data/test_task/1.json", "tests/data/test_task/2.json"]
+    read_log_bytes = load_eval_logs.read_log_bytes
+
+    def slow_read(path, *args):
+        if path == paths[1]:
+            time.sleep(0.5)
+        return read_log_bytes(path, *args)
+
+    mocker.patch.object(load_eval_logs, "read_log_bytes", side_effect=slow_read)
+
+    logs = load_evaluation_logs(paths, "full", timeout=0.2)
+
+    assert [log.location for log in logs] == paths[:1]
+    assert get_loading_paths(paths, "full") == paths[1:]
+
+    # The late log is stored once it arrives
+    while get_loading_paths(paths, "full"):
+        time.sleep(0.05)
+    assert [log.location for log in load_evaluation_logs(paths, "full")] == paths
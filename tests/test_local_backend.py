@@ -0,0 +1,80 @@
+import json
+import shutil
+import time
+
+from src.log_utils.decode import CHART_FIELDS, parse_dashboard_log
+from src.log_utils.frozen import FrozenDashboardLog
+from src.log_utils.local_backend import LocalLogWatcher, read_local_file
+from src.log_utils.log_store import LogStore
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_read_local_file_maps_large_files():
+    path = "tests/data/test_task/1.json"
+
+    small = read_local_file(path)
+    mapped = read_local_file(path, mmap_min_bytes=1)
+
+    assert isinstance(small, bytes)
+    assert isinstance(mapped, memoryview)
+    assert bytes(mapped) == small
+    # Memory-mapped logs decode like read ones, with or without a projection
+    assert parse_dashboard_log(mapped, path) == parse_dashboard_log(small, path)
+    assert parse_dashboard_log(mapped, path, fields=CHART_FIELDS) == (
+        parse_dashboard_log(small, path, fields=CHART_FIELDS)
+    )
+
+
+def test_mapped_logs_are_parsed_without_a_copy(mocker):
+    path = "tests/data/test_task/1.json"
+    mapped = read_local_file(path, mmap_min_bytes=1)
+    # Only bytes can be validated as JSON by pydantic
+    validate_json = mocker.spy(FrozenDashboardLog, "model_validate_json")
+
+    parse_dashboard_log(mapped, path)
+
+    validate_json.assert_not_called()
+
+
+def test_watcher_invalidates_changed_logs(tmp_path):
+    changed_path = str(tmp_path / "1.json")
+    unchanged_path = str(tmp_path / "2.json")
+    shutil.copy("tests/data/test_task/1.json", changed_path)
+    shutil.copy("tests/data/test_task/2.json", unchanged_path)
+    store = LogStore()
+    store.put_many(
+        {
+            path: parse_dashboard_log(read_local_file(path), path)
+            for path in (changed_path, unchanged_path)
+        }
+    )
+    watcher = LocalLogWatcher(
+        [changed_path, unchanged_path, "s3://bucket/logs/run.json"], [store]
+    )
+    assert watcher.directories == [str(tmp_path)]
+    watcher.start()
+    try:
+        with open(changed_path) as f:
+            data = json.load(f)
+        data["results"]["completed_samples"] = 2
+        with open(changed_path, "w") as f:
+            json.dump(data, f)
+
+        assert wait_for(lambda: changed_path not in store)
+    finally:
+        watcher.stop()
+
+    # Only the edited log is dropped, and it isn't served from the snapshot again
+    assert unchanged_path in store
+    assert store.changed([changed_path, unchanged_path]) == {changed_path}
+    assert watcher.invalidated >= 1
+    reloaded = parse_dashboard_log(read_local_file(changed_path), changed_path)
+    assert reloaded.results.completed_samples == 2
@@ -0,0 +1,62 @@
+import gc
+
+import pytest
+from pydantic import ValidationError
+from src.log_utils.fingerprint import log_fingerprint
+from src.log_utils.model_registry import ModelRegistry
+
+
+def with_family(log, family):
+    metadata = log.model_metadata.model_copy(update={"family": family})
+    return log.model_copy(update={"model_metadata": metadata})
+
+
+def test_intern_shares_equal_metadata(eval_logs):
+    registry = ModelRegistry()
+    copies = [eval_logs[0].model_copy(deep=True) for _ in range(3)]
+
+    interned = registry.intern_logs(copies)
+
+    assert len(registry) == 1
+    assert all(log.model_metadata is interned[0].model_metadata for log in interned)
+    assert registry.get(copies[0].eval.model) is interned[0].model_metadata
+    # The logs are read-only, copies pointing at the shared entry replace them
+    assert interned[0] is copies[0] and interned[1] is not copies[1]
+    assert log_fingerprint(interned[1]) == log_fingerprint(copies[1])
+
+
+def test_intern_keeps_differing_metadata(eval_logs):
+    registry = ModelRegistry()
+    first = eval_logs[0].model_copy(deep=True)
+    second = with_family(eval_logs[0], "another-family")
+
+    first, second = registry.intern_logs([first, second])
+
+    assert first.model_metadata.family == "test-model-family"
+    assert second.model_metadata.family == "another-family"
+    assert registry.get(first.eval.model).family == "another-family"
+
+
+def test_entries_are_read_only(eval_logs):
+    registry = ModelRegistry()
+    (log,) = registry.intern_logs([eval_logs[0]])
+
+    with pytest.raises(ValidationError):
+        registry.get(log.eval.model).family = "another-family"
+
+
+def test_get_unknown_model():
+    assert ModelRegistry().get("unknown/model") is None
+
+
+def test_entries_of_dropped_logs_are_removed(eval_logs):
+    registry = ModelRegistry()
+    interned = registry.intern_logs([with_family(eval_logs[0], "another-family")])
+    model_id = interned[0].eval.model
+    assert registry.get(model_id).family == "another-family"
+
+    del interned
+    gc.collect()
+
+    assert len(registry) == 0
+    assert registry.get(model_id) is None
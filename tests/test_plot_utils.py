@@ -1,4 +1,9 @@
+from pathlib import Path
+
 from inspect_evals.metadata import HumanBaseline
+from src.log_utils.decode import parse_dashboard_log
+from src.plots import bar
+from src.plots.bar import create_bar_chart
 from src.plots.plot_utils import (
     create_hover_text,
     get_human_baseline,
@@ -9,10 +14,16 @@ from src.plots.plot_utils import (
 def test_human_baseline(eval_logs):
     log = eval_logs[0]
     assert get_human_baseline(log) is None
-    setattr(
-        log.task_metadata,
-        "human_baseline",
-        HumanBaseline(metric="whatever", score=42, source="http://example.com/"),
+    # Logs are shared through the log store and read-only, the copy has a baseline
+    human_baseline = HumanBaseline(
+        metric="whatever", score=42, source="http://example.com/"
+    )
+    log = log.model_copy(
+        update={
+            "task_metadata": log.task_metadata.model_copy(
+                update={"human_baseline": human_baseline}
+            )
+        }
     )
     assert get_human_baseline(log) == 42
 
@@ -43,3 +54,20 @@ def test_create_hover_text(eval_logs):
         "Run timestamp: 2025-01-01T00:00:00+00:00<br>"
         "Human baseline: N/A<br>"
     )
+
+
+def test_figure_cache_is_reused_across_reloads(mocker):
+    paths = ["tests/data/test_task/1.json", "tests/data/test_task/2.json"]
+    reloaded_logs = [
+        parse_dashboard_log(Path(path).read_bytes(), path) for path in paths
+    ]
+    logs = [parse_dashboard_log(Path(path).read_bytes(), path) for path in paths]
+    scorer = logs[0].results.scores[0].name
+    metric = next(iter(logs[0].results.scores[0].metrics))
+    create_bar_chart.clear()
+
+    figure = create_bar_chart(logs, scorer, metric)
+    spy = mocker.spy(bar, "get_scorer_by_name")
+    # New objects with the same content hit the figure cache
+    assert create_bar_chart(reloaded_logs, scorer, metric) == figure
+    assert spy.call_count == 0
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import streamlit as st
+from src.config import load_config
+from src.log_utils import refresher as refresher_module
+from src.log_utils.log_store import LogStore
+from src.log_utils.refresher import LogRefresher, get_refresher, get_storage_prefixes
+
+PREFIX = "s3://test-bucket/logs/prod/test_task/"
+OLD_RUN = f"{PREFIX}test_provider+test_model/2025-01-01T00-00-00/run.dashboard.json"
+NEW_RUN = f"{PREFIX}test_provider+test_model/2025-02-01T00-00-00/run.dashboard.json"
+OTHER_MODEL_RUN = (
+    f"{PREFIX}test_provider_2+test_model_2/2025-01-01T00-00-00/run.dashboard.json"
+)
+
+
+def key(path: str) -> str:
+    return path.removeprefix("s3://test-bucket/")
+
+
+def refresher_for(local_s3, store: LogStore) -> LogRefresher:
+    return LogRefresher([OLD_RUN], store, interval=60, s3_client=local_s3)
+
+
+def test_get_storage_prefixes():
+    assert get_storage_prefixes([OLD_RUN, OTHER_MODEL_RUN, "tests/data/1.json"]) == [
+        PREFIX
+    ]
+
+
+def test_refresher_picks_up_added_changed_and_removed_runs(local_s3):
+    log_1 = Path("tests/data/test_task/1.json").read_bytes()
+    log_2 = Path("tests/data/test_task/2.json").read_bytes()
+    local_s3.objects = {key(OLD_RUN): log_1}
+    store = LogStore()
+    refresher = refresher_for(local_s3, store)
+
+    # The first poll trusts the config, nothing to fetch
+    refresher.poll()
+    assert refresher.status.last_added == 0
+    assert store.resolve_paths([OLD_RUN]) == [OLD_RUN]
+
+    # A newer run of the model, and a run of a model that isn't in the config
+    local_s3.objects[key(NEW_RUN)] = log_1
+    local_s3.objects[key(OTHER_MODEL_RUN)] = log_2
+    refresher.poll()
+    assert refresher.status.last_added == 1
+    assert store.resolve_paths([OLD_RUN]) == [NEW_RUN]
+    assert store.get(NEW_RUN).model_metadata.name == "test-model"
+    assert store.get(OTHER_MODEL_RUN) is None
+
+    # Once it's added to the config, its run is fetched as well
+    refresher.set_paths([OLD_RUN, OTHER_MODEL_RUN])
+    refresher.poll()
+    assert refresher.status.last_added == 1
+    assert store.resolve_paths([OLD_RUN, OTHER_MODEL_RUN]) == [
+        NEW_RUN,
+        OTHER_MODEL_RUN,
+    ]
+
+    # A changed log is fetched again
+    local_s3.objects[key(NEW_RUN)] = log_2
+    refresher.poll()
+    assert refresher.status.last_changed == 1
+    assert store.get(NEW_RUN).model_metadata.name == "test-model-2"
+
+    # A removed run is dropped
+    del local_s3.objects[key(OTHER_MODEL_RUN)]
+    refresher.poll()
+    assert refresher.status.last_removed == 1
+    assert store.get(OTHER_MODEL_RUN) is None
+    assert store.resolve_paths([OLD_RUN, OTHER_MODEL_RUN]) == [NEW_RUN]
+    assert refresher.status.last_swap_at is not None
+
+
+def test_get_refresher_starts_one_thread(monkeypatch, mocker):
+    config = load_config()
+    monkeypatch.setenv("STREAMLIT_ENV", "dev")
+    monkeypatch.setattr(refresher_module, "REFRESH_INTERVAL", 60)
+    monkeypatch.setattr(refresher_module, "load_config", lambda: config)
+    monkeypatch.setattr(refresher_module, "_refresher", None)
+    start = mocker.patch.object(LogRefresher, "start")
+
+    refresher = get_refresher()
+    # e.g. "Clear cache" in the menu of the app
+    st.cache_resource.clear()
+
+    assert get_refresher() is refresher
+    start.assert_called_once()
@@ -0,0 +1,84 @@
+import pytest
+from src.log_utils.io_scheduler import IOScheduler
+from src.log_utils.load_eval_logs import fetch_evaluation_logs
+from src.log_utils.request_policy import RequestPolicy, is_retryable
+
+KEY = "logs/test/test_task/1.json"
+PATH = f"s3://test-bucket/{KEY}"
+
+
+def fetch(local_s3, policy):
+    # Revalidate, so that every fetch sends a request to the S3 stand-in
+    return fetch_evaluation_logs(
+        [PATH], s3_client=local_s3, fields={}, revalidate=True, policy=policy
+    )
+
+
+def test_retries_retryable_errors(local_s3):
+    local_s3.errors[KEY] = [local_s3.error("503"), local_s3.error("SlowDown")]
+    policy = RequestPolicy(IOScheduler(4), timeout=5, retries=2, backoff=0.001)
+
+    logs, failures = fetch(local_s3, policy)
+
+    assert failures == {}
+    assert [log.location for log in logs] == [PATH]
+    assert policy.stats.retries == 2
+
+
+def test_does_not_retry_missing_objects(local_s3):
+    policy = RequestPolicy(IOScheduler(4), timeout=5, retries=2, backoff=0.001)
+
+    _, failures = fetch_evaluation_logs(
+        ["s3://test-bucket/logs/test/missing.json"], s3_client=local_s3, policy=policy
+    )
+
+    assert list(failures) == ["s3://test-bucket/logs/test/missing.json"]
+    assert policy.stats.retries == 0
+
+
+def test_gives_up_on_slow_requests_and_retries(local_s3):
+    local_s3.delays[KEY] = [1.0]
+    policy = RequestPolicy(IOScheduler(4), timeout=0.2, retries=1, backoff=0.001)
+
+    logs, failures = fetch(local_s3, policy)
+
+    assert failures == {}
+    assert len(logs) == 1
+    assert policy.stats.timeouts == 1
+
+
+def test_fails_after_the_last_retry(local_s3):
+    local_s3.errors[KEY] = [local_s3.error("500")] * 3
+    policy = RequestPolicy(IOScheduler(4), timeout=5, retries=1, backoff=0.001)
+
+    _, failures = fetch(local_s3, policy)
+
+    assert failures[PATH].response["Error"]["Code"] == "500"
+    assert policy.stats.requests == 2
+
+
+def test_hedges_slow_requests(local_s3):
+    policy = RequestPolicy(IOScheduler(4), timeout=5, retries=0, hedge_percentile=50)
+    for _ in range(policy.latencies.min_samples):
+        policy.latencies.record(0.01)
+    local_s3.delays[KEY] = [1.0, 0.0]
+
+    logs, failures = fetch(local_s3, policy)
+
+    assert failures == {}
+    assert len(logs) == 1
+    assert policy.stats.hedges == 1
+    assert policy.stats.hedge_wins == 1
+
+
+@pytest.mark.parametrize(
+    "error, retryable",
+    [
+        (TimeoutError(), True),
+        (ConnectionResetError(), True),
+        (FileNotFoundError(), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
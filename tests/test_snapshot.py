@@ -0,0 +1,77 @@
+import os
+import time
+
+from src.log_utils import snapshot as snapshot_module
+from src.log_utils.frozen import FrozenDashboardLog
+from src.log_utils.load_eval_logs import load_full_logs
+from src.log_utils.snapshot import (
+    Snapshot,
+    get_snapshot,
+    get_snapshot_path,
+    write_snapshot,
+)
+from src.plots.bar import create_bar_chart
+from src.plots.plot_utils import create_hover_text
+
+
+def test_snapshot_round_trip(eval_logs, tmp_path):
+    snapshot_path = get_snapshot_path("test", tmp_path)
+    write_snapshot(eval_logs, snapshot_path)
+
+    snapshot = Snapshot.read(snapshot_path)
+    paths = [log.location for log in eval_logs]
+    logs = snapshot.load_logs(["not/in/snapshot.json", *paths])
+
+    assert list(logs) == paths
+    for original, rebuilt in zip(eval_logs, logs.values()):
+        # The whole chart projection is kept
+        assert rebuilt == original
+        assert rebuilt.results.scores == original.results.scores
+        assert rebuilt.model_metadata == original.model_metadata
+        assert create_hover_text(rebuilt) == create_hover_text(original)
+
+    create_bar_chart(list(logs.values()), "choice", "accuracy")
+
+
+def test_snapshot_logs_are_validated_from_json(eval_logs, tmp_path, mocker):
+    snapshot_path = get_snapshot_path("test", tmp_path)
+    write_snapshot(eval_logs, snapshot_path)
+    snapshot = Snapshot.read(snapshot_path)
+    validate_json = mocker.spy(FrozenDashboardLog, "model_validate_json")
+    validate = mocker.spy(FrozenDashboardLog, "model_validate")
+
+    snapshot.load_logs([eval_logs[0].location])
+
+    assert snapshot.table.column_names == ["location", "log_json"]
+    assert validate_json.call_count == 1
+    assert validate.call_count == 0
+
+
+def test_snapshot_missing(tmp_path):
+    assert Snapshot.read(get_snapshot_path("test", tmp_path)) is None
+
+
+def test_snapshot_expires(eval_logs, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_MAX_AGE", 60)
+    snapshot_path = get_snapshot_path("test", tmp_path)
+    write_snapshot(eval_logs, snapshot_path)
+
+    assert len(get_snapshot()) == len(eval_logs)
+
+    built_at = time.time() - 120
+    os.utime(snapshot_path, (built_at, built_at))
+    assert get_snapshot() is None
+
+
+def test_full_logs_are_not_served_from_the_snapshot(eval_logs, tmp_path):
+    snapshot_path = get_snapshot_path("test", tmp_path)
+    write_snapshot(eval_logs, snapshot_path)
+    paths = [log.location for log in eval_logs]
+    Snapshot.read(snapshot_path).load_logs(paths)
+
+    full_logs = load_full_logs(paths)
+
+    assert [log.location for log in full_logs] == paths
+    # The fields that the chart projection drops are loaded
+    assert all(log.eval.dataset.sample_ids for log in full_logs)
@@ -55,3 +55,19 @@ def test_smoke_page(file_path):
     """
     at = AppTest.from_file(file_path, default_timeout=5).run()
     assert not at.exception
+
+
+def test_chart_data_is_fetched_on_demand(mocker):
+    from src.pages.evaluations import template
+
+    spy = mocker.spy(template, "load_full_logs")
+    page = str(Path(__file__).parent.parent / "src/pages/evaluations/agents.py")
+    at = AppTest.from_file(page, default_timeout=5).run()
+    assert not at.exception
+    spy.assert_not_called()
+
+    at.button[0].click().run()
+
+    assert not at.exception
+    spy.assert_called_once()
+    assert at.session_state["chart_data_json"][1].startswith("[")
@@ -0,0 +1,239 @@
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+import yaml
+from scripts import update_config
+from scripts.update_config import (
+    SYNC_STATE_FILE,
+    LocalSource,
+    S3Source,
+    create_config,
+    generate_config,
+    get_scores_from_file,
+    sync_mirror,
+)
+
+# One evaluation per group of categories, so that every category has one
+EVALS = ["agentharm", "bbh", "cybench", "mathvista"]
+MODELS = ["anthropic+claude-3-7-sonnet", "openai+gpt-4o"]
+RUN = "2025-01-01T00-00-00"
+
+
+def scores(scorer="choice", metrics=("accuracy", "stderr")):
+    return [{"name": scorer, "metrics": {metric: {} for metric in metrics}}]
+
+
+def log_key(eval_name, model, run=RUN):
+    return f"logs/prod/{eval_name}/{model}/{run}/x.dashboard.json"
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "manifest.json")
+
+
+def test_invalid_default_in_a_later_run_raises():
+    paths = [log_key(eval_name, model) for eval_name in EVALS for model in MODELS]
+    scores_by_path = {path: scores() for path in paths}
+    original_config = create_config(paths, scores_by_path)
+
+    # The second model no longer has the default scorer of bbh
+    scores_by_path[log_key("bbh", MODELS[1])] = scores("match")
+
+    with pytest.raises(Exception, match="Invalid default scorer or metric"):
+        create_config(paths, scores_by_path, original_config)
+
+
+def log_content(log_scores, samples=1):
+    # The samples come first, the scores must be found without parsing them
+    return json.dumps(
+        {
+            "samples": [{"id": i} for i in range(samples)],
+            "results": {"scores": log_scores},
+        }
+    ).encode()
+
+
+class MemorySource:
+    """A source serving `objects`, a dict of key to content, from memory."""
+
+    name = "memory"
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def list_objects(self):
+        return {
+            key: {"etag": f'"{hash(content)}"', "last_modified": "2025-01-01T00:00:00"}
+            for key, content in sorted(self.objects.items())
+        }
+
+    def open(self, key):
+        return io.BytesIO(self.objects[key])
+
+
+def test_second_run_reads_only_modified_files(manifest_path, mocker):
+    source = MemorySource(
+        {
+            log_key(eval_name, model): log_content(scores())
+            for eval_name in EVALS
+            for model in MODELS
+        }
+    )
+    generate_config(source, manifest_path=manifest_path)
+    modified = log_key("cybench", MODELS[0])
+    source.objects[modified] = log_content(scores(metrics=("accuracy", "mean")), 2)
+    new = log_key("bbh", MODELS[0], run="2025-02-01T00-00-00")
+    source.objects[new] = log_content(scores())
+    spy = mocker.spy(update_config, "get_scores_from_file")
+
+    config = generate_config(source, manifest_path=manifest_path)
+
+    assert sorted(call.args[0] for call in spy.call_args_list) == sorted(
+        [modified, new]
+    )
+    full_config = generate_config(source, manifest_path=manifest_path, full=True)
+    assert yaml.dump(config, sort_keys=False) == yaml.dump(full_config, sort_keys=False)
+
+
+def test_get_scores_from_file(mocker):
+    key = log_key("bbh", MODELS[0])
+    source = MemorySource({key: log_content(scores())})
+    spy = mocker.spy(source, "open")
+
+    assert get_scores_from_file(key, source) == [
+        {"name": "choice", "metrics": ["accuracy", "stderr"]}
+    ]
+    assert spy.call_count == 1
+
+
+def test_get_scores_from_file_without_scores(mocker):
+    key = log_key("bbh", MODELS[0])
+    source = MemorySource({key: json.dumps({"results": None}).encode()})
+    spy = mocker.spy(source, "open")
+
+    # The whole file is read again, since the scores aren't where expected
+    assert get_scores_from_file(key, source) == []
+    assert spy.call_count == 2
+
+
+def test_get_scores_from_invalid_file_raises(mocker):
+    key = log_key("bbh", MODELS[0])
+    source = MemorySource({key: log_content(scores())[:-10]})
+    spy = mocker.spy(source, "open")
+
+    with pytest.raises(ValueError):
+        get_scores_from_file(key, source)
+    assert spy.call_count == 1
+
+
+class FailingBody(io.BytesIO):
+    def read(self, *args):
+        raise OSError("Connection reset")
+
+
+class FakeS3Client:
+    """An S3 client serving `objects`, a dict of key to content."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.failing = set()
+        self.downloads = []
+
+    def get_paginator(self, operation):
+        assert operation == "list_objects_v2"
+        return self
+
+    def paginate(self, Bucket, Prefix):
+        yield {
+            "Contents": [
+                {
+                    "Key": key,
+                    "ETag": f'"{hash(content)}"',
+                    "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                }
+                for key, content in self.objects.items()
+                if key.startswith(Prefix)
+            ]
+        }
+
+    def get_object(self, Bucket, Key):
+        self.downloads.append(Key)
+        if Key in self.failing:
+            return {"Body": FailingBody()}
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+def test_sync_mirror(tmp_path):
+    directory = tmp_path / "mirror"
+    keys = [log_key(eval_name, model) for eval_name in EVALS for model in MODELS]
+    client = FakeS3Client({key: key.encode() for key in keys})
+    s3_source = S3Source("bucket", "logs/", client)
+    client.failing = {keys[0]}
+
+    with pytest.raises(Exception, match="Failed to sync files"):
+        sync_mirror(s3_source, str(directory), jobs=4)
+
+    assert sorted(client.downloads) == sorted(keys)
+    assert not (directory / keys[0]).exists()
+    assert list(directory.rglob("*.tmp")) == []
+    assert (directory / keys[1]).read_bytes() == keys[1].encode()
+    state = json.loads((directory / SYNC_STATE_FILE).read_text())
+    assert sorted(state["objects"]) == sorted(keys[1:])
+
+    # Only the failed file is downloaded again, and deleted files are removed
+    client.failing = set()
+    client.downloads = []
+    del client.objects[keys[1]]
+    sync_mirror(s3_source, str(directory), jobs=4)
+
+    assert client.downloads == [keys[0]]
+    assert (directory / keys[0]).read_bytes() == keys[0].encode()
+    assert not (directory / keys[1]).exists()
+    assert sorted(LocalSource(directory).list_objects()) == sorted(
+        key for key in keys if key != keys[1]
+    )
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    directory = tmp_path / "mirror"
+    for eval_name in EVALS:
+        for model in MODELS:
+            path = directory / log_key(eval_name, model)
+            path.parent.mkdir(parents=True)
+            path.write_bytes(log_content(scores()))
+    return directory
+
+
+def test_generate_config_from_a_local_mirror(log_dir, manifest_path):
+    config = generate_config(LocalSource(log_dir), manifest_path=manifest_path)
+
+    assert list(config) == ["prod"]
+    (bbh,) = [
+        e for e in config["prod"]["evaluations"]["knowledge"] if e["name"] == "bbh"
+    ]
+    assert bbh["default_scorer"] == "choice"
+    assert bbh["default_metric"] == "accuracy"
+    assert bbh["paths"] == [
+        f"s3://$AWS_S3_BUCKET/{log_key('bbh', model)}" for model in MODELS
+    ]
+
+
+def test_local_source_detects_modified_files(log_dir):
+    source = LocalSource(log_dir)
+    objects = source.list_objects()
+    path = log_dir / log_key("cybench", MODELS[0])
+
+    # A different size and modification time, as after a new upload
+    path.write_bytes(log_content(scores(metrics=("accuracy", "mean")), 2))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    modified = source.list_objects()
+    assert [key for key in objects if objects[key] != modified[key]] == [
+        log_key("cybench", MODELS[0])
+    ]
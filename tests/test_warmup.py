@@ -0,0 +1,99 @@
+import pytest
+from scripts import serve
+from scripts.serve import parse_streamlit_options
+from src import warmup
+from src.warmup import (
+    Readiness,
+    get_readiness,
+    parse_categories,
+    start_warm_up,
+    warm_up,
+)
+
+
+@pytest.fixture(autouse=True)
+def readiness(monkeypatch):
+    """Start every test from a process that didn't warm up yet."""
+    monkeypatch.setattr(warmup, "_readiness", Readiness())
+
+
+def test_parse_categories():
+    assert parse_categories("") is None
+    assert parse_categories(" agents, coding ,") == ["agents", "coding"]
+
+
+def test_parse_streamlit_options():
+    assert parse_streamlit_options(
+        ["--server.port", "8501", "--server.headless", "--theme.base=dark", "--a.b"]
+    ) == {
+        "server_port": 8501,
+        "server_headless": True,
+        "theme_base": "dark",
+        "a_b": True,
+    }
+
+
+def test_warm_up(tmp_path):
+    ready_file = tmp_path / "ready"
+
+    readiness = warm_up(["agents"], ready_file=str(ready_file))
+
+    assert readiness.is_ready
+    assert readiness.errors == {}
+    # The test environment only has agents, so the home page is warmed up too
+    assert list(readiness.timings) == [
+        "config",
+        "logs:agents",
+        "figures:agents",
+        "figures:home",
+    ]
+    assert ready_file.exists()
+    assert get_readiness() is readiness
+
+
+def test_warm_up_removes_a_previous_ready_file(tmp_path, monkeypatch):
+    ready_file = tmp_path / "ready"
+    ready_file.touch()
+    exists_during_warm_up = []
+    monkeypatch.setattr(
+        warmup, "load_config", lambda: exists_during_warm_up.append(ready_file.exists())
+    )
+
+    warm_up(ready_file=str(ready_file))
+
+    assert exists_during_warm_up == [False]
+    assert ready_file.exists()
+
+
+def test_start_warm_up_runs_once(tmp_path, mocker):
+    warm_up = mocker.patch.object(warmup, "warm_up")
+    mocker.patch.object(warmup.threading, "Thread", side_effect=FakeThread)
+
+    readiness = start_warm_up(["agents"], ready_file=str(tmp_path / "ready"))
+    start_warm_up()
+
+    warm_up.assert_called_once_with(["agents"], str(tmp_path / "ready"))
+    assert readiness.started_at is not None
+
+
+def test_serve_passes_the_options_to_streamlit(mocker):
+    mocker.patch("sys.argv", ["serve", "--server.port", "8600"])
+    mocker.patch("src.warmup.warm_up")
+    load_config_options = mocker.patch("streamlit.web.bootstrap.load_config_options")
+    run = mocker.patch("streamlit.web.bootstrap.run")
+
+    serve.main()
+
+    load_config_options.assert_called_once_with({"server_port": 8600})
+    run.assert_called_once_with(str(serve.APP_PATH), False, [], {"server_port": 8600})
+
+
+class FakeThread:
+    """Runs the target when started, in the calling thread."""
+
+    def __init__(self, target, args, **kwargs):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)